@@ -9,21 +9,23 @@ using system prompts.
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-from django.contrib.auth.models import User
 from django.db import connection, transaction
-import time
+from django.utils import timezone
+import threading
+import uuid
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langgraph.graph import StateGraph, MessagesState
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import tools_condition, ToolNode
-from django.contrib.auth.models import User
 
 # Try to import PostgresSaver
 POSTGRES_SAVER_AVAILABLE = False
 try:
     from langgraph.checkpoint.postgres import PostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
     POSTGRES_SAVER_AVAILABLE = True
 except ImportError:
     pass  # Will fall back to MemorySaver
@@ -37,6 +39,9 @@ from .tools import retrieve_and_answer
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent checkpoint connections per process
+CHECKPOINT_POOL_MAX_SIZE = 10
+
 
 class ChatState(MessagesState):
     """Enhanced state for LangGraph chatbot with tool support"""
@@ -76,19 +81,20 @@ class ChatResponse:
         self.timestamp = timestamp
 
 
+def new_session_id(user_id) -> str:
+    """Random session id; wall-clock ids collide when a user opens two sessions in the same second."""
+    return f"session_{user_id}_{uuid.uuid4().hex[:16]}"
+
+
 class Chatbot:
     """
     LangGraph-based chatbot with RAG tool integration
     """
     
-    def __init__(self, 
-                 llm=None,
-                #  neo4j_client: Optional[Neo4jClient] = None, 
-                 user: Optional[User] = None):
+    def __init__(self, llm=None):
         self.llm = llm or get_openai_llm(model="gpt-4o-mini")
         # self.neo4j_client = neo4j_client
-        self.user = user
-        self._checkpointer_context = None  # Store context manager to keep connection alive
+        self._checkpointer_pool = None  # Pool backing the PostgresSaver, closed in __del__
                 
         # Build LangGraph workflow
         self.workflow = self._build_workflow()
@@ -122,9 +128,19 @@ class Chatbot:
             if ssl_mode:
                 db_uri += f"?sslmode={ssl_mode}"
             
-            # Store context manager to keep connection alive
-            self._checkpointer_context = PostgresSaver.from_conn_string(db_uri)
-            checkpointer = self._checkpointer_context.__enter__()
+            # The chatbot lives for the whole process, so a single connection would
+            # eventually be dropped by the server; the pool checks each connection
+            # on checkout and replaces dead ones. The kwargs match what
+            # PostgresSaver.from_conn_string sets on its own connection
+            self._checkpointer_pool = ConnectionPool(
+                db_uri,
+                min_size=1,
+                max_size=CHECKPOINT_POOL_MAX_SIZE,
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+                check=ConnectionPool.check_connection,
+                open=True,
+            )
+            checkpointer = PostgresSaver(self._checkpointer_pool)
             
             # Setup tables if they don't exist (first time use)
             checkpointer.setup()
@@ -133,17 +149,23 @@ class Chatbot:
             return checkpointer
             
         except Exception as e:
+            self._close_checkpointer_pool()
             logger.warning(f"⚠️ Failed to initialize PostgresSaver: {e}")
             logger.info("📝 Falling back to MemorySaver")
             return MemorySaver()
     
-    def __del__(self):
-        """Clean up database connection when chatbot is destroyed"""
-        if self._checkpointer_context is not None:
+    def _close_checkpointer_pool(self):
+        """Close the checkpointer's connection pool, if one was opened"""
+        if self._checkpointer_pool is not None:
             try:
-                self._checkpointer_context.__exit__(None, None, None)
+                self._checkpointer_pool.close()
             except Exception:
                 pass
+            self._checkpointer_pool = None
+
+    def __del__(self):
+        """Clean up database connections when chatbot is destroyed"""
+        self._close_checkpointer_pool()
     
     def _build_workflow(self) -> CompiledStateGraph:
         """Build the LangGraph workflow with tool integration"""
@@ -237,35 +259,30 @@ class Chatbot:
         This maintains Django session info for UI features without duplicating messages.
         """
         try:
-            try:
-                user = User.objects.get(id=state.get("user_id"))
-            except User.DoesNotExist:
-                logger.error(f"User with ID {state.get('user_id')} not found")
-                return {"messages": []}
-            
             # Get or create session for UI purposes
-            session, created = ChatSession.objects.get_or_create(
+            # Only the pk and title are read back below; the user FK is set by id,
+            # an unknown user fails the FK constraint instead of costing a SELECT
+            session, created = ChatSession.objects.only('pk', 'title').get_or_create(
                 session_id=state.get("session_id"),
                 defaults={
-                    'user': user,
+                    'user_id': state.get("user_id"),
                     'title': self._generate_session_title(state["messages"])
                 }
             )
             
             # Update session metadata for UI analytics (no message duplication)
             if not created:
-                # Check if tools were used in this interaction
-                tool_used = any(msg.type == "tool" for msg in state["messages"])
-                                
-                # Increment message count for UI display (count user messages)
+                # The turn count comes from the checkpointed state already in memory,
+                # so there's no COUNT(*) over the session's messages
                 user_message_count = sum(1 for msg in state["messages"] if msg.type == "human")
-                session.message_count = user_message_count
-                session.save(update_fields=['message_count', 'updated_at'])
+                updates = {'updated_at': timezone.now()}
                 
                 # Generate title if this is early in the conversation
-                if not session.title and session.message_count <= 2:
-                    session.title = self._generate_session_title(state["messages"])
-                    session.save(update_fields=['title'])
+                if not session.title and user_message_count <= 2:
+                    updates['title'] = self._generate_session_title(state["messages"])
+                
+                # Single UPDATE, no read-modify-write of the whole row
+                ChatSession.objects.filter(pk=session.pk).update(**updates)
             
             logger.info(f"UI metadata updated for session {state.get('session_id')}")
             return {"messages": []}
@@ -303,6 +320,7 @@ class Chatbot:
         Returns:
             Response dictionary with message and metadata
         """
+        session_id = request.session_id
         try:
             # Validate input
             is_valid, error_message = MessageValidator.validate_user_message(request.user_message)
@@ -315,9 +333,8 @@ class Chatbot:
                 )
             
             # Create session if needed
-            session_id = request.session_id
             if not session_id:
-                session_id = f"session_{request.user_id}_{int(time.time())}"
+                session_id = new_session_id(request.user_id)
             
             # Create initial state
             initial_state = {
@@ -363,11 +380,31 @@ class Chatbot:
             
         except Exception as e:
             logger.error(f"LangGraph workflow failed: {e}")
-            error_session_id = session_id or f"session_{request.user_id}_{int(time.time())}"
+            error_session_id = session_id or new_session_id(request.user_id)
             return ChatResponse(
                 success=False,
                 message=f"I'm sorry, I encountered an error: {e}",
                 session_id=error_session_id,
                 task='error',
                 timestamp=datetime.now().isoformat()
-            )
\ No newline at end of file
+            )
+
+
+# One compiled workflow (and checkpointer pool) per process; the user
+# and session travel in ChatRequest, so the instance is not user-specific
+_chatbot: Optional[Chatbot] = None
+_chatbot_lock = threading.Lock()
+
+
+def get_chatbot() -> Chatbot:
+    """
+    Return the process-wide Chatbot, building it on first use.
+    
+    A failed build is not cached, so the next call retries.
+    """
+    global _chatbot
+    if _chatbot is None:
+        with _chatbot_lock:
+            if _chatbot is None:
+                _chatbot = Chatbot()
+    return _chatbot
@@ -5,9 +5,12 @@ This module provides helper functions to easily configure different LLM provider
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 
 
+# Chat model clients are stateless and safe to share across calls
+@lru_cache(maxsize=16)
 def get_openai_llm(
     model: str = "gpt-3.5-turbo",
     temperature: float = 0.0,
@@ -70,6 +73,7 @@ def get_anthropic_llm(
     )
 
 
+@lru_cache(maxsize=16)
 def get_google_llm(
     model: str = "gemini-pro",
     temperature: float = 0.0,
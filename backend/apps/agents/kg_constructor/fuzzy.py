@@ -0,0 +1,81 @@
+"""
+Cheap lexical ranking for entity resolution.
+
+Scores every (new, existing) entity pair so that the most plausible
+duplicates are the ones sent to the LLM resolver when the candidate list has
+to be trimmed. Scores only order candidates; nothing is dropped for scoring
+low, since the LLM also merges pairs with no lexical overlap.
+"""
+
+import re
+from typing import FrozenSet, List, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(name: str) -> List[str]:
+    """Lower-cased word tokens of an entity name."""
+    return _TOKEN_RE.findall(name.lower()) if name else []
+
+
+def _features(name: str) -> Tuple[FrozenSet[str], FrozenSet[str], str, str]:
+    """
+    Token set, character trigrams, compact form and acronym of a name.
+
+    The acronym ("artificial intelligence" -> "ai") lets "AI" match
+    "Artificial Intelligence", which share neither tokens nor trigrams.
+    """
+    tokens = tokenize(name)
+    compact = "".join(tokens)
+    padded = f"  {compact} "
+    trigrams = frozenset(padded[i:i + 3] for i in range(len(padded) - 2)) if compact else frozenset()
+    acronym = "".join(token[0] for token in tokens) if len(tokens) > 1 else ""
+    return frozenset(tokens), trigrams, compact, acronym
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared) if shared else 0.0
+
+
+def similarity(a: str, b: str) -> float:
+    """
+    Lexical similarity of two entity names in [0, 1].
+
+    The best of token Jaccard, character-trigram Jaccard and an exact
+    acronym match, so abbreviations and spelling variants both score.
+    """
+    return _similarity(_features(a), _features(b))
+
+
+def _similarity(fa, fb) -> float:
+    tokens_a, trigrams_a, compact_a, acronym_a = fa
+    tokens_b, trigrams_b, compact_b, acronym_b = fb
+    if (acronym_a and acronym_a == compact_b) or (acronym_b and acronym_b == compact_a):
+        return 1.0
+    return max(_jaccard(tokens_a, tokens_b), _jaccard(trigrams_a, trigrams_b))
+
+
+def candidate_indices(new_names: List[str], existing_names: List[str]) -> List[int]:
+    """
+    Indices of existing names ranked by their best similarity to any new name.
+
+    Args:
+        new_names: Names of newly extracted entities
+        existing_names: Names of entities already in the graph
+
+    Returns:
+        Every index into existing_names, best match first (ties keep the
+        original order)
+    """
+    if not new_names or not existing_names:
+        return list(range(len(existing_names)))
+
+    new_features = [_features(name) for name in new_names]
+    best = [
+        max(_similarity(fn, fe) for fn in new_features)
+        for fe in (_features(name) for name in existing_names)
+    ]
+    return sorted(range(len(existing_names)), key=lambda i: -best[i])
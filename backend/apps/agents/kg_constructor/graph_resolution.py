@@ -7,15 +7,54 @@ new post knowledge graphs with the existing global knowledge graph.
 
 import logging
 from typing import Dict, List, Any, Tuple
-from neo4j import Driver
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.prompts import ChatPromptTemplate
+from neo4j import Driver, READ_ACCESS
+from langchain_core.messages import HumanMessage
 from langchain_core.output_parsers import JsonOutputParser
 
-from .system_prompts import GRAPH_ENTITY_RESOLUTION_PROMPT, RELATIONSHIP_RESOLUTION_PROMPT
+from .fuzzy import candidate_indices
+from .resolution_groups import canonical_mapping
+from .system_prompts import (
+    GRAPH_ENTITY_RESOLUTION_PROMPT, RELATIONSHIP_RESOLUTION_PROMPT,
+    build_system_message, build_graph_entity_resolution_user, build_relationship_resolution_user,
+)
 
 logger = logging.getLogger(__name__)
 
+# Optional filters are bound as parameters (NULL = no filter) rather than spliced
+# into the text, so Neo4j plans each query once and reuses the cached plan
+EXISTING_ENTITIES_QUERY = """
+MATCH (e:Entity)
+WHERE $entity_types IS NULL OR e.type IN $entity_types
+RETURN e.name as name, e.type as type, e.description as description,
+       e.confidence as confidence
+ORDER BY e.name
+LIMIT $limit
+"""
+
+RESOLUTION_STATISTICS_QUERIES = {
+    "total_resolutions": """
+        MATCH (e:Entity)
+        WHERE e.resolution_count > 0
+        RETURN count(e) as count
+    """,
+    "total_conflicts": """
+        MATCH (c:ConflictFlag)
+        WHERE $post_id IS NULL OR c.post_id = $post_id
+        RETURN count(c) as count
+    """,
+    "pending_conflicts": """
+        MATCH (c:ConflictFlag)
+        WHERE c.status = 'pending_review'
+          AND ($post_id IS NULL OR c.post_id = $post_id)
+        RETURN count(c) as count
+    """,
+    "resolved_mentions": """
+        MATCH ()-[r:MENTIONS]->()
+        WHERE r.resolution_applied = true
+        RETURN count(r) as count
+    """
+}
+
 
 class GraphResolutionEngine:
     """
@@ -44,24 +83,9 @@ class GraphResolutionEngine:
         Returns:
             List of existing entity dictionaries
         """
-        if entity_types:
-            type_filter = "WHERE e.type IN $entity_types"
-            params = {"entity_types": entity_types, "limit": limit}
-        else:
-            type_filter = ""
-            params = {"limit": limit}
-        
-        query = f"""
-        MATCH (e:Entity)
-        {type_filter}
-        RETURN e.name as name, e.type as type, e.description as description,
-               e.confidence as confidence
-        ORDER BY e.name
-        LIMIT $limit
-        """
-        
-        with self.driver.session() as session:
-            result = session.run(query, **params)
+        with self.driver.session(default_access_mode=READ_ACCESS) as session:
+            result = session.run(EXISTING_ENTITIES_QUERY,
+                                 entity_types=entity_types or None, limit=limit)
             return [dict(record) for record in result]
     
     def get_existing_relationships(self, entity_names: List[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
@@ -91,7 +115,7 @@ class GraphResolutionEngine:
         LIMIT $limit
         """
         
-        with self.driver.session() as session:
+        with self.driver.session(default_access_mode=READ_ACCESS) as session:
             result = session.run(query, **params)
             return [dict(record) for record in result]
     
@@ -110,31 +134,26 @@ class GraphResolutionEngine:
         if not self.llm or not new_entities or not existing_entities:
             return {"resolutions": []}
         
-        # Prepare entity lists for LLM
-        new_entities_str = "\n".join([
-            f"- {e['name']} (Type: {e['type']})" for e in new_entities
-        ])
-        
-        existing_entities_str = "\n".join([
-            f"- {e['name']} (Type: {e['type']})" for e in existing_entities[:100]  # Limit for context
-        ])
+        # Most lexically similar existing entities first, so trimming to the
+        # context limit drops the least likely duplicates rather than whatever
+        # sorts last alphabetically
+        ranked = candidate_indices(
+            [e['name'] for e in new_entities],
+            [e['name'] for e in existing_entities]
+        )
+        candidates = [existing_entities[i] for i in ranked[:100]]  # Limit for context
         
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content=GRAPH_ENTITY_RESOLUTION_PROMPT),
-            HumanMessage(content=f"""NEW_ENTITIES:
-                {new_entities_str}
-
-                EXISTING_ENTITIES:
-                {existing_entities_str}
-
-                Identify which new entities should be merged with existing entities.""")
-        ])
+        # Static system prompt first so the provider can cache it; entity lists go in the user turn
+        messages = [
+            build_system_message(GRAPH_ENTITY_RESOLUTION_PROMPT, self.llm),
+            HumanMessage(content=build_graph_entity_resolution_user(new_entities, candidates))
+        ]
         
         parser = JsonOutputParser()
-        chain = prompt | self.llm | parser
+        chain = self.llm | parser
         
         try:
-            response = chain.invoke({})
+            response = chain.invoke(messages)
             return response
         except Exception as e:
             logger.error(f"LLM entity resolution failed: {e}")
@@ -157,39 +176,18 @@ class GraphResolutionEngine:
         if not self.llm or not new_relationships:
             return {"duplicates": [], "conflicts": [], "updates": []}
         
-        # Prepare relationship lists
-        new_rels_str = "\n".join([
-            f"- {subj} --[{rel}]--> {obj}" for subj, rel, obj in new_relationships
-        ])
-        
-        existing_rels_str = "\n".join([
-            f"- {subj} --[{rel}]--> {obj}" for subj, rel, obj in existing_relationships[:100]
-        ])
-        
-        mappings_str = "\n".join([
-            f"- {new_entity} → {existing_entity}" 
-            for new_entity, existing_entity in entity_mappings.items()
-        ])
-        
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content=RELATIONSHIP_RESOLUTION_PROMPT),
-            HumanMessage(content=f"""NEW_RELATIONSHIPS:
-                {new_rels_str}
-
-                EXISTING_RELATIONSHIPS:
-                {existing_rels_str}
-
-                ENTITY_MAPPINGS:
-                {mappings_str}
-
-                Identify duplicates, conflicts, and required updates for these relationships.""")
-        ])
+        messages = [
+            build_system_message(RELATIONSHIP_RESOLUTION_PROMPT, self.llm),
+            HumanMessage(content=build_relationship_resolution_user(
+                new_relationships, existing_relationships[:100], entity_mappings
+            ))
+        ]
         
         parser = JsonOutputParser()
-        chain = prompt | self.llm | parser
+        chain = self.llm | parser
         
         try:
-            response = chain.invoke({})
+            response = chain.invoke(messages)
             return response
         except Exception as e:
             logger.error(f"LLM relationship resolution failed: {e}")
@@ -207,17 +205,32 @@ class GraphResolutionEngine:
         Returns:
             Mapping of new entity names to canonical names
         """
-        entity_mappings = {}
+        # Only apply high-confidence resolutions
+        accepted = [r for r in resolutions if r.get('confidence', 0.0) >= 0.8]
+        
+        # Chained or conflicting merges collapse to one existing entity per group
+        groups = canonical_mapping(
+            [(r['new_entity'], r['existing_entity']) for r in accepted],
+            preferred=[r['existing_entity'] for r in accepted]
+        )
+        entity_mappings = {
+            r['new_entity']: groups[r['new_entity']]
+            for r in accepted
+            if groups[r['new_entity']] != r['new_entity']
+        }
         
-        for resolution in resolutions:
-            new_entity = resolution['new_entity']
-            existing_entity = resolution['existing_entity']
-            confidence = resolution.get('confidence', 0.0)
-            reason = resolution.get('reason', 'LLM resolution')
+        # One session for the whole batch instead of a pool checkout per resolution
+        with self.driver.session() as session:
+            applied = set()
+            for resolution in accepted:
+                new_entity = resolution['new_entity']
+                if new_entity not in entity_mappings or new_entity in applied:
+                    continue
+                applied.add(new_entity)
+                existing_entity = entity_mappings[new_entity]
+                confidence = resolution.get('confidence', 0.0)
+                reason = resolution.get('reason', 'LLM resolution')
             
-            if confidence >= 0.8:  # Only apply high-confidence resolutions
-                entity_mappings[new_entity] = existing_entity
-                
                 # Update the existing entity with any new information
                 query = """
                 MATCH (e:Entity {name: $existing_entity})
@@ -233,15 +246,14 @@ class GraphResolutionEngine:
                     r.resolution_reason = $reason
                 RETURN e.name
                 """
-                
-                with self.driver.session() as session:
-                    session.run(query,
-                               existing_entity=existing_entity,
-                               post_id=post_id,
-                               new_entity=new_entity,
-                               confidence=confidence,
-                               reason=reason)
-                
+            
+                session.run(query,
+                           existing_entity=existing_entity,
+                           post_id=post_id,
+                           new_entity=new_entity,
+                           confidence=confidence,
+                           reason=reason)
+            
                 logger.info(f"Resolved entity '{new_entity}' -> '{existing_entity}' (confidence: {confidence})")
         
         return entity_mappings
@@ -256,43 +268,43 @@ class GraphResolutionEngine:
             post_id: ID of the post being processed
             entity_mappings: Entity name mappings
         """
-        # Handle duplicate relationships - merge them
-        for duplicate in resolution_result.get('duplicates', []):
-            new_rel = duplicate['new_relationship']
-            existing_rel = duplicate['existing_relationship']
+        # One session for all duplicate and conflict writes
+        with self.driver.session() as session:
+            # Handle duplicate relationships - merge them
+            for duplicate in resolution_result.get('duplicates', []):
+                new_rel = duplicate['new_relationship']
+                existing_rel = duplicate['existing_relationship']
             
-            # Update relationship weights/counts
-            query = """
-            MATCH (e1:Entity {name: $subject})-[r]->(e2:Entity {name: $object})
-            WHERE type(r) = $relation
-            SET r.mention_count = COALESCE(r.mention_count, 1) + 1,
-                r.last_mentioned_post = $post_id,
-                r.updated_at = datetime()
-            RETURN r
-            """
+                # Update relationship weights/counts
+                query = """
+                MATCH (e1:Entity {name: $subject})-[r]->(e2:Entity {name: $object})
+                WHERE type(r) = $relation
+                SET r.mention_count = COALESCE(r.mention_count, 1) + 1,
+                    r.last_mentioned_post = $post_id,
+                    r.updated_at = datetime()
+                RETURN r
+                """
             
-            with self.driver.session() as session:
                 session.run(query,
                            subject=existing_rel[0],
                            relation=existing_rel[1],
                            object=existing_rel[2],
                            post_id=post_id)
         
-        # Handle conflicts - flag for manual review
-        for conflict in resolution_result.get('conflicts', []):
-            query = """
-            CREATE (c:ConflictFlag {
-                post_id: $post_id,
-                new_relationship: $new_rel,
-                existing_relationship: $existing_rel,
-                reason: $reason,
-                created_at: datetime(),
-                status: 'pending_review'
-            })
-            RETURN c
-            """
+            # Handle conflicts - flag for manual review
+            for conflict in resolution_result.get('conflicts', []):
+                query = """
+                CREATE (c:ConflictFlag {
+                    post_id: $post_id,
+                    new_relationship: $new_rel,
+                    existing_relationship: $existing_rel,
+                    reason: $reason,
+                    created_at: datetime(),
+                    status: 'pending_review'
+                })
+                RETURN c
+                """
             
-            with self.driver.session() as session:
                 session.run(query,
                            post_id=post_id,
                            new_rel=str(conflict['new_relationship']),
@@ -402,37 +414,10 @@ def get_resolution_statistics(driver: Driver, post_id: str = None) -> Dict[str,
     Returns:
         Dictionary containing resolution statistics
     """
-    post_filter = "WHERE c.post_id = $post_id" if post_id else ""
-    params = {"post_id": post_id} if post_id else {}
-    
-    queries = {
-        "total_resolutions": f"""
-            MATCH (e:Entity)
-            WHERE e.resolution_count > 0
-            RETURN count(e) as count
-        """,
-        "total_conflicts": f"""
-            MATCH (c:ConflictFlag)
-            {post_filter}
-            RETURN count(c) as count
-        """,
-        "pending_conflicts": f"""
-            MATCH (c:ConflictFlag)
-            WHERE c.status = 'pending_review'
-            {post_filter and "AND " + post_filter.replace("WHERE", "")}
-            RETURN count(c) as count
-        """,
-        "resolved_mentions": f"""
-            MATCH ()-[r:MENTIONS]->()
-            WHERE r.resolution_applied = true
-            RETURN count(r) as count
-        """
-    }
-    
     stats = {}
-    with driver.session() as session:
-        for stat_name, query in queries.items():
-            result = session.run(query, **params)
+    with driver.session(default_access_mode=READ_ACCESS) as session:
+        for stat_name, query in RESOLUTION_STATISTICS_QUERIES.items():
+            result = session.run(query, post_id=post_id)
             stats[stat_name] = result.single()["count"]
     
     return stats
\ No newline at end of file
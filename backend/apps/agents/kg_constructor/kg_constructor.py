@@ -6,13 +6,17 @@ import networkx as nx
 import matplotlib.pyplot as plt
 from typing import TypedDict, List, Tuple, Dict, Any
 from django.conf import settings
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.output_parsers import JsonOutputParser
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 
-from .system_prompts import ENTITY_EXTRACTOR_PROMPT, RELATION_EXTRACTOR_PROMPT, ENTITY_RESOLVER_PROMPT
+from .resolution_groups import canonical_mapping
+from .system_prompts import (
+    ENTITY_EXTRACTOR_PROMPT, RELATION_EXTRACTOR_PROMPT, ENTITY_RESOLVER_PROMPT,
+    build_system_message, build_entity_extractor_user, build_relation_extractor_user,
+    build_entity_resolver_user,
+)
 
 # Entity types for extraction
 ENTITY_TYPES = ["Person", "Organization", "Location", "Product", "Concept", "Event", "Other"]
@@ -55,19 +59,19 @@ def entity_extractor(state: KGState) -> KGState:
     llm = state["llm"]
     text = state["raw_text"]
     
-    # Create the prompt
-    prompt = ChatPromptTemplate.from_messages([
-        SystemMessage(content=ENTITY_EXTRACTOR_PROMPT),
-        HumanMessage(content=f"Text to analyze:\n\n{text}\n\nExtract entities and their types from this text.")
-    ])
+    # Static system prompt first so the provider can cache it; text goes in the user turn
+    messages = [
+        build_system_message(ENTITY_EXTRACTOR_PROMPT, llm),
+        HumanMessage(content=build_entity_extractor_user(text))
+    ]
     
     # Set up JSON output parser
     parser = JsonOutputParser()
-    chain = prompt | llm | parser
+    chain = llm | parser
     
     try:
         # Invoke the LLM
-        response = chain.invoke({})
+        response = chain.invoke(messages)
         entities = response.get("entities", [])
         
         # Add the main topic as a Concept if not already present
@@ -102,25 +106,18 @@ def relation_extractor(state: KGState) -> KGState:
     entity_names = [e["name"] for e in entities]
     
     # Create the prompt
-    entities_str = "\n".join([f"- {e['name']} ({e['type']})" for e in entities])
-    prompt = ChatPromptTemplate.from_messages([
-        SystemMessage(content=RELATION_EXTRACTOR_PROMPT),
-        HumanMessage(content=f"""Text to analyze:
-            {text}
-
-            Entities identified:
-            {entities_str}
-
-            Extract relationships between these entities from the text.""")
-    ])
+    messages = [
+        build_system_message(RELATION_EXTRACTOR_PROMPT, llm),
+        HumanMessage(content=build_relation_extractor_user(text, entities))
+    ]
     
     # Set up JSON output parser
     parser = JsonOutputParser()
-    chain = prompt | llm | parser
+    chain = llm | parser
     
     try:
         # Invoke the LLM
-        response = chain.invoke({})
+        response = chain.invoke(messages)
         relations_list = response.get("relations", [])
         
         # Convert to tuples and validate
@@ -156,33 +153,31 @@ def entity_resolver(state: KGState) -> KGState:
     llm = state["llm"]
     entities = state["entities"]
     
-    # Create entities list for the prompt
-    entities_str = "\n".join([f"- {e['name']} (Type: {e['type']})" for e in entities])
-    
-    prompt = ChatPromptTemplate.from_messages([
-        SystemMessage(content=ENTITY_RESOLVER_PROMPT),
-        HumanMessage(content=f"""Entities to resolve:
-        {entities_str}
-
-        Identify groups of entities that should be merged together.""")
-    ])
+    # Create the prompt
+    messages = [
+        build_system_message(ENTITY_RESOLVER_PROMPT, llm),
+        HumanMessage(content=build_entity_resolver_user(entities))
+    ]
     
     # Set up JSON output parser
     parser = JsonOutputParser()
-    chain = prompt | llm | parser
+    chain = llm | parser
     
     try:
         # Invoke the LLM
-        response = chain.invoke({})
+        response = chain.invoke(messages)
         resolutions = response.get("resolutions", [])
         
-        # Build entity mapping
-        entity_map = {}
-        for resolution in resolutions:
-            canonical = resolution["canonical"]
-            aliases = resolution.get("aliases", [])
-            for alias in aliases:
-                entity_map[alias.lower()] = canonical
+        # Build entity mapping; overlapping alias groups collapse to one canonical name
+        entity_map = canonical_mapping(
+            [
+                (alias, resolution["canonical"])
+                for resolution in resolutions
+                for alias in resolution.get("aliases", [])
+            ],
+            preferred=[resolution["canonical"] for resolution in resolutions],
+            key=str.lower
+        )
         
         # Map all entities to their canonical forms
         for entity in entities:
@@ -5,15 +5,442 @@ This module provides functionality to connect to Neo4j and upsert knowledge grap
 from text data with graph resolution capabilities.
 """
 
+import asyncio
+import atexit
 import logging
-from typing import Dict, List, Any, Optional
-from neo4j import GraphDatabase, Driver
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Tuple
+from neo4j import AsyncGraphDatabase, GraphDatabase, Driver, READ_ACCESS
 from django.conf import settings
 import json
 from .graph_resolution import GraphResolutionEngine, create_graph_resolution_indexes
 
 logger = logging.getLogger(__name__)
 
+# Drivers own a connection pool and background threads, so share one per
+# (uri, username, password) across all Neo4jClient instances in the process.
+_DRIVER_CACHE: Dict[Tuple[str, str, str], Driver] = {}
+_DRIVER_LOCK = threading.Lock()
+
+
+def _get_driver(uri: str, username: str, password: str) -> Driver:
+    """
+    Return the shared driver for the given credentials, creating it once.
+    
+    Args:
+        uri: Neo4j URI
+        username: Neo4j username
+        password: Neo4j password
+        
+    Returns:
+        Shared Neo4j driver
+    """
+    key = (uri, username, password)
+    driver = _DRIVER_CACHE.get(key)
+    if driver is not None:
+        return driver
+    
+    with _DRIVER_LOCK:
+        driver = _DRIVER_CACHE.get(key)
+        if driver is None:
+            driver = GraphDatabase.driver(
+                uri, 
+                auth=(username, password),
+                max_connection_pool_size=getattr(settings, 'NEO4J_POOL_SIZE', 50),
+                connection_acquisition_timeout=getattr(settings, 'NEO4J_ACQ_TIMEOUT', 60),
+                max_connection_lifetime=3600,
+                keep_alive=True,
+                connection_timeout=15
+            )
+            # Test connection
+            driver.verify_connectivity()
+            _DRIVER_CACHE[key] = driver
+            logger.info(f"Successfully connected to Neo4j at {uri}")
+        return driver
+
+
+_APOC_SUPPORT: Dict[Tuple[str, str, str], bool] = {}
+
+# Databases whose constraints and indexes were already ensured by this process
+_SCHEMA_ENSURED = set()
+_SCHEMA_LOCK = threading.Lock()
+
+# Known (uri, user_id, post_id) CARES relationships. Only positive answers are
+# cached since a CARES edge is never removed outside clear_database().
+_CARES_CACHE_SIZE = 10_000
+_CARES_CACHE: "OrderedDict[Tuple[str, str, str], None]" = OrderedDict()
+_CARES_LOCK = threading.Lock()
+
+
+def _cares_cached(key: Tuple[str, str, str]) -> bool:
+    """Return True if the CARES relationship is already known, refreshing its recency."""
+    with _CARES_LOCK:
+        if key in _CARES_CACHE:
+            _CARES_CACHE.move_to_end(key)
+            return True
+        return False
+
+
+def _remember_cares(key: Tuple[str, str, str]):
+    """Record a known CARES relationship, evicting the least recently used entry."""
+    with _CARES_LOCK:
+        _CARES_CACHE[key] = None
+        _CARES_CACHE.move_to_end(key)
+        if len(_CARES_CACHE) > _CARES_CACHE_SIZE:
+            _CARES_CACHE.popitem(last=False)
+
+
+# Short-lived results of read endpoints (entity search, post graphs), keyed by
+# (uri, kind, *args). Writes in this process drop the affected post's graph;
+# other processes see changes once the TTL expires. Cached values are shared,
+# so callers must treat them as read-only.
+_READ_CACHE_SIZE = 1024
+_READ_CACHE_TTL_SECONDS = 30
+_READ_CACHE: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+_READ_LOCK = threading.Lock()
+
+
+def _read_cached(key: tuple) -> Optional[Any]:
+    """Return a cached read result, or None if missing or expired."""
+    with _READ_LOCK:
+        entry = _READ_CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _READ_CACHE[key]
+            return None
+        _READ_CACHE.move_to_end(key)
+        return value
+
+
+def _remember_read(key: tuple, value: Any):
+    """Cache a read result, evicting the least recently used entry."""
+    with _READ_LOCK:
+        _READ_CACHE[key] = (time.monotonic() + _READ_CACHE_TTL_SECONDS, value)
+        _READ_CACHE.move_to_end(key)
+        if len(_READ_CACHE) > _READ_CACHE_SIZE:
+            _READ_CACHE.popitem(last=False)
+
+
+def _forget_reads(uri: str, post_id: Optional[str] = None):
+    """Drop cached reads for one post's graph, or everything for the database."""
+    with _READ_LOCK:
+        if post_id is None:
+            stale = [key for key in _READ_CACHE if key[0] == uri]
+        else:
+            stale = [(uri, "post_graph", post_id)]
+        for key in stale:
+            _READ_CACHE.pop(key, None)
+
+
+def _probe_apoc(driver: Driver) -> bool:
+    """
+    Check once whether the APOC procedures used by the client are installed.
+    
+    Args:
+        driver: Neo4j database driver
+        
+    Returns:
+        True if apoc.merge.relationship is available
+    """
+    try:
+        with driver.session(default_access_mode=READ_ACCESS) as session:
+            record = session.run(
+                "CALL apoc.help('apoc.merge.relationship') YIELD name RETURN count(name) > 0 AS has_apoc"
+            ).single()
+            return bool(record and record["has_apoc"])
+    except Exception as e:
+        logger.info(f"APOC not available, using generic RELATED relationships: {e}")
+        return False
+
+
+@atexit.register
+def _close_drivers():
+    """Close all shared drivers at process shutdown."""
+    for driver in _DRIVER_CACHE.values():
+        try:
+            driver.close()
+        except Exception as e:
+            logger.warning(f"Failed to close Neo4j driver: {e}")
+    _DRIVER_CACHE.clear()
+
+
+# $mappings renames resolved entities to their canonical names server-side.
+# identProps include post_id, so the same fact from the same post merges
+# into one edge instead of creating duplicates (MERGE rejects null values)
+MERGE_RELATIONSHIPS_QUERY = """
+UNWIND $rows AS r
+WITH r, COALESCE($mappings[r.subject], r.subject) AS subject,
+     COALESCE($mappings[r.object], r.object) AS object
+MATCH (e1:Entity {name: subject})
+MATCH (e2:Entity {name: object})
+CALL apoc.merge.relationship(e1, r.type,
+    CASE WHEN $post_id IS NULL THEN {} ELSE {post_id: $post_id} END, {
+    created_at: datetime(),
+    source: 'kg_extraction'
+}, e2, {}) YIELD rel
+RETURN count(rel) as count
+"""
+
+MERGE_RELATED_FALLBACK_QUERY = """
+UNWIND $rows AS r
+WITH r, COALESCE($mappings[r.subject], r.subject) AS subject,
+     COALESCE($mappings[r.object], r.object) AS object
+MATCH (e1:Entity {name: subject})
+MATCH (e2:Entity {name: object})
+MERGE (e1)-[rel:RELATED {relation_type: r.type, post_id: COALESCE($post_id, '')}]->(e2)
+ON CREATE SET rel.created_at = datetime(),
+              rel.source = 'kg_extraction'
+RETURN count(rel) as count
+"""
+
+
+UPSERT_USER_QUERY = """
+MERGE (u:User {user_id: $user_id})
+SET u.name = $name,
+    u.email = $email,
+    u.created_at = $created_at,
+    u.updated_at = datetime()
+RETURN u.user_id as user_id
+"""
+
+UPSERT_POST_QUERY = """
+MERGE (v:Post {post_id: $post_id})
+SET v.title = $title,
+    v.description = $description,
+    v.platform = $platform,
+    v.duration = $duration,
+    v.upload_date = $upload_date,
+    v.url = $url,
+    v.updated_at = datetime()
+RETURN v.post_id as post_id
+"""
+
+UPSERT_TOPIC_QUERY = """
+MERGE (t:Topic {name: $name})
+SET t.description = $description,
+    t.category = $category,
+    t.updated_at = datetime()
+RETURN t.name as name
+"""
+
+UPSERT_SOURCE_QUERY = """
+MERGE (s:Source {name: $name})
+SET s.type = $type,
+    s.url = $url,
+    s.description = $description,
+    s.updated_at = datetime()
+RETURN s.name as name
+"""
+
+UPSERT_ENTITY_QUERY = """
+MERGE (e:Entity {name: $name})
+SET e.type = $type,
+    e.description = $description,
+    e.confidence = $confidence,
+    e.updated_at = datetime()
+RETURN e.name as name
+"""
+
+MERGE_MENTION_QUERY = """
+MATCH (v:Post {post_id: $post_id})
+MATCH (e:Entity {name: $entity_name})
+MERGE (v)-[r:MENTIONS]->(e)
+SET r.created_at = COALESCE(r.created_at, datetime())
+RETURN r
+"""
+
+UPSERT_ENTITIES_BATCH_QUERY = """
+UNWIND $rows AS r
+MERGE (e:Entity {name: r.name})
+SET e.type = r.type,
+    e.description = r.description,
+    e.confidence = r.confidence,
+    e.updated_at = datetime()
+WITH e
+OPTIONAL MATCH (v:Post {post_id: $post_id})
+FOREACH (_ IN CASE WHEN v IS NULL THEN [] ELSE [1] END |
+    MERGE (v)-[m:MENTIONS]->(e)
+    SET m.created_at = COALESCE(m.created_at, datetime())
+)
+RETURN count(e) as count
+"""
+
+CREATE_CARES_QUERY = """
+MATCH (u:User {user_id: $user_id})
+MATCH (v:Post {post_id: $post_id})
+MERGE (u)-[r:CARES]->(v)
+SET r.created_at = datetime(),
+    r += $properties
+RETURN r
+"""
+
+CREATE_ABOUT_QUERY = """
+MATCH (v:Post {post_id: $post_id})
+MATCH (t:Topic {name: $topic_name})
+MERGE (v)-[r:ABOUT]->(t)
+SET r.created_at = datetime(),
+    r += $properties
+RETURN r
+"""
+
+CREATE_MENTIONS_QUERY = """
+MATCH (v:Post {post_id: $post_id})
+MATCH (e:Entity {name: $entity_name})
+MERGE (v)-[r:MENTIONS]->(e)
+SET r.created_at = datetime(),
+    r += $properties
+RETURN r
+"""
+
+CREATE_MENTIONS_BATCH_QUERY = """
+UNWIND $rows AS r
+MATCH (v:Post {post_id: $post_id})
+MATCH (e:Entity {name: r.entity_name})
+MERGE (v)-[m:MENTIONS]->(e)
+SET m.created_at = datetime(),
+    m += r.properties
+RETURN count(m) as count
+"""
+
+CREATE_FROM_QUERY = """
+MATCH (v:Post {post_id: $post_id})
+MATCH (s:Source {name: $source_name})
+MERGE (v)-[r:FROM]->(s)
+SET r.created_at = datetime(),
+    r += $properties
+RETURN r
+"""
+
+CHECK_POST_QUERY = "RETURN EXISTS { MATCH (v:Post {post_id: $post_id}) } AS exists"
+
+CHECK_USER_POST_QUERY = """
+RETURN EXISTS {
+    MATCH (u:User {user_id: $user_id})-[:CARES]->(v:Post {post_id: $post_id})
+} AS exists
+"""
+
+POST_DETAILS_QUERY = """
+MATCH (v:Post {post_id: $post_id})
+OPTIONAL MATCH (v)-[:ABOUT]->(t:Topic)
+OPTIONAL MATCH (v)-[:FROM]->(s:Source)
+OPTIONAL MATCH (v)-[:MENTIONS]->(e:Entity)
+RETURN properties(v) as post,
+       collect(DISTINCT properties(t)) as topics,
+       collect(DISTINCT properties(s)) as sources,
+       collect(DISTINCT properties(e)) as entities
+"""
+
+GRAPH_STATS_APOC_QUERY = """
+CALL apoc.meta.stats() YIELD nodeCount, relCount, labels
+RETURN nodeCount AS total_nodes,
+       relCount AS total_relationships,
+       COALESCE(labels.User, 0) AS users,
+       COALESCE(labels.Post, 0) AS posts,
+       COALESCE(labels.Topic, 0) AS topics,
+       COALESCE(labels.Source, 0) AS sources,
+       COALESCE(labels.Entity, 0) AS entities
+"""
+
+# Plain count() per label is also served from the count store
+GRAPH_STATS_QUERY = """
+CALL { MATCH (n) RETURN count(n) AS total_nodes }
+CALL { MATCH ()-[r]->() RETURN count(r) AS total_relationships }
+CALL { MATCH (n:User) RETURN count(n) AS users }
+CALL { MATCH (n:Post) RETURN count(n) AS posts }
+CALL { MATCH (n:Topic) RETURN count(n) AS topics }
+CALL { MATCH (n:Source) RETURN count(n) AS sources }
+CALL { MATCH (n:Entity) RETURN count(n) AS entities }
+RETURN total_nodes, total_relationships, users, posts, topics, sources, entities
+"""
+
+SEARCH_ENTITIES_QUERY = """
+CALL db.index.fulltext.queryNodes('entity_name_text_ft', $query) YIELD node, score
+RETURN node.name as name, node.type as type, node.description as description
+ORDER BY score DESC
+LIMIT $limit
+"""
+
+POST_KNOWLEDGE_GRAPH_QUERY = """
+MATCH (v:Post {post_id: $post_id})-[r]-(n)
+RETURN elementId(v) AS vid, properties(v) AS vprops,
+       elementId(n) AS nid, properties(n) AS nprops, labels(n) AS nlabels,
+       type(r) AS rtype, properties(r) AS rprops
+"""
+
+CONFLICT_FLAGS_QUERY = """
+MATCH (c:ConflictFlag)
+WHERE c.status = $status
+RETURN c.post_id as post_id,
+       c.new_relationship as new_relationship,
+       c.existing_relationship as existing_relationship,
+       c.reason as reason,
+       c.created_at as created_at
+ORDER BY c.created_at DESC
+"""
+
+RESOLVE_CONFLICT_QUERY = """
+MATCH (c:ConflictFlag {
+    post_id: $post_id,
+    new_relationship: $new_relationship,
+    existing_relationship: $existing_relationship
+})
+SET c.status = 'resolved',
+    c.resolution = $resolution,
+    c.resolved_by = $resolved_by,
+    c.resolved_at = datetime()
+RETURN c
+"""
+
+
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+
+def _fulltext_query(text: str) -> str:
+    """
+    Turn free text into a Lucene query that prefix-matches every term.
+
+    Lucene operators and special characters in the input are escaped, so
+    user text is always matched literally.
+    """
+    terms = [_LUCENE_SPECIAL.sub(r'\\\1', term) for term in text.split()]
+    return ' AND '.join(f'{term}*' for term in terms)
+
+
+# Rows per UNWIND statement: large enough to amortise the commit, small enough
+# to keep each transaction's memory bounded on the server
+UNWIND_BATCH_SIZE = 10_000
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int = UNWIND_BATCH_SIZE):
+    """Yield consecutive slices of at most ``size`` rows."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _single(result):
+    """Read the single record of a result and consume it so the connection frees up."""
+    record = result.single(strict=False)
+    result.consume()
+    return record
+
+
+def _relationship_rows(relationships: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Build UNWIND rows carrying the upper-cased relation type per row."""
+    return [
+        {
+            'subject': rel['subject'],
+            'type': rel['relation'].upper(),
+            'object': rel['object'],
+        }
+        for rel in relationships
+    ]
+
 
 class Neo4jClient:
     """
@@ -35,6 +462,7 @@ class Neo4jClient:
         self.password = password or getattr(settings, 'NEO4J_PASSWORD', 'password')
         
         self._driver: Optional[Driver] = None
+        self._has_apoc = False
         self._resolution_engine: Optional[GraphResolutionEngine] = None
         self._connect()
         
@@ -46,23 +474,23 @@ class Neo4jClient:
     def _connect(self):
         """Establish connection to Neo4j database."""
         try:
-            self._driver = GraphDatabase.driver(
-                self.uri, 
-                auth=(self.username, self.password)
-            )
-            # Test connection
-            with self._driver.session() as session:
-                session.run("RETURN 1")
-            logger.info(f"Successfully connected to Neo4j at {self.uri}")
+            self._driver = _get_driver(self.uri, self.username, self.password)
+            key = (self.uri, self.username, self.password)
+            if key not in _APOC_SUPPORT:
+                _APOC_SUPPORT[key] = _probe_apoc(self._driver)
+            self._has_apoc = _APOC_SUPPORT[key]
         except Exception as e:
             logger.error(f"Failed to connect to Neo4j: {e}")
             raise
     
     def close(self):
-        """Close the Neo4j connection."""
-        if self._driver:
-            self._driver.close()
-            logger.info("Neo4j connection closed")
+        """
+        Release this client.
+        
+        The underlying driver is shared across clients and closed at process
+        shutdown, so this does not close it.
+        """
+        logger.debug("Neo4j client released; shared driver stays open")
     
     def __enter__(self):
         return self
@@ -70,6 +498,58 @@ class Neo4jClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
     
+    @contextmanager
+    def bulk(self):
+        """
+        Run several writes inside one explicit transaction.
+        
+        Yields a transaction that can be passed as ``tx`` to the upsert and
+        create_* methods so that all statements commit together.
+        """
+        with self._driver.session() as session:
+            tx = session.begin_transaction()
+            try:
+                yield tx
+                tx.commit()
+            except Exception:
+                tx.rollback()
+                raise
+            finally:
+                tx.close()
+    
+    def _run(self, query: str, tx=None, **params):
+        """
+        Run a single-row query in ``tx`` if given, otherwise in a new session.
+        
+        Args:
+            query: Cypher query
+            tx: Optional open transaction from ``bulk()``
+            **params: Query parameters
+            
+        Returns:
+            The single result record, or None
+        """
+        if tx is not None:
+            return _single(tx.run(query, **params))
+        with self._driver.session() as session:
+            return _single(session.run(query, **params))
+    
+    def _read(self, query: str, **params):
+        """
+        Run a single-row read-only query in a READ_ACCESS session.
+        
+        Read sessions can be routed to followers in a cluster.
+        
+        Args:
+            query: Cypher query
+            **params: Query parameters
+            
+        Returns:
+            The single result record, or None
+        """
+        with self._driver.session(default_access_mode=READ_ACCESS) as session:
+            return _single(session.run(query, **params))
+    
     def test_connection(self) -> bool:
         """
         Test if connection to Neo4j is working.
@@ -78,9 +558,7 @@ class Neo4jClient:
             True if connection is successful, False otherwise
         """
         try:
-            with self._driver.session() as session:
-                result = session.run("RETURN 1 as test")
-                return result.single()["test"] == 1
+            return self._read("RETURN 1 as test")["test"] == 1
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
             return False
@@ -91,208 +569,208 @@ class Neo4jClient:
         WARNING: This deletes all data!
         """
         with self._driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
-            logger.warning("Database cleared - all nodes and relationships deleted")
+            session.run("MATCH (n) DETACH DELETE n").consume()
+        with _CARES_LOCK:
+            for key in [key for key in _CARES_CACHE if key[0] == self.uri]:
+                del _CARES_CACHE[key]
+        _forget_reads(self.uri)
+        logger.warning("Database cleared - all nodes and relationships deleted")
     
     def create_indexes(self):
-        """Create necessary indexes for better performance."""
+        """Create uniqueness constraints and indexes for better performance."""
+        # Uniqueness constraints back MERGE with their own lookup index and let
+        # it take key-level locks; the plain indexes they replace must go first
+        constraints = [
+            "DROP INDEX user_id_index IF EXISTS",
+            "DROP INDEX post_id_index IF EXISTS",
+            "DROP INDEX topic_name_index IF EXISTS",
+            "DROP INDEX source_name_index IF EXISTS",
+            "DROP INDEX entity_name_index IF EXISTS",
+            "CREATE CONSTRAINT user_id_unique IF NOT EXISTS FOR (u:User) REQUIRE u.user_id IS UNIQUE",
+            "CREATE CONSTRAINT post_id_unique IF NOT EXISTS FOR (v:Post) REQUIRE v.post_id IS UNIQUE",
+            "CREATE CONSTRAINT topic_name_unique IF NOT EXISTS FOR (t:Topic) REQUIRE t.name IS UNIQUE",
+            "CREATE CONSTRAINT source_name_unique IF NOT EXISTS FOR (s:Source) REQUIRE s.name IS UNIQUE",
+            "CREATE CONSTRAINT entity_name_unique IF NOT EXISTS FOR (e:Entity) REQUIRE e.name IS UNIQUE",
+        ]
         indexes = [
-            "CREATE INDEX user_id_index IF NOT EXISTS FOR (u:User) ON (u.user_id)",
-            "CREATE INDEX post_id_index IF NOT EXISTS FOR (v:Post) ON (v.post_id)",
-            "CREATE INDEX topic_name_index IF NOT EXISTS FOR (t:Topic) ON (t.name)",
-            "CREATE INDEX source_name_index IF NOT EXISTS FOR (s:Source) ON (s.name)",
-            "CREATE INDEX entity_name_index IF NOT EXISTS FOR (e:Entity) ON (e.name)",
+            # The earlier index also covered description, which let searches
+            # match entities whose name does not contain the query
+            "DROP INDEX entity_name_ft IF EXISTS",
+            "CREATE FULLTEXT INDEX entity_name_text_ft IF NOT EXISTS FOR (e:Entity) ON EACH [e.name]",
         ]
         
-        with self._driver.session() as session:
-            for index in indexes:
-                try:
-                    session.run(index)
-                    logger.info(f"Created index: {index}")
-                except Exception as e:
-                    logger.warning(f"Index creation failed (may already exist): {e}")
+        # IF EXISTS / IF NOT EXISTS are idempotent, so each group shares one schema commit
+        for label, statements in (("constraints", constraints), ("indexes", indexes)):
+            try:
+                with self.bulk() as tx:
+                    for statement in statements:
+                        tx.run(statement)
+                logger.info(f"Ensured {label}")
+            except Exception as e:
+                logger.warning(f"Creating {label} failed: {e}")
         
         # Create resolution-specific indexes
         create_graph_resolution_indexes(self._driver)
     
-    def upsert_user(self, user_data: Dict[str, Any]) -> str:
+    def ensure_indexes(self):
+        """
+        Create constraints and indexes once per database per process.
+        
+        Schema statements take a schema lock on the server, so clients built
+        per request call this instead of create_indexes().
+        """
+        if self.uri in _SCHEMA_ENSURED:
+            return
+        with _SCHEMA_LOCK:
+            if self.uri not in _SCHEMA_ENSURED:
+                self.create_indexes()
+                _SCHEMA_ENSURED.add(self.uri)
+    
+    def upsert_user(self, user_data: Dict[str, Any], tx=None) -> str:
         """
         Upsert a User node.
         
         Args:
             user_data: Dictionary containing user information
+            tx: Optional transaction from ``bulk()``
             
         Returns:
             User ID
         """
-        query = """
-        MERGE (u:User {user_id: $user_id})
-        SET u.name = $name,
-            u.email = $email,
-            u.created_at = $created_at,
-            u.updated_at = datetime()
-        RETURN u.user_id as user_id
-        """
-        
-        with self._driver.session() as session:
-            result = session.run(query, **user_data)
-            return result.single()["user_id"]
+        return self._run(UPSERT_USER_QUERY, tx, **user_data)["user_id"]
     
-    def upsert_post(self, post_data: Dict[str, Any]) -> str:
+    def upsert_post(self, post_data: Dict[str, Any], tx=None) -> str:
         """
         Upsert a Post node.
         
         Args:
             post_data: Dictionary containing post information
+            tx: Optional transaction from ``bulk()``
             
         Returns:
             Post ID
         """
-        query = """
-        MERGE (v:Post {post_id: $post_id})
-        SET v.title = $title,
-            v.description = $description,
-            v.platform = $platform,
-            v.duration = $duration,
-            v.upload_date = $upload_date,
-            v.url = $url,
-            v.updated_at = datetime()
-        RETURN v.post_id as post_id
-        """
-        
-        with self._driver.session() as session:
-            result = session.run(query, **post_data)
-            return result.single()["post_id"]
+        post_id = self._run(UPSERT_POST_QUERY, tx, **post_data)["post_id"]
+        _forget_reads(self.uri, post_id)
+        return post_id
     
-    def upsert_topic(self, topic_data: Dict[str, Any]) -> str:
+    def upsert_topic(self, topic_data: Dict[str, Any], tx=None) -> str:
         """
         Upsert a Topic node.
         
         Args:
             topic_data: Dictionary containing topic information
+            tx: Optional transaction from ``bulk()``
             
         Returns:
             Topic name
         """
-        query = """
-        MERGE (t:Topic {name: $name})
-        SET t.description = $description,
-            t.category = $category,
-            t.updated_at = datetime()
-        RETURN t.name as name
-        """
-        
-        with self._driver.session() as session:
-            result = session.run(query, **topic_data)
-            return result.single()["name"]
+        return self._run(UPSERT_TOPIC_QUERY, tx, **topic_data)["name"]
     
-    def upsert_source(self, source_data: Dict[str, Any]) -> str:
+    def upsert_source(self, source_data: Dict[str, Any], tx=None) -> str:
         """
         Upsert a Source node.
         
         Args:
             source_data: Dictionary containing source information
+            tx: Optional transaction from ``bulk()``
             
         Returns:
             Source name
         """
-        query = """
-        MERGE (s:Source {name: $name})
-        SET s.type = $type,
-            s.url = $url,
-            s.description = $description,
-            s.updated_at = datetime()
-        RETURN s.name as name
-        """
-        
-        with self._driver.session() as session:
-            result = session.run(query, **source_data)
-            return result.single()["name"]
+        return self._run(UPSERT_SOURCE_QUERY, tx, **source_data)["name"]
     
-    def upsert_entity(self, entity_data: Dict[str, Any], post_id: str = None) -> str:
+    def upsert_entity(self, entity_data: Dict[str, Any], post_id: str = None, tx=None) -> str:
         """
         Upsert an Entity node.
         
         Args:
             entity_data: Dictionary containing entity information
             post_id: Optional post ID for tracking entity source
+            tx: Optional transaction from ``bulk()``
             
         Returns:
             Entity name
         """
-        query = """
-        MERGE (e:Entity {name: $name})
-        SET e.type = $type,
-            e.description = $description,
-            e.confidence = $confidence,
-            e.updated_at = datetime()
-        RETURN e.name as name
-        """
+        # First upsert the entity
+        entity_name = self._run(UPSERT_ENTITY_QUERY, tx, **entity_data)["name"]
         
-        with self._driver.session() as session:
-            # First upsert the entity
-            result = session.run(query, **entity_data)
-            entity_name = result.single()["name"]
-            
-            # Then create the MENTIONS relationship if post_id is provided
-            if post_id:
-                mention_query = """
-                MATCH (v:Post {post_id: $post_id})
-                MATCH (e:Entity {name: $entity_name})
-                MERGE (v)-[r:MENTIONS]->(e)
-                SET r.created_at = COALESCE(r.created_at, datetime())
-                RETURN r
-                """
-                session.run(mention_query, post_id=post_id, entity_name=entity_name)
-            
-            return entity_name
+        # Then create the MENTIONS relationship if post_id is provided
+        if post_id:
+            self._run(MERGE_MENTION_QUERY, tx, post_id=post_id, entity_name=entity_name)
+        
+        return entity_name
         
-    def upsert_relationship(self, relationship_data: Dict[str, Any], post_id: str = None):
+    def upsert_relationship(self, relationship_data: Dict[str, Any], post_id: str = None, tx=None):
         """
         Upsert a relationship between two entities.
         
         Args:
             relationship_data: Dictionary containing 'subject', 'relation', 'object'
             post_id: Optional post ID for tracking relationship source
+            tx: Optional transaction from ``bulk()``
         """
-        query = """
-        MATCH (e1:Entity {name: $subject})
-        MATCH (e2:Entity {name: $object})
-        CALL apoc.create.relationship(e1, $relation_type, {
-            created_at: datetime(),
-            source: 'kg_extraction',
-            post_id: $post_id
-        }, e2) YIELD rel
-        RETURN rel
+        self.upsert_relationships_batch([relationship_data], post_id, tx=tx)
+    
+    def upsert_entities_batch(self, entities: List[Dict[str, Any]], post_id: str = None, tx=None) -> int:
         """
+        Upsert many Entity nodes in a single round-trip.
         
-        with self._driver.session() as session:
-            try:
-                session.run(query,
-                           subject=relationship_data['subject'],
-                           object=relationship_data['object'],
-                           relation_type=relationship_data['relation'].upper(),
-                           post_id=post_id)
-            except Exception as e:
-                # Fallback to creating a generic RELATED relationship if APOC is not available
-                fallback_query = """
-                MATCH (e1:Entity {name: $subject})
-                MATCH (e2:Entity {name: $object})
-                MERGE (e1)-[r:RELATED]->(e2)
-                SET r.relation_type = $relation_type,
-                    r.created_at = datetime(),
-                    r.source = 'kg_extraction',
-                    r.post_id = $post_id
-                RETURN r
-                """
-                session.run(fallback_query,
-                           subject=relationship_data['subject'],
-                           object=relationship_data['object'],
-                           relation_type=relationship_data['relation'],
-                           post_id=post_id)
+        Args:
+            entities: List of entity dictionaries with 'name', 'type', 'description', 'confidence'
+            post_id: Optional post ID for creating MENTIONS relationships
+            tx: Optional transaction from ``bulk()``
+            
+        Returns:
+            Number of entities upserted
+        """
+        if not entities:
+            return 0
+        
+        rows = [
+            {
+                'name': entity['name'],
+                'type': entity.get('type'),
+                'description': entity.get('description'),
+                'confidence': entity.get('confidence'),
+            }
+            for entity in entities
+        ]
+        
+        return sum(
+            self._run(UPSERT_ENTITIES_BATCH_QUERY, tx, rows=chunk, post_id=post_id)["count"]
+            for chunk in _chunks(rows)
+        )
+    
+    def upsert_relationships_batch(self, relationships: List[Dict[str, Any]], post_id: str = None,
+                                   tx=None, entity_mappings: Dict[str, str] = None) -> int:
+        """
+        Upsert many entity-to-entity relationships in a single statement.
+        
+        Args:
+            relationships: List of relationship dictionaries with 'subject', 'relation', 'object'
+            post_id: Optional post ID for tracking relationship source
+            tx: Optional transaction from ``bulk()``
+            entity_mappings: Optional mapping of entity names to resolved names
+            
+        Returns:
+            Number of relationships written
+        """
+        if not relationships:
+            return 0
+        
+        # Fall back to generic RELATED relationships if APOC is not available
+        query = MERGE_RELATIONSHIPS_QUERY if self._has_apoc else MERGE_RELATED_FALLBACK_QUERY
+        rows = _relationship_rows(relationships)
+        
+        return sum(
+            self._run(query, tx, rows=chunk, post_id=post_id,
+                      mappings=entity_mappings or {})["count"]
+            for chunk in _chunks(rows)
+        )
     
     def create_user_cares_post_relationship(self, user_id: str, post_id: str, 
-                                           properties: Dict[str, Any] = None):
+                                           properties: Dict[str, Any] = None, tx=None):
         """
         Create CARES relationship between User and Post.
         
@@ -300,24 +778,19 @@ class Neo4jClient:
             user_id: User identifier
             post_id: Post identifier
             properties: Optional relationship properties
-        """
-        query = """
-        MATCH (u:User {user_id: $user_id})
-        MATCH (v:Post {post_id: $post_id})
-        MERGE (u)-[r:CARES]->(v)
-        SET r.created_at = datetime(),
-            r += $properties
-        RETURN r
-        """
-        
-        with self._driver.session() as session:
-            session.run(query, 
-                       user_id=user_id, 
-                       post_id=post_id, 
-                       properties=properties or {})
+            tx: Optional transaction from ``bulk()``
+        """
+        self._run(CREATE_CARES_QUERY, tx,
+                  user_id=user_id,
+                  post_id=post_id,
+                  properties=properties or {})
+        _forget_reads(self.uri, post_id)
+        # Inside bulk() the write may still roll back, so only cache committed edges
+        if tx is None:
+            _remember_cares((self.uri, user_id, post_id))
     
     def create_post_about_topic_relationship(self, post_id: str, topic_name: str,
-                                            properties: Dict[str, Any] = None):
+                                            properties: Dict[str, Any] = None, tx=None):
         """
         Create ABOUT relationship between Post and Topic.
         
@@ -325,24 +798,16 @@ class Neo4jClient:
             post_id: Post identifier
             topic_name: Topic name
             properties: Optional relationship properties
+            tx: Optional transaction from ``bulk()``
         """
-        query = """
-        MATCH (v:Post {post_id: $post_id})
-        MATCH (t:Topic {name: $topic_name})
-        MERGE (v)-[r:ABOUT]->(t)
-        SET r.created_at = datetime(),
-            r += $properties
-        RETURN r
-        """
-        
-        with self._driver.session() as session:
-            session.run(query,
-                       post_id=post_id,
-                       topic_name=topic_name,
-                       properties=properties or {})
+        self._run(CREATE_ABOUT_QUERY, tx,
+                  post_id=post_id,
+                  topic_name=topic_name,
+                  properties=properties or {})
+        _forget_reads(self.uri, post_id)
     
     def create_post_mentions_entity_relationship(self, post_id: str, entity_name: str,
-                                                properties: Dict[str, Any] = None):
+                                                properties: Dict[str, Any] = None, tx=None):
         """
         Create MENTIONS relationship between Post and Entity.
         
@@ -350,24 +815,43 @@ class Neo4jClient:
             post_id: Post identifier
             entity_name: Entity name
             properties: Optional relationship properties
+            tx: Optional transaction from ``bulk()``
         """
-        query = """
-        MATCH (v:Post {post_id: $post_id})
-        MATCH (e:Entity {name: $entity_name})
-        MERGE (v)-[r:MENTIONS]->(e)
-        SET r.created_at = datetime(),
-            r += $properties
-        RETURN r
+        self._run(CREATE_MENTIONS_QUERY, tx,
+                  post_id=post_id,
+                  entity_name=entity_name,
+                  properties=properties or {})
+        _forget_reads(self.uri, post_id)
+    
+    def create_post_mentions_entities_batch(self, post_id: str, mentions: List[Dict[str, Any]],
+                                            tx=None) -> int:
         """
+        Create many MENTIONS relationships from a Post in a single statement.
         
-        with self._driver.session() as session:
-            session.run(query,
-                       post_id=post_id,
-                       entity_name=entity_name,
-                       properties=properties or {})
+        Args:
+            post_id: Post identifier
+            mentions: List of dictionaries with 'entity_name' and optional 'properties'
+            tx: Optional transaction from ``bulk()``
+            
+        Returns:
+            Number of relationships written
+        """
+        if not mentions:
+            return 0
+        
+        rows = [
+            {'entity_name': mention['entity_name'], 'properties': mention.get('properties') or {}}
+            for mention in mentions
+        ]
+        count = sum(
+            self._run(CREATE_MENTIONS_BATCH_QUERY, tx, rows=chunk, post_id=post_id)["count"]
+            for chunk in _chunks(rows)
+        )
+        _forget_reads(self.uri, post_id)
+        return count
     
     def create_post_from_source_relationship(self, post_id: str, source_name: str,
-                                            properties: Dict[str, Any] = None):
+                                            properties: Dict[str, Any] = None, tx=None):
         """
         Create FROM relationship between Post and Source.
         
@@ -375,21 +859,13 @@ class Neo4jClient:
             post_id: Post identifier
             source_name: Source name
             properties: Optional relationship properties
+            tx: Optional transaction from ``bulk()``
         """
-        query = """
-        MATCH (v:Post {post_id: $post_id})
-        MATCH (s:Source {name: $source_name})
-        MERGE (v)-[r:FROM]->(s)
-        SET r.created_at = datetime(),
-            r += $properties
-        RETURN r
-        """
-        
-        with self._driver.session() as session:
-            session.run(query,
-                       post_id=post_id,
-                       source_name=source_name,
-                       properties=properties or {})
+        self._run(CREATE_FROM_QUERY, tx,
+                  post_id=post_id,
+                  source_name=source_name,
+                  properties=properties or {})
+        _forget_reads(self.uri, post_id)
 
     def create_entity_relationships(self, relations: List[Dict[str, Any]], post_id: str = None):
         """
@@ -399,8 +875,57 @@ class Neo4jClient:
             relations: List of relationship dictionaries with 'subject', 'relation', 'object'
             post_id: Optional post ID for tracking relationship source
         """
-        for relation in relations:
-            self.upsert_relationship(relation, post_id)
+        self.upsert_relationships_batch(relations, post_id)
+    
+    async def create_entity_relationships_async(self, relations: List[Dict[str, Any]], 
+                                                post_id: str = None, concurrency: int = 16,
+                                                batch_size: int = 500) -> int:
+        """
+        Create entity relationships with concurrent writes on the async driver.
+        
+        Relations are split into chunks of ``batch_size`` rows, each written by
+        one UNWIND query; the queries run concurrently, bounded by
+        ``concurrency``. Call via ``asyncio.run(...)``.
+        
+        Args:
+            relations: List of relationship dictionaries with 'subject', 'relation', 'object'
+            post_id: Optional post ID for tracking relationship source
+            concurrency: Maximum number of in-flight queries
+            batch_size: Number of rows per query
+            
+        Returns:
+            Number of relationships written
+        """
+        if not relations:
+            return 0
+        
+        query = MERGE_RELATIONSHIPS_QUERY if self._has_apoc else MERGE_RELATED_FALLBACK_QUERY
+        rows = _relationship_rows(relations)
+        chunks = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        # Async drivers are bound to the running event loop, so one is opened per call
+        driver = AsyncGraphDatabase.driver(
+            self.uri,
+            auth=(self.username, self.password),
+            max_connection_pool_size=concurrency
+        )
+        
+        async def _write(chunk: List[Dict[str, str]]) -> int:
+            async with semaphore:
+                async with driver.session() as session:
+                    result = await session.run(query, rows=chunk, post_id=post_id, mappings={})
+                    record = await result.single()
+                    return record["count"]
+        
+        try:
+            counts = await asyncio.gather(*[
+                _write(chunk) for chunk in chunks
+            ])
+        finally:
+            await driver.close()
+        
+        return sum(counts)
     
     def check_post_exists(self, post_id: str) -> bool:
         """
@@ -412,11 +937,7 @@ class Neo4jClient:
         Returns:
             True if post exists, False otherwise
         """
-        query = "MATCH (v:Post {post_id: $post_id}) RETURN v LIMIT 1"
-        
-        with self._driver.session() as session:
-            result = session.run(query, post_id=post_id)
-            return result.single() is not None
+        return self._read(CHECK_POST_QUERY, post_id=post_id)["exists"]
     
     def check_user_post_relationship(self, user_id: str, post_id: str) -> bool:
         """
@@ -429,14 +950,14 @@ class Neo4jClient:
         Returns:
             True if relationship exists, False otherwise
         """
-        query = """
-        MATCH (u:User {user_id: $user_id})-[r:CARES]->(v:Post {post_id: $post_id})
-        RETURN r LIMIT 1
-        """
+        key = (self.uri, user_id, post_id)
+        if _cares_cached(key):
+            return True
         
-        with self._driver.session() as session:
-            result = session.run(query, user_id=user_id, post_id=post_id)
-            return result.single() is not None
+        exists = self._read(CHECK_USER_POST_QUERY, user_id=user_id, post_id=post_id)["exists"]
+        if exists:
+            _remember_cares(key)
+        return exists
     
     def get_post_details(self, post_id: str) -> Dict[str, Any]:
         """
@@ -448,30 +969,15 @@ class Neo4jClient:
         Returns:
             Dictionary containing post details and related entities
         """
-        query = """
-        MATCH (v:Post {post_id: $post_id})
-        OPTIONAL MATCH (v)-[:ABOUT]->(t:Topic)
-        OPTIONAL MATCH (v)-[:FROM]->(s:Source)
-        OPTIONAL MATCH (v)-[:MENTIONS]->(e:Entity)
-        RETURN v, 
-               collect(DISTINCT t) as topics,
-               collect(DISTINCT s) as sources,
-               collect(DISTINCT e) as entities
-        """
-        
-        with self._driver.session() as session:
-            result = session.run(query, post_id=post_id)
+        with self._driver.session(default_access_mode=READ_ACCESS) as session:
+            result = session.run(POST_DETAILS_QUERY, post_id=post_id)
             record = result.single()
             
             if not record:
                 return None
                 
-            return {
-                'post': dict(record['v']),
-                'topics': [dict(topic) for topic in record['topics'] if topic],
-                'sources': [dict(source) for source in record['sources'] if source],
-                'entities': [dict(entity) for entity in record['entities'] if entity]
-            }
+            # properties() arrives as plain dicts and collect() drops nulls
+            return record.data()
 
     def get_graph_stats(self) -> Dict[str, Any]:
         """
@@ -480,27 +986,18 @@ class Neo4jClient:
         Returns:
             Dictionary containing graph statistics
         """
-        queries = {
-            'total_nodes': "MATCH (n) RETURN count(n) as count",
-            'total_relationships': "MATCH ()-[r]->() RETURN count(r) as count",
-            'users': "MATCH (n:User) RETURN count(n) as count",
-            'posts': "MATCH (n:Post) RETURN count(n) as count",
-            'topics': "MATCH (n:Topic) RETURN count(n) as count",
-            'sources': "MATCH (n:Source) RETURN count(n) as count",
-            'entities': "MATCH (n:Entity) RETURN count(n) as count",
-        }
-        
-        stats = {}
-        with self._driver.session() as session:
-            for stat_name, query in queries.items():
-                result = session.run(query)
-                stats[stat_name] = result.single()["count"]
+        record = self._read(GRAPH_STATS_APOC_QUERY if self._has_apoc else GRAPH_STATS_QUERY)
         
-        return stats
+        return dict(record)
     
     def search_entities(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        Search for entities by name.
+        Search for entities by name using the full-text index.
+        
+        Every word of the query must start a word of the entity name,
+        case-insensitively ("mach learn" finds "Machine Learning"), and results
+        are ordered by relevance. Unlike a substring match, text in the middle
+        of a word ("earning") does not match.
         
         Args:
             query: Search query
@@ -509,17 +1006,20 @@ class Neo4jClient:
         Returns:
             List of entity dictionaries
         """
-        search_query = """
-        MATCH (e:Entity)
-        WHERE toLower(e.name) CONTAINS toLower($query)
-        RETURN e.name as name, e.type as type, e.description as description
-        ORDER BY e.name
-        LIMIT $limit
-        """
+        fulltext_query = _fulltext_query(query)
+        if not fulltext_query:
+            return []
         
-        with self._driver.session() as session:
-            result = session.run(search_query, query=query, limit=limit)
-            return [dict(record) for record in result]
+        cache_key = (self.uri, "search", fulltext_query, limit)
+        cached = _read_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        with self._driver.session(default_access_mode=READ_ACCESS) as session:
+            result = session.run(SEARCH_ENTITIES_QUERY, query=fulltext_query, limit=limit)
+            rows = [record.data() for record in result]
+        _remember_read(cache_key, rows)
+        return rows
     
     def get_post_knowledge_graph(self, post_id: str) -> Dict[str, Any]:
         """
@@ -531,41 +1031,45 @@ class Neo4jClient:
         Returns:
             Dictionary containing nodes and relationships
         """
-        query = """
-        MATCH (v:Post {post_id: $post_id})-[r]-(n)
-        RETURN v, r, n
-        """
+        cache_key = (self.uri, "post_graph", post_id)
+        cached = _read_cached(cache_key)
+        if cached is not None:
+            return cached
         
-        nodes = []
+        nodes: Dict[str, Dict[str, Any]] = {}
         relationships = []
+        post_node = None
         
-        with self._driver.session() as session:
-            result = session.run(query, post_id=post_id)
+        with self._driver.session(default_access_mode=READ_ACCESS) as session:
+            result = session.run(POST_KNOWLEDGE_GRAPH_QUERY, post_id=post_id)
             
             for record in result:
-                # Add post node
-                post_node = dict(record["v"])
-                post_node["labels"] = ["Post"]
-                if post_node not in nodes:
-                    nodes.append(post_node)
+                # Add post node once; it is the same for every record
+                if post_node is None:
+                    post_node = record["vprops"]
+                    post_node["labels"] = ["Post"]
+                    nodes[record["vid"]] = post_node
                 
                 # Add connected node
-                connected_node = dict(record["n"])
-                connected_node["labels"] = list(record["n"].labels)
-                if connected_node not in nodes:
-                    nodes.append(connected_node)
+                connected_node = nodes.get(record["nid"])
+                if connected_node is None:
+                    connected_node = record["nprops"]
+                    connected_node["labels"] = record["nlabels"]
+                    nodes[record["nid"]] = connected_node
                 
                 # Add relationship
-                rel = dict(record["r"])
-                rel["type"] = record["r"].type
+                rel = record["rprops"]
+                rel["type"] = record["rtype"]
                 rel["start"] = post_node
                 rel["end"] = connected_node
                 relationships.append(rel)
         
-        return {
-            "nodes": nodes,
+        graph = {
+            "nodes": list(nodes.values()),
             "relationships": relationships
         }
+        _remember_read(cache_key, graph)
+        return graph
     
     # Graph Resolution Methods
     
@@ -596,15 +1100,8 @@ class Neo4jClient:
                 post_id, entities, relationship_tuples
             )
             
-            # Apply entity mappings to relationships
+            # Entity mappings are applied to relationships server-side
             entity_mappings = resolution_stats['entity_mappings']
-            resolved_relationships = []
-            
-            for rel in relationships:
-                resolved_rel = rel.copy()
-                resolved_rel['subject'] = entity_mappings.get(rel['subject'], rel['subject'])
-                resolved_rel['object'] = entity_mappings.get(rel['object'], rel['object'])
-                resolved_relationships.append(resolved_rel)
             
             # Upsert only non-duplicate entities
             entities_to_upsert = [
@@ -615,15 +1112,29 @@ class Neo4jClient:
         else:
             # Standard upsert without resolution
             entities_to_upsert = entities
-            resolved_relationships = relationships
+            entity_mappings = {}
             resolution_stats = {'entity_mappings': {}, 'resolution_disabled': True}
         
-        # Proceed with standard upsert for remaining entities
+        # Drop duplicate entities (keeping the most confident) and relationships
+        unique_entities: Dict[str, Dict[str, Any]] = {}
         for entity in entities_to_upsert:
-            self.upsert_entity(entity, post_id)
+            existing = unique_entities.get(entity['name'])
+            if existing is None or (entity.get('confidence') or 0) > (existing.get('confidence') or 0):
+                unique_entities[entity['name']] = entity
+        entities_to_upsert = list(unique_entities.values())
+        
+        unique_relationships: Dict[tuple, Dict[str, Any]] = {}
+        for rel in relationships:
+            rel_key = (rel['subject'], rel['relation'].upper(), rel['object'])
+            unique_relationships.setdefault(rel_key, rel)
+        relationships = list(unique_relationships.values())
         
-        for relationship in resolved_relationships:
-            self.upsert_relationship(relationship, post_id)
+        # Proceed with batched upsert for remaining entities and relationships in one transaction
+        with self.bulk() as tx:
+            self.upsert_entities_batch(entities_to_upsert, post_id, tx=tx)
+            self.upsert_relationships_batch(relationships, post_id, tx=tx,
+                                            entity_mappings=entity_mappings)
+        _forget_reads(self.uri, post_id)
         
         return resolution_stats
     
@@ -653,20 +1164,9 @@ class Neo4jClient:
         Returns:
             List of conflict flag dictionaries
         """
-        query = """
-        MATCH (c:ConflictFlag)
-        WHERE c.status = $status
-        RETURN c.post_id as post_id,
-               c.new_relationship as new_relationship,
-               c.existing_relationship as existing_relationship,
-               c.reason as reason,
-               c.created_at as created_at
-        ORDER BY c.created_at DESC
-        """
-        
-        with self._driver.session() as session:
-            result = session.run(query, status=status)
-            return [dict(record) for record in result]
+        with self._driver.session(default_access_mode=READ_ACCESS) as session:
+            result = session.run(CONFLICT_FLAGS_QUERY, status=status)
+            return [record.data() for record in result]
     
     def resolve_conflict(self, post_id: str, new_relationship: str, 
                         existing_relationship: str, resolution: str, 
@@ -687,23 +1187,12 @@ class Neo4jClient:
         try:
             with self._driver.session() as session:
                 # Update conflict flag
-                session.run("""
-                    MATCH (c:ConflictFlag {
-                        post_id: $post_id,
-                        new_relationship: $new_relationship,
-                        existing_relationship: $existing_relationship
-                    })
-                    SET c.status = 'resolved',
-                        c.resolution = $resolution,
-                        c.resolved_by = $resolved_by,
-                        c.resolved_at = datetime()
-                    RETURN c
-                """, 
-                post_id=post_id,
-                new_relationship=new_relationship,
-                existing_relationship=existing_relationship,
-                resolution=resolution,
-                resolved_by=resolved_by)
+                session.run(RESOLVE_CONFLICT_QUERY,
+                            post_id=post_id,
+                            new_relationship=new_relationship,
+                            existing_relationship=existing_relationship,
+                            resolution=resolution,
+                            resolved_by=resolved_by).consume()
                 
                 logger.info(f"Conflict resolved for post {post_id}: {resolution}")
                 return True
@@ -0,0 +1,94 @@
+"""
+Collapse pairwise entity merges into canonical groups.
+
+LLM resolvers emit merge decisions pair by pair (or as overlapping alias
+groups). Chained or overlapping decisions must end up pointing at a single
+canonical name, which is a connected-components problem.
+"""
+
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False  # Will fall back to Python union-find
+
+
+def _component_labels(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Component label for each of n nodes given undirected edges rows[i]-cols[i]."""
+    if SCIPY_AVAILABLE:
+        graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n)).tocsr()
+        _, labels = connected_components(graph, directed=False)
+        return labels
+
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in zip(rows.tolist(), cols.tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+    return np.asarray([find(x) for x in range(n)])
+
+
+def canonical_mapping(pairs: Iterable[Tuple[str, str]],
+                      preferred: Iterable[str] = (),
+                      key: Optional[Callable[[str], str]] = None) -> Dict[str, str]:
+    """
+    Map every name in pairs to the canonical name of its merge group.
+
+    The canonical name of a group is a preferred name if the group has one
+    (e.g. the LLM's chosen canonical, or an entity already in the graph),
+    then the longest name, then the lexicographically smallest.
+
+    Args:
+        pairs: (name, name) merge decisions
+        preferred: Names to favour as canonical
+        key: Optional normalizer for node identity, e.g. str.lower
+
+    Returns:
+        Mapping of key(name) to canonical name for every name seen in pairs
+    """
+    key = key or (lambda name: name)
+    index: Dict[str, int] = {}
+    display = []
+    rows, cols = [], []
+
+    for a, b in pairs:
+        ids = []
+        for name in (a, b):
+            k = key(name)
+            if k not in index:
+                index[k] = len(display)
+                display.append(name)
+            ids.append(index[k])
+        rows.append(ids[0])
+        cols.append(ids[1])
+
+    if not display:
+        return {}
+
+    labels = _component_labels(
+        len(display), np.asarray(rows, dtype=np.int32), np.asarray(cols, dtype=np.int32)
+    )
+
+    preferred_keys = {key(name) for name in preferred}
+    best: Dict[int, Tuple[bool, int, str]] = {}
+    for k, i in index.items():
+        name = display[i]
+        # Sort key: preferred first, then longest, then alphabetical
+        rank = (k not in preferred_keys, -len(name), name)
+        label = int(labels[i])
+        if label not in best or rank < best[label]:
+            best[label] = rank
+
+    return {k: best[int(labels[i])][2] for k, i in index.items()}
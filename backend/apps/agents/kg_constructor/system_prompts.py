@@ -1,3 +1,7 @@
+from typing import Dict, List, Tuple
+
+from langchain_core.messages import SystemMessage
+
 # System prompts for each agent
 ENTITY_EXTRACTOR_PROMPT = """You are an expert multilingual entity extraction system. Your task is to identify and extract entities from text in English or Vietnamese.
 
@@ -215,4 +219,78 @@ Guidelines:
 - Identify true conflicts vs. different perspectives
 - Suggest the strongest/most canonical relationship form
 - Be conservative with conflict detection
-"""
\ No newline at end of file
+"""
+
+# Builders for the per-call user message. The prompts above stay byte-identical
+# across calls so provider-side prefix caching can reuse them; everything that
+# varies goes through these functions into a separate user message.
+
+def build_system_message(prompt: str, llm=None) -> SystemMessage:
+    """
+    Wrap a static system prompt, marking it cacheable for Anthropic models.
+    
+    OpenAI and Gemini cache stable prefixes automatically; Anthropic needs an
+    explicit cache_control breakpoint on the system block.
+    """
+    if llm is not None and type(llm).__name__ == "ChatAnthropic":
+        return SystemMessage(content=[
+            {"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}
+        ])
+    return SystemMessage(content=prompt)
+
+
+def build_entity_extractor_user(text: str) -> str:
+    return f"Text to analyze:\n\n{text}\n\nExtract entities and their types from this text."
+
+
+def build_relation_extractor_user(text: str, entities: List[Dict[str, str]]) -> str:
+    entities_str = "\n".join([f"- {e['name']} ({e['type']})" for e in entities])
+    return (
+        f"Text to analyze:\n{text}\n\n"
+        f"Entities identified:\n{entities_str}\n\n"
+        "Extract relationships between these entities from the text."
+    )
+
+
+def build_entity_resolver_user(entities: List[Dict[str, str]]) -> str:
+    entities_str = "\n".join([f"- {e['name']} (Type: {e['type']})" for e in entities])
+    return (
+        f"Entities to resolve:\n{entities_str}\n\n"
+        "Identify groups of entities that should be merged together."
+    )
+
+
+def build_graph_entity_resolution_user(new_entities: List[Dict[str, str]],
+                                       existing_entities: List[Dict[str, str]]) -> str:
+    new_entities_str = "\n".join([
+        f"- {e['name']} (Type: {e['type']})" for e in new_entities
+    ])
+    existing_entities_str = "\n".join([
+        f"- {e['name']} (Type: {e['type']})" for e in existing_entities
+    ])
+    return (
+        f"NEW_ENTITIES:\n{new_entities_str}\n\n"
+        f"EXISTING_ENTITIES:\n{existing_entities_str}\n\n"
+        "Identify which new entities should be merged with existing entities."
+    )
+
+
+def build_relationship_resolution_user(new_relationships: List[Tuple[str, str, str]],
+                                       existing_relationships: List[Tuple[str, str, str]],
+                                       entity_mappings: Dict[str, str]) -> str:
+    new_rels_str = "\n".join([
+        f"- {subj} --[{rel}]--> {obj}" for subj, rel, obj in new_relationships
+    ])
+    existing_rels_str = "\n".join([
+        f"- {subj} --[{rel}]--> {obj}" for subj, rel, obj in existing_relationships
+    ])
+    mappings_str = "\n".join([
+        f"- {new_entity} → {existing_entity}"
+        for new_entity, existing_entity in entity_mappings.items()
+    ])
+    return (
+        f"NEW_RELATIONSHIPS:\n{new_rels_str}\n\n"
+        f"EXISTING_RELATIONSHIPS:\n{existing_rels_str}\n\n"
+        f"ENTITY_MAPPINGS:\n{mappings_str}\n\n"
+        "Identify duplicates, conflicts, and required updates for these relationships."
+    )
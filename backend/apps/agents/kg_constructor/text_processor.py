@@ -59,8 +59,8 @@ class TextProcessor:
         self.neo4j_client = neo4j_client or Neo4jClient(llm=self.llm if enable_resolution else None)
         self.enable_resolution = enable_resolution
         
-        # Ensure indexes are created
-        self.neo4j_client.create_indexes()
+        # Ensure indexes are created (once per process)
+        self.neo4j_client.ensure_indexes()
         
         logger.info(f"TextProcessor initialized with resolution: {enable_resolution}")
     
@@ -204,29 +204,32 @@ class TextProcessor:
         Returns:
             List of entity names that were upserted
         """
-        entity_names = []
+        rows = []
         
         for entity in entities:
-            try:
-                # Ensure all required fields are present
-                entity_data = {
-                    'name': entity.get('name', ''),
-                    'type': entity.get('type', 'Unknown'),
-                    'description': entity.get('description', f"{entity.get('type', 'Unknown')}: {entity.get('name', '')}"),
-                    'confidence': entity.get('confidence', 1.0)  # Default confidence
-                }
-                
-                # Skip entities with empty names
-                if not entity_data['name'].strip():
-                    logger.warning(f"Skipping entity with empty name: {entity}")
-                    continue
-                
-                entity_name = self.neo4j_client.upsert_entity(entity_data)
-                entity_names.append(entity_name)
-                
-            except Exception as e:
-                logger.error(f"Failed to upsert entity {entity}: {e}")
+            # Ensure all required fields are present
+            entity_data = {
+                'name': entity.get('name', ''),
+                'type': entity.get('type', 'Unknown'),
+                'description': entity.get('description', f"{entity.get('type', 'Unknown')}: {entity.get('name', '')}"),
+                'confidence': entity.get('confidence', 1.0)  # Default confidence
+            }
+            
+            # Skip entities with empty names
+            if not entity_data['name'].strip():
+                logger.warning(f"Skipping entity with empty name: {entity}")
+                continue
+            
+            rows.append(entity_data)
+        
+        # One UNWIND statement instead of a commit per entity
+        try:
+            self.neo4j_client.upsert_entities_batch(rows)
+        except Exception as e:
+            logger.error(f"Failed to upsert {len(rows)} entities: {e}")
+            return []
         
+        entity_names = [row['name'] for row in rows]
         logger.info(f"Upserted {len(entity_names)} entities")
         return entity_names
     
@@ -277,13 +280,13 @@ class TextProcessor:
         """
         try:
             # Create Post MENTIONS Entity relationships
-            for entity in entities:
-                self.neo4j_client.create_post_mentions_entity_relationship(
-                    post_id,
-                    entity['name'],
-                    {'entity_type': entity['type'], 'extraction_confidence': 1.0}
-                )
-                print(f"Linked post {post_id} to entity {entity['name']}")
+            self.neo4j_client.create_post_mentions_entities_batch(post_id, [
+                {
+                    'entity_name': entity['name'],
+                    'properties': {'entity_type': entity['type'], 'extraction_confidence': 1.0}
+                }
+                for entity in entities
+            ])
             
             # Create relationships between entities
             entity_relations = []
@@ -1,3 +1,5 @@
+import logging
+
 from pymilvus import (
     connections,
     Collection,
@@ -10,50 +12,152 @@ import os
 from dotenv import load_dotenv
 
 load_dotenv()
+
 # from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 
 # # ========= CONFIG =========
 ZILLIZ_URI = os.getenv("ZILLIZ_URI")
 ZILLIZ_TOKEN = os.getenv("ZILLIZ_TOKEN")
 COLLECTION_NAME = os.getenv("COLLECTION_NAME")
+# FP16 halves vector memory and search bandwidth; set FLOAT32 to keep full precision
+EMBEDDING_DTYPE = os.getenv("MILVUS_EMBEDDING_DTYPE", "FLOAT16").upper()
+# HNSW keeps search latency logarithmic in collection size; IVF_PQ trades a
+# little recall for ~8x less vector memory on constrained deployments.
+INDEX_TYPE = "IVF_PQ" if os.getenv("MILVUS_INDEX_TYPE", "HNSW").upper() == "IVF_PQ" else "HNSW"
 
 # settings.configure()
 
-# ========= CONNECT =========
-connections.connect(alias="default", uri=ZILLIZ_URI, token=ZILLIZ_TOKEN)
-print("✅ Connected to Zilliz Cloud")
-
-# ========= DEFINE SCHEMA =========
-if COLLECTION_NAME not in utility.list_collections():
-    fields = [
-        FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-        FieldSchema(name="content_id", dtype=DataType.VARCHAR, max_length=64),
-        FieldSchema(name="content_url", dtype=DataType.VARCHAR, max_length=256),
-        FieldSchema(name="user_id", dtype=DataType.VARCHAR, max_length=64),
-        FieldSchema(name="platform", dtype=DataType.VARCHAR, max_length=20),
-        FieldSchema(name="summary", dtype=DataType.VARCHAR, max_length=4000),
-        FieldSchema(name="timestamp", dtype=DataType.INT64),  # Unix timestamp
-        FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=384),
-    ]
-
-    schema = CollectionSchema(
-        fields, description="Unified embeddings for TikTok + Facebook content"
+
+def _connect():
+    # One gRPC channel multiplexes every request from this process; keep-alive
+    # pings stop idle cloud load balancers from dropping it between requests
+    connections.connect(
+        alias="default", uri=ZILLIZ_URI, token=ZILLIZ_TOKEN, keep_alive=True
+    )
+    logger.info("✅ Connected to Zilliz Cloud")
+
+
+def _embedding_index(collection: Collection):
+    """The collection's index on the embedding field, or None."""
+    return next(
+        (idx for idx in collection.indexes if idx.field_name == "embedding"), None
     )
-    collection = Collection(COLLECTION_NAME, schema)
-    print("🆕 Created collection:", COLLECTION_NAME)
-
-    # Sử dụng chỉ mục IVF_FLAT, phù hợp cho kích thước 384 chiều
-    index_params = {
-        "index_type": "IVF_FLAT",
-        "metric_type": "COSINE",
-        "params": {"nlist": 128},
-    }
-    collection.create_index(field_name="embedding", index_params=index_params)
-    print("✅ Created Index for 'embedding'")
-else:
+
+
+def connect_collection() -> Collection:
+    """
+    Connect to Zilliz and load the existing collection.
+
+    Called lazily (by rag.utils.get_collection) rather than at import, so each
+    gunicorn worker opens its own connection after fork and a failed connect
+    can be retried on the next request. It never creates or rebuilds the
+    collection or its index; run this module as a script for that.
+
+    Returns:
+        The loaded collection
+    """
+    _connect()
+    if not utility.has_collection(COLLECTION_NAME):
+        raise RuntimeError(
+            f"Milvus collection {COLLECTION_NAME!r} does not exist; "
+            "run apps/agents/rag/milvus_setup.py to create it"
+        )
+
     collection = Collection(COLLECTION_NAME)
-    print("📁 Using existing collection:", COLLECTION_NAME)
+    existing_index = _embedding_index(collection)
+    if existing_index is None:
+        raise RuntimeError(
+            f"Milvus collection {COLLECTION_NAME!r} has no embedding index; "
+            "run apps/agents/rag/milvus_setup.py to build it"
+        )
+    if existing_index.params.get("index_type") != INDEX_TYPE:
+        # Searches still work; only the tuned search params won't match
+        logger.error(
+            f"Milvus embedding index is {existing_index.params.get('index_type')}, "
+            f"expected {INDEX_TYPE}; run apps/agents/rag/milvus_setup.py to rebuild it"
+        )
+
+    collection.load()
+    logger.info(f"🚀 Loaded collection: {COLLECTION_NAME}")
+    return collection
+
+
+def setup_collection() -> Collection:
+    """
+    Create the collection and its embedding index, rebuilding the index if its
+    type differs from MILVUS_INDEX_TYPE, then load it.
+
+    One-off deployment step: the rebuild releases the collection, so searches
+    from running workers fail until it is loaded again.
+
+    Returns:
+        The loaded collection
+    """
+    _connect()
+
+    # ========= DEFINE SCHEMA =========
+    if COLLECTION_NAME not in utility.list_collections():
+        fields = [
+            FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
+            FieldSchema(name="content_id", dtype=DataType.VARCHAR, max_length=64),
+            FieldSchema(name="content_url", dtype=DataType.VARCHAR, max_length=256),
+            FieldSchema(name="user_id", dtype=DataType.VARCHAR, max_length=64),
+            FieldSchema(name="platform", dtype=DataType.VARCHAR, max_length=20),
+            FieldSchema(name="summary", dtype=DataType.VARCHAR, max_length=4000),
+            FieldSchema(name="timestamp", dtype=DataType.INT64),  # Unix timestamp
+            FieldSchema(
+                name="embedding",
+                dtype=(
+                    DataType.FLOAT16_VECTOR
+                    if EMBEDDING_DTYPE == "FLOAT16"
+                    else DataType.FLOAT_VECTOR
+                ),
+                dim=384,
+            ),
+        ]
+
+        schema = CollectionSchema(
+            fields, description="Unified embeddings for TikTok + Facebook content"
+        )
+        collection = Collection(COLLECTION_NAME, schema)
+        logger.info(f"🆕 Created collection: {COLLECTION_NAME}")
+    else:
+        collection = Collection(COLLECTION_NAME)
+        logger.info(f"📁 Using existing collection: {COLLECTION_NAME}")
+
+    # ========= INDEX =========
+    if INDEX_TYPE == "IVF_PQ":
+        # m must divide the 384-dim vectors evenly
+        index_params = {
+            "index_type": "IVF_PQ",
+            "metric_type": "COSINE",
+            "params": {"nlist": 1024, "m": 48},
+        }
+    else:
+        index_params = {
+            "index_type": "HNSW",
+            "metric_type": "COSINE",
+            "params": {"M": 16, "efConstruction": 200},
+        }
+
+    existing_index = _embedding_index(collection)
+    if existing_index is None or existing_index.params.get("index_type") != INDEX_TYPE:
+        if existing_index is not None:
+            # Rebuilding the index requires the collection to be released first
+            collection.release()
+            collection.drop_index()
+            logger.info(f"🗑️ Dropped old index: {existing_index.params.get('index_type')}")
+        collection.create_index(field_name="embedding", index_params=index_params)
+        logger.info(f"✅ Created {INDEX_TYPE} index for 'embedding'")
+
+    collection.load()
+    logger.info(f"🚀 Loaded collection: {COLLECTION_NAME}")
+    return collection
+
 
-collection.load()
-print(f"🚀 Loaded collection: {COLLECTION_NAME}")
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    setup_collection()
@@ -1,63 +1,286 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 import logging
+import os
+import queue
+import threading
+import time
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 # Lazy load to avoid loading model on import
 _model = None
+_model_lock = threading.Lock()
 _collection = None
+_collection_lock = threading.Lock()
 
 
 def get_model():
     global _model
     if _model is None:
-        from sentence_transformers import SentenceTransformer
-
-        try:
-            _model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-        except Exception as e:
-            logger.exception("Failed to load SentenceTransformer model: %s", e)
-            _model = None
+        # The insert thread and request threads may ask for it at the same time
+        with _model_lock:
+            if _model is None:
+                _model = _load_model()
     return _model
 
 
+def _load_model():
+    """Load the embedding model, in half precision on a GPU when one is present."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    try:
+        model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2", device=device)
+    except Exception as e:
+        logger.exception("Failed to load SentenceTransformer model: %s", e)
+        return None
+    if device == "cuda":
+        # FP16 roughly doubles encode throughput; cosine ranking is unaffected
+        model.half()
+    logger.info("Loaded embedding model on %s", device)
+    return model
+
+
 def get_collection():
     global _collection
     if _collection is None:
-        try:
-            from .milvus_setup import collection
+        # Connect once per process, after any worker fork; a failed connect
+        # leaves _collection unset so the next call retries
+        with _collection_lock:
+            if _collection is None:
+                try:
+                    from .milvus_setup import connect_collection
 
-            _collection = collection
-        except Exception as e:
-            logger.exception("Failed to import milvus collection: %s", e)
-            _collection = None
+                    _collection = connect_collection()
+                except Exception as e:
+                    logger.exception("Failed to connect milvus collection: %s", e)
     return _collection
 
 
-def _build_columns_for_insert(data_map: Dict[str, Any]) -> List[List[Any]]:
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_DIM = 384
+
+_vector_dtype = None
+
+
+def _get_vector_dtype(collection):
+    """
+    numpy dtype of the collection's embedding field.
+
+    Collections created by milvus_setup store FP16 vectors; older ones keep FP32.
+    """
+    global _vector_dtype
+    if _vector_dtype is None:
+        field = next(f for f in collection.schema.fields if f.name == "embedding")
+        _vector_dtype = np.float16 if field.dtype.name == "FLOAT16_VECTOR" else np.float32
+    return _vector_dtype
+
+
+def _to_milvus_vectors(matrix: np.ndarray, dtype) -> List[Any]:
+    """Rows of an (n, dim) matrix in the form pymilvus expects for the field dtype."""
+    if dtype == np.float16:
+        # pymilvus takes FP16 vectors as float16 ndarrays, one per row
+        return list(matrix.astype(np.float16))
+    return matrix.astype(np.float32).tolist()
+
+# Upper bound on top_k; HNSW ef must be at least the search limit
+SEARCH_EF = 64
+MIN_SEARCH_EF = 32
+IVF_PQ_NPROBE = 16
+
+
+def _search_params(top_k: int) -> Dict[str, Any]:
     """
-    Build column-wise payload according to collection.schema order,
-    skipping auto id if present.
+    Search parameters matching the index built by milvus_setup.
+
+    Args:
+        top_k: Number of hits requested
+
+    Returns:
+        Milvus search params for the configured index type
+    """
+    if os.getenv("MILVUS_INDEX_TYPE", "HNSW").upper() == "IVF_PQ":
+        return {"metric_type": "COSINE", "params": {"nprobe": IVF_PQ_NPROBE}}
+    return {"metric_type": "COSINE", "params": {"ef": max(MIN_SEARCH_EF, top_k * 4)}}
+
+
+# VARCHAR limits from milvus_setup's schema; Milvus counts them in UTF-8 bytes
+FIELD_MAX_BYTES = {
+    "content_id": 64,
+    "content_url": 256,
+    "user_id": 64,
+    "platform": 20,
+    "summary": 4000,
+}
+
+
+def _validate_item(item: Dict[str, Any]) -> None:
+    """
+    Reject an item Milvus would refuse, before it can share a batch insert.
+
+    Raises:
+        ValueError: naming the first offending field
+    """
+    for field, max_bytes in FIELD_MAX_BYTES.items():
+        value = item.get(field)
+        if not isinstance(value, str):
+            raise ValueError(f"{field} must be a string")
+        if len(value.encode("utf-8")) > max_bytes:
+            raise ValueError(f"{field} exceeds {max_bytes} bytes")
+    timestamp = item.get("timestamp")
+    if timestamp is not None and (isinstance(timestamp, bool) or not isinstance(timestamp, int)):
+        raise ValueError("timestamp must be an integer")
+    embedding = item.get("embedding")
+    if embedding is not None and len(embedding) != EMBEDDING_DIM:
+        raise ValueError(f"embedding must have {EMBEDDING_DIM} dimensions")
+
+
+def _prepare_rows(collection, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Embed items that don't carry an embedding and build Milvus row dicts.
+
+    Args:
+        collection: Target collection (decides the vector dtype)
+        items: Dicts with content_id, content_url, user_id, platform, summary
+            and optional timestamp and embedding (precomputed by the caller)
+
+    Returns:
+        Row dicts ready for collection.insert
     """
+    embeddings = [item.get("embedding") for item in items]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        model = get_model()
+        if model is None:
+            raise RuntimeError("Dependencies missing: model or collection")
+        # One batched forward pass for every item the caller didn't embed
+        encoded = model.encode(
+            [items[i]["summary"] for i in missing],
+            batch_size=EMBEDDING_BATCH_SIZE,
+            normalize_embeddings=True,
+        )
+        for i, embedding in zip(missing, encoded):
+            embeddings[i] = embedding
+    embeddings = _to_milvus_vectors(
+        np.asarray(embeddings, dtype=np.float32), _get_vector_dtype(collection)
+    )
+    now = int(time.time())
+    return [
+        {
+            "content_id": item["content_id"],
+            "content_url": item["content_url"],
+            "user_id": item["user_id"],
+            "platform": item["platform"],
+            "summary": item["summary"],
+            # A missing or null timestamp defaults to now (the INT64 field
+            # can't hold null); an explicit 0 is kept
+            "timestamp": now if item.get("timestamp") is None else item["timestamp"],
+            "embedding": embedding,
+        }
+        for item, embedding in zip(items, embeddings)
+    ]
+
+
+def insert_items(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Embed and insert several items with one encode call and one Milvus insert.
+
+    Args:
+        items: Dicts with content_id, content_url, user_id, platform, summary
+            and optional timestamp and embedding (precomputed by the caller)
+
+    Returns:
+        {"status", "count", "content_ids"}
+    """
+    for item in items:
+        _validate_item(item)
+
     collection = get_collection()
     if collection is None:
-        raise RuntimeError("Milvus collection is not available")
-
-    schema_fields = [f.name for f in collection.schema.fields]
-    # skip auto id field if collection.auto_id True (usually 'id')
-    if collection.schema.auto_id:
-        schema_fields = schema_fields[1:]
-
-    # map expected names -> provided values
-    # Expect embedding field named 'embedding'
-    columns = []
-    for fname in schema_fields:
-        if fname == "embedding":
-            # embedding should be a list of floats
-            columns.append([data_map["embedding"]])
+        raise RuntimeError("Dependencies missing: model or collection")
+
+    rows = _prepare_rows(collection, items)
+
+    # No flush(): it forces a segment seal and blocks the worker until it
+    # completes. Inserted rows are durable and searchable without it, and
+    # Milvus seals segments on its own.
+    # Row dicts are matched to schema fields by name, so the auto id and
+    # field order need no special handling
+    collection.insert(rows)
+    return {
+        "status": "success",
+        "count": len(rows),
+        "content_ids": [row["content_id"] for row in rows],
+    }
+
+
+# Single-item inserts from concurrent requests are coalesced by one background
+# thread: it takes whatever is queued (up to this many) while the previous
+# batch was being written, so an idle process adds no waiting time
+INSERT_COALESCE_MAX = 32
+# Batches embedded but not yet written; bounds memory if Milvus falls behind
+INSERT_PIPELINE_DEPTH = 2
+# Longest insert_item waits for its batch to be written
+INSERT_TIMEOUT_SECONDS = 30
+_insert_queue: "queue.Queue" = queue.Queue()
+_insert_thread = None
+_insert_thread_lock = threading.Lock()
+# Milvus writes run on their own thread so the next batch is embedded while
+# the previous one is in flight; one worker keeps inserts in order
+_insert_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-milvus")
+_insert_slots = threading.BoundedSemaphore(INSERT_PIPELINE_DEPTH)
+
+
+def _settle_batch(batch, error: Optional[BaseException]):
+    for _, future in batch:
+        if error is None:
+            future.set_result(None)
         else:
-            columns.append([data_map[fname]])
-    return columns
+            future.set_exception(error)
+
+
+def _on_batch_written(batch, io_future):
+    _insert_slots.release()
+    _settle_batch(batch, io_future.exception())
+
+
+def _insert_loop():
+    while True:
+        batch = [_insert_queue.get()]
+        while len(batch) < INSERT_COALESCE_MAX:
+            try:
+                batch.append(_insert_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            collection = get_collection()
+            if collection is None:
+                raise RuntimeError("Dependencies missing: model or collection")
+            rows = _prepare_rows(collection, [row for row, _ in batch])
+        except Exception as e:
+            _settle_batch(batch, e)
+            continue
+
+        _insert_slots.acquire()
+        io_future = _insert_io.submit(collection.insert, rows)
+        io_future.add_done_callback(lambda f, batch=batch: _on_batch_written(batch, f))
+
+
+def _ensure_insert_thread():
+    """Start the coalescing thread on first use (after any worker fork)."""
+    global _insert_thread
+    if _insert_thread is None:
+        with _insert_thread_lock:
+            if _insert_thread is None:
+                _insert_thread = threading.Thread(
+                    target=_insert_loop, name="rag-insert", daemon=True
+                )
+                _insert_thread.start()
 
 
 def insert_item(
@@ -67,14 +290,20 @@ def insert_item(
     platform: str,
     summary: str,
     timestamp: Optional[int] = None,
+    embedding: Optional[List[float]] = None,
 ):
-    model = get_model()
-    collection = get_collection()
-    if collection is None or model is None:
-        raise RuntimeError("Dependencies missing: model or collection")
+    """
+    Embed and insert one item, sharing a Milvus insert with concurrent calls.
+
+    The item is validated before it is queued, so a bad item fails alone
+    instead of failing every item coalesced with it.
 
-    embedding = model.encode(summary).tolist()
-    values_map = {
+    Raises:
+        ValueError: the item would be rejected by Milvus
+        concurrent.futures.TimeoutError: the batch was not written within
+            INSERT_TIMEOUT_SECONDS; the insert may still land later
+    """
+    item = {
         "content_id": content_id,
         "content_url": content_url,
         "user_id": user_id,
@@ -83,18 +312,38 @@ def insert_item(
         "timestamp": timestamp,
         "embedding": embedding,
     }
+    _validate_item(item)
 
-    # Only add timestamp if it exists in schema
-    # (kept for backwards compatibility if you re-add it later)
-    # if timestamp is not None:
-    #     values_map["timestamp"] = timestamp
-
-    columns = _build_columns_for_insert(values_map)
-    collection.insert(columns)
-    collection.flush()
+    _ensure_insert_thread()
+    future = Future()
+    _insert_queue.put((item, future))
+    # Re-raises the batch's exception if the insert failed
+    future.result(timeout=INSERT_TIMEOUT_SECONDS)
     return {"status": "success", "content_id": content_id}
 
 
+@lru_cache(maxsize=4096)
+def embed_query(query: str) -> np.ndarray:
+    """
+    Embed a search query, reusing the vector for repeated query strings.
+
+    Cached separately from the per-user result cache so the same query from
+    different users, filters or top_k values skips the model forward pass.
+
+    Args:
+        query: Raw query text
+
+    Returns:
+        Read-only float32 embedding (shared between callers)
+    """
+    model = get_model()
+    if model is None:
+        raise RuntimeError("Dependencies missing: model or collection")
+    vec = np.asarray(model.encode(query, normalize_embeddings=True), dtype=np.float32)
+    vec.flags.writeable = False
+    return vec
+
+
 def query_items(
     user_id: str,
     query: str,
@@ -102,12 +351,13 @@ def query_items(
     from_timestamp: Optional[int] = None,
     platform: Optional[str] = None,
 ) -> Dict[str, Any]:
-    model = get_model()
     collection = get_collection()
-    if collection is None or model is None:
+    if collection is None:
         raise RuntimeError("Dependencies missing: model or collection")
 
-    query_vec = model.encode(query).tolist()
+    query_vecs = _to_milvus_vectors(
+        embed_query(query)[np.newaxis, :], _get_vector_dtype(collection)
+    )
     expr_parts = [f"user_id == '{user_id}'"]
     if from_timestamp:
         expr_parts.append(f"timestamp >= {from_timestamp}")
@@ -115,14 +365,16 @@ def query_items(
         expr_parts.append(f"platform == '{platform}'")
     expr = " && ".join(expr_parts)
 
-    search_params = {"metric_type": "COSINE", "params": {"ef": 64}}
     results = collection.search(
-        data=[query_vec],
+        data=query_vecs,
         anns_field="embedding",
-        param=search_params,
+        param=_search_params(top_k),
         limit=top_k,
         expr=expr,
         output_fields=["content_id", "content_url", "summary", "platform", "timestamp"],
+        # Skips waiting for the latest write timestamp; new inserts show up
+        # within Milvus's bounded staleness window (a few seconds)
+        consistency_level="Bounded",
     )
 
     hits = []
@@ -0,0 +1,67 @@
+import os
+import logging
+from celery import shared_task
+from django.core.files import File
+
+from .video_analysis.transcription import transcribe_audio
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="transcribe_video_task")
+def transcribe_video_task(video_path: str) -> dict:
+    """
+    Transcribe a video's audio on the GPU transcribe worker.
+
+    The staged video is owned by the task once enqueued and is removed
+    when the task finishes, whatever the outcome.
+
+    Args:
+        video_path (str): Path to the video on storage shared with the worker.
+
+    Returns:
+        dict: {"transcript", "detected_language"}
+    """
+    logger.info(f"Transcribing {video_path}")
+    try:
+        return transcribe_audio(video_path)
+    finally:
+        if os.path.exists(video_path):
+            try:
+                os.remove(video_path)
+            except Exception as e:
+                logger.warning(f"Failed to remove staged video {video_path}: {e}")
+
+
+@shared_task(bind=True, name="process_video_task")
+def process_video_task(self, payload: dict, video_path: str) -> dict:
+    """
+    Run the unified video -> knowledge graph pipeline on a worker.
+
+    The staged video is owned by the task once enqueued and is removed
+    when the task finishes, whatever the outcome.
+
+    Args:
+        payload (dict): Pipeline payload without "video_file" (user, video,
+            topic, source).
+        video_path (str): Path to the staged video on storage shared with
+            the worker.
+
+    Returns:
+        dict: The pipeline result from process_video_to_knowledge_graph.
+    """
+    # Imported here: video_pipeline imports this module for transcribe_video_task
+    from .video_pipeline import get_unified_processor
+
+    logger.info(f"Task {self.request.id}: processing {video_path}")
+    try:
+        processor = get_unified_processor()
+        with open(video_path, "rb") as f:
+            payload = {**payload, "video_file": File(f, name=os.path.basename(video_path))}
+            return processor.process_video_to_knowledge_graph(payload)
+    finally:
+        if os.path.exists(video_path):
+            try:
+                os.remove(video_path)
+            except Exception as e:
+                logger.warning(f"Failed to remove staged video {video_path}: {e}")
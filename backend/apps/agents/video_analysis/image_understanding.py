@@ -1,15 +1,116 @@
+import hashlib
+import threading
+import time
+
 from google import genai
 from google.genai import types
 
 # from django.conf import settings
 
+FILE_POLL_INTERVAL_SECONDS = 1
+FILE_ACTIVE_TIMEOUT_SECONDS = 120
+GEMINI_HTTP_TIMEOUT_MS = 60_000
+
+SUMMARY_MODEL = "models/gemini-2.5-flash"
+SUMMARY_INSTRUCTION = (
+    "Hãy tóm tắt video này trong dưới 10 câu tiếng Việt."
+    " Kết quả tóm tắt nên ngắn gọn, súc tích, và bao gồm các điểm chính của video."
+    " Thông tin tóm tắt nên thể hiện được các mối quan hệ của những thực thể trong video."
+)
+
+# Summaries keyed by a digest of the video bytes; identical uploads reuse them
+SUMMARY_RESULT_KEY_PREFIX = "video_summary"
+SUMMARY_RESULT_TTL_SECONDS = 30 * 24 * 3600
+HASH_CHUNK_SIZE = 1 << 20
+
+# Shared Gemini client, keyed by API key so the HTTP pool is reused across calls
+_clients = {}
+_clients_lock = threading.Lock()
+
 
-def summarize_video(video_path: str) -> str:
+def _get_client(api_key: str):
+    """
+    Return the process-wide Gemini client for api_key, creating it on first use.
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = genai.Client(
+                    api_key=api_key,
+                    http_options=types.HttpOptions(timeout=GEMINI_HTTP_TIMEOUT_MS),
+                )
+                _clients[api_key] = client
+    return client
+
+
+def video_hasher():
+    """
+    Return the hasher used for summary cache keys.
+
+    Callers that already stream the video to disk should feed each chunk to it
+    and pass hexdigest() to summarize_video, so the file is read only once.
+    """
+    return hashlib.blake2b(digest_size=16)
+
+
+def _video_digest(video_path: str) -> str:
+    """Return the content hash of the file, read in 1MB chunks."""
+    digest = video_hasher()
+    with open(video_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _get_cached_summary(content_hash: str):
+    """Look up a stored summary; None on a miss or when no Django cache is configured."""
+    try:
+        from django.core.cache import cache
+
+        return cache.get(f"{SUMMARY_RESULT_KEY_PREFIX}:{content_hash}")
+    except Exception:
+        return None
+
+
+def _store_summary(content_hash: str, summary: str) -> None:
+    """Store a successful summary under the video's content hash."""
+    try:
+        from django.core.cache import cache
+
+        cache.set(
+            f"{SUMMARY_RESULT_KEY_PREFIX}:{content_hash}",
+            summary,
+            timeout=SUMMARY_RESULT_TTL_SECONDS,
+        )
+    except Exception:
+        pass  # Caching is best-effort; the summary is still returned
+
+
+def _generate_summary(client, video_part: types.Part):
+    """
+    Run the summary request.
+
+    The instruction is far below Gemini's minimum cacheable size for
+    context caching, so it is sent inline with every request.
+    """
+    return client.models.generate_content(
+        model=SUMMARY_MODEL,
+        contents=types.Content(
+            parts=[video_part, types.Part(text=SUMMARY_INSTRUCTION)]
+        ),
+    )
+
+
+def summarize_video(video_path: str, content_hash: str = None) -> str:
     """
     Uploads and uses the Gemini model to summarize the video content.
 
     Args:
-        video_path (str): The absolute path to the video file (must be < 20MB).
+        video_path (str): The absolute path to the video file.
+        content_hash (str): video_hasher() digest computed while the file was
+            written; when omitted the file is hashed here.
 
     Returns:
         str: A 3-sentence Vietnamese summary of the video, or an error message.
@@ -18,35 +119,48 @@ def summarize_video(video_path: str) -> str:
     if not api_key:
         return "Error: GEMINI_API_KEY not found in environment variables."
 
+    if not content_hash:
+        try:
+            content_hash = _video_digest(video_path)
+        except FileNotFoundError:
+            return f"Error: Video file not found at path '{video_path}'."
+        except Exception as e:
+            return f"Error reading video file: {e}"
+
+    cached_summary = _get_cached_summary(content_hash)
+    if cached_summary:
+        return cached_summary
+
     try:
-        client = genai.Client(api_key=api_key)
+        client = _get_client(api_key)
     except Exception as e:
         return f"Error initializing Gemini client: {e}"
 
+    # Upload through the Files API so the video is streamed from disk in chunks
+    # instead of being read into memory and sent inline
     try:
-        with open(video_path, "rb") as f:
-            video_bytes = f.read()
+        uploaded = client.files.upload(
+            file=video_path, config={"mime_type": "video/mp4"}
+        )
     except FileNotFoundError:
         return f"Error: Video file not found at path '{video_path}'."
     except Exception as e:
-        return f"Error reading video file: {e}"
+        return f"Error uploading video file: {e}"
 
     try:
-        response = client.models.generate_content(
-            model="models/gemini-2.5-flash",
-            contents=types.Content(
-                parts=[
-                    types.Part(
-                        inline_data=types.Blob(data=video_bytes, mime_type="video/mp4")
-                    ),
-                    types.Part(
-                        text="Hãy tóm tắt video này trong dưới 10 câu tiếng Việt."
-                        " Kết quả tóm tắt nên ngắn gọn, súc tích, và bao gồm các điểm chính của video."
-                        " Thông tin tóm tắt nên thể hiện được các mối quan hệ của những thực thể trong video."
-                    ),
-                ]
-            ),
-        )
+        # Wait until Gemini has finished processing the upload
+        deadline = time.monotonic() + FILE_ACTIVE_TIMEOUT_SECONDS
+        while uploaded.state and uploaded.state.name == "PROCESSING":
+            if time.monotonic() > deadline:
+                return "Error: Timed out waiting for uploaded video to become active."
+            time.sleep(FILE_POLL_INTERVAL_SECONDS)
+            uploaded = client.files.get(name=uploaded.name)
+
+        if uploaded.state and uploaded.state.name != "ACTIVE":
+            return f"Error: Uploaded video is in state {uploaded.state.name}."
+
+        video_part = types.Part.from_uri(file_uri=uploaded.uri, mime_type="video/mp4")
+        response = _generate_summary(client, video_part)
 
         if (
             response
@@ -56,13 +170,21 @@ def summarize_video(video_path: str) -> str:
             and response.candidates[0].content.parts
             and len(response.candidates[0].content.parts) > 0
         ):
-            return response.candidates[0].content.parts[0].text
+            summary = response.candidates[0].content.parts[0].text
+            _store_summary(content_hash, summary)
+            return summary
         else:
             return "No valid response received from Gemini API."
 
     except Exception as e:
         return f"Error calling Gemini API: {e}"
 
+    finally:
+        try:
+            client.files.delete(name=uploaded.name)
+        except Exception:
+            pass  # Uploaded files expire on their own after 48 hours
+
 
 if __name__ == "__main__":
     # Your sample video path (replace with the actual path)
@@ -0,0 +1,72 @@
+import logging
+import threading
+
+from django.conf import settings
+
+try:
+    from faster_whisper import WhisperModel
+
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False  # Only the transcribe worker image installs it
+
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:
+    BatchedInferencePipeline = None  # faster-whisper < 1.1 has no batched pipeline
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIBE_BATCH_SIZE = 8
+
+# Loaded once per worker process; loading large-v3 onto the GPU takes seconds
+_model = None
+_model_lock = threading.Lock()
+
+
+def _get_model():
+    """
+    Return the process-wide Whisper model, loading it on first use.
+
+    Returns:
+        The (optionally batched) faster-whisper model.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                model = WhisperModel(
+                    settings.WHISPER_MODEL_SIZE,
+                    device=settings.WHISPER_DEVICE,
+                    compute_type=settings.WHISPER_COMPUTE_TYPE,
+                )
+                _model = BatchedInferencePipeline(model=model) if BatchedInferencePipeline else model
+                logger.info(
+                    f"Loaded Whisper {settings.WHISPER_MODEL_SIZE} on {settings.WHISPER_DEVICE} "
+                    f"({settings.WHISPER_COMPUTE_TYPE})"
+                )
+    return _model
+
+
+def transcribe_audio(media_path: str) -> dict:
+    """
+    Transcribe the audio track of a video or audio file.
+
+    Args:
+        media_path (str): Path to the media file; the audio is decoded directly.
+
+    Returns:
+        dict: {"transcript", "detected_language"}
+    """
+    if not FASTER_WHISPER_AVAILABLE:
+        raise RuntimeError("faster-whisper is not installed on this worker")
+
+    model = _get_model()
+    if BatchedInferencePipeline and isinstance(model, BatchedInferencePipeline):
+        # Batch the 30s audio windows into one forward pass on the GPU
+        segments, info = model.transcribe(media_path, batch_size=TRANSCRIBE_BATCH_SIZE)
+    else:
+        segments, info = model.transcribe(media_path)
+
+    transcript = " ".join(segment.text.strip() for segment in segments)
+    return {"transcript": transcript, "detected_language": info.language}
@@ -8,18 +8,43 @@ knowledge graph construction into a single streamlined pipeline.
 import json
 import logging
 import tempfile
+import threading
 import os
-from typing import Dict, Any, Optional, BinaryIO
+from typing import Dict, Any, Optional, BinaryIO, Tuple
 from datetime import datetime
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 
-from .video_analysis.image_understanding import summarize_video
+from .video_analysis.image_understanding import summarize_video, video_hasher
 from .kg_constructor.text_processor import TextProcessor
 from .kg_constructor.config import get_google_llm
+from .tasks import transcribe_video_task
 
 logger = logging.getLogger(__name__)
 
+VIDEO_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _copy_video(video_file, dest: BinaryIO, digest=None):
+    """
+    Copy a video into dest in fixed-size chunks, never holding it whole in memory.
+    
+    Args:
+        video_file: Django File/UploadedFile or any binary file-like object
+        dest: Open binary file to write to
+        digest: Optional hash object updated with every chunk
+    """
+    if hasattr(video_file, 'chunks'):
+        # Django File; chunks() rewinds the file itself
+        chunks = video_file.chunks(VIDEO_COPY_CHUNK_SIZE)
+    else:
+        video_file.seek(0)
+        chunks = iter(lambda: video_file.read(VIDEO_COPY_CHUNK_SIZE), b'')
+    for chunk in chunks:
+        if digest is not None:
+            digest.update(chunk)
+        dest.write(chunk)
+
 
 class UnifiedPostProcessor:
     """
@@ -40,7 +65,7 @@ class UnifiedPostProcessor:
         
         Args:
             use_gemini_for_post: Use Gemini for post understanding
-            use_whisper_for_audio: Use OpenAI Whisper for audio transcription
+            use_whisper_for_audio: Fall back to Whisper transcription on the transcribe worker
             llm: Optional LLM instance for knowledge extraction
             enable_kg_resolution: Whether to enable graph resolution for duplicates
         """
@@ -119,7 +144,7 @@ class UnifiedPostProcessor:
         
         try:
             # Method 1: Try Gemini video understanding (visual + audio)
-            if self.use_gemini_for_video:
+            if self.use_gemini_for_post:
                 try:
                     summary = self._analyze_with_gemini(video_file)
                     if summary and not summary.startswith("Error"):
@@ -133,17 +158,19 @@ class UnifiedPostProcessor:
                 except Exception as e:
                     logger.warning(f"Gemini video analysis failed: {e}")
             
-            # Method 2: Fall back to OpenAI Whisper (audio only)
+            # Method 2: Fall back to Whisper (audio only) on the GPU transcribe worker
             if self.use_whisper_for_audio:
                 try:
-                    whisper_result = self.video_captioning.transcribe_and_summarize(video_file)
+                    # Only dispatched once Gemini has failed, so the GPU worker
+                    # never transcribes videos whose summary is already done
+                    whisper_result = self._transcribe_with_whisper(video_file)
                     analysis_result.update({
                         'transcript': whisper_result.get('transcript', ''),
                         'summary': whisper_result.get('summary', ''),
                         'detected_language': whisper_result.get('detected_language', 'unknown'),
-                        'analysis_method': 'whisper_openai'
+                        'analysis_method': 'whisper_gpu_worker'
                     })
-                    logger.info("Successfully analyzed video with Whisper + OpenAI")
+                    logger.info("Successfully analyzed video with Whisper on the transcribe worker")
                     return analysis_result
                 except Exception as e:
                     logger.warning(f"Whisper analysis failed: {e}")
@@ -162,6 +189,41 @@ class UnifiedPostProcessor:
         
         return analysis_result
     
+    def _transcribe_with_whisper(self, video_file) -> Dict[str, Any]:
+        """
+        Transcribe video audio on the dedicated GPU worker.
+        
+        The video is staged in WHISPER_SHARED_DIR so the worker can read it;
+        once dispatched, transcribe_video_task owns the staged file and removes
+        it. This call waits for the result, bounded by WHISPER_TASK_TIMEOUT.
+        
+        Args:
+            video_file: Post file object
+            
+        Returns:
+            Dict with transcript and detected_language
+        """
+        with tempfile.NamedTemporaryFile(
+            suffix=".mp4", delete=False, dir=settings.WHISPER_SHARED_DIR
+        ) as temp_video:
+            _copy_video(video_file, temp_video)
+            temp_video_path = temp_video.name
+        
+        try:
+            task_result = transcribe_video_task.delay(temp_video_path)
+        except Exception:
+            if os.path.exists(temp_video_path):
+                os.remove(temp_video_path)
+            raise
+        
+        # The pipeline runs inside process_video_task, where Celery refuses
+        # result.get() by default. Waiting here cannot deadlock: the
+        # transcription runs on the separate transcribe queue/worker, never
+        # on a video_analysis worker slot this task could be holding.
+        return task_result.get(
+            timeout=settings.WHISPER_TASK_TIMEOUT, disable_sync_subtasks=False
+        )
+    
     def _analyze_with_gemini(self, video_file) -> str:
         """
         Analyze video using Gemini video understanding.
@@ -176,20 +238,15 @@ class UnifiedPostProcessor:
         temp_video_path = None
         
         try:
-            # Create temporary video file
+            # Create temporary video file, hashing it in the same pass so
+            # summarize_video does not have to re-read it for the cache key
+            digest = video_hasher()
             with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as temp_video:
-                if hasattr(video_file, 'chunks'):
-                    # Django UploadedFile
-                    for chunk in video_file.chunks():
-                        temp_video.write(chunk)
-                else:
-                    # File-like object
-                    video_file.seek(0)
-                    temp_video.write(video_file.read())
+                _copy_video(video_file, temp_video, digest)
                 temp_video_path = temp_video.name
             
             # Use Gemini to analyze the video
-            summary = summarize_video(temp_video_path)
+            summary = summarize_video(temp_video_path, content_hash=digest.hexdigest())
             print(summary)
             return summary
             
@@ -346,6 +403,41 @@ class UnifiedPostProcessor:
             return error_result
 
 
+# Processors are reused per flag combination; building one creates the LLM
+# clients and the Neo4j client and ensures the graph indexes
+_processors: Dict[Tuple[bool, bool, bool], UnifiedPostProcessor] = {}
+_processors_lock = threading.Lock()
+
+
+def get_unified_processor(use_gemini_for_post: bool = True,
+                          use_whisper_for_audio: bool = True,
+                          enable_kg_resolution: bool = True) -> UnifiedPostProcessor:
+    """
+    Return the process-wide UnifiedPostProcessor for these options, creating it on first use.
+    
+    Args:
+        use_gemini_for_post: Use Gemini for post understanding
+        use_whisper_for_audio: Fall back to Whisper transcription on the transcribe worker
+        enable_kg_resolution: Whether to enable graph resolution for duplicates
+        
+    Returns:
+        Shared UnifiedPostProcessor with the default LLM
+    """
+    key = (use_gemini_for_post, use_whisper_for_audio, enable_kg_resolution)
+    processor = _processors.get(key)
+    if processor is None:
+        with _processors_lock:
+            processor = _processors.get(key)
+            if processor is None:
+                processor = UnifiedPostProcessor(
+                    use_gemini_for_post=use_gemini_for_post,
+                    use_whisper_for_audio=use_whisper_for_audio,
+                    enable_kg_resolution=enable_kg_resolution,
+                )
+                _processors[key] = processor
+    return processor
+
+
 def process_video_file_to_kg(video_file, user_data: Dict[str, Any], 
                            video_metadata: Dict[str, Any] = None,
                            topic_data: Dict[str, Any] = None,
@@ -376,8 +468,7 @@ def process_video_file_to_kg(video_file, user_data: Dict[str, Any],
         'source': source_data
     }
     
-    processor = UnifiedPostProcessor()
-    return processor.process_video_to_knowledge_graph(payload)
+    return get_unified_processor().process_video_to_knowledge_graph(payload)
 
 
 # Example usage payload
@@ -3,8 +3,12 @@ Django admin configuration for the chatbot application.
 """
 
 from django.contrib import admin
+from django.db.models import Count
+from django.db.models.functions import Substr
 from .models import ChatSession, ChatMessage
 
+CONTENT_PREVIEW_LENGTH = 100
+
 
 @admin.register(ChatSession)
 class ChatSessionAdmin(admin.ModelAdmin):
@@ -15,10 +19,19 @@ class ChatSessionAdmin(admin.ModelAdmin):
     readonly_fields = ['session_id', 'created_at', 'updated_at']
     ordering = ['-updated_at']
     
+    def get_queryset(self, request):
+        """Count messages in the changelist query instead of one COUNT per row"""
+        return (
+            super().get_queryset(request)
+            .select_related('user')
+            .annotate(_message_count=Count('messages'))
+        )
+    
     def message_count(self, obj):
         """Display the number of messages in this session"""
-        return obj.messages.count()
+        return obj._message_count
     message_count.short_description = 'Messages'
+    message_count.admin_order_field = '_message_count'
 
 
 @admin.register(ChatMessage)
@@ -33,9 +46,29 @@ class ChatMessageAdmin(admin.ModelAdmin):
     
     def content_preview(self, obj):
         """Display a preview of the message content"""
-        return obj.content[:100] + "..." if len(obj.content) > 100 else obj.content
+        content = getattr(obj, '_content_head', None)
+        if content is None:
+            content = obj.content
+        if len(content) > CONTENT_PREVIEW_LENGTH:
+            return content[:CONTENT_PREVIEW_LENGTH] + "..."
+        return content
     content_preview.short_description = 'Content Preview'
     
     def get_queryset(self, request):
         """Optimize queryset by selecting related session"""
-        return super().get_queryset(request).select_related('session')
+        # Session.__str__ reads the user, so join it too
+        return super().get_queryset(request).select_related('session__user')
+    
+    def get_changelist(self, request, **kwargs):
+        """Use a lean changelist query that only reads the head of each message"""
+        ChangeList = super().get_changelist(request, **kwargs)
+        
+        class MessagePreviewChangeList(ChangeList):
+            def get_queryset(self, request, exclude_parameters=None):
+                return (
+                    super().get_queryset(request, exclude_parameters)
+                    .annotate(_content_head=Substr('content', 1, CONTENT_PREVIEW_LENGTH + 1))
+                    .defer('content', 'metadata')
+                )
+        
+        return MessagePreviewChangeList
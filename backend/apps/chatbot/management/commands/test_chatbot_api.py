@@ -68,7 +68,7 @@ class Command(BaseCommand):
             # neo4j_client = Neo4jClient()
             chatbot = Chatbot(
                 # neo4j_client=neo4j_client,
-                user=user)
+                )
             self.stdout.write(self.style.SUCCESS("✅ Chatbot initialized successfully"))
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"❌ Failed to initialize chatbot: {e}"))
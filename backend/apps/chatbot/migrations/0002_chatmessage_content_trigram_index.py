@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-15 09:30
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0001_initial"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("content"),
+                    name="gin_trgm_ops",
+                ),
+                name="chatbot_msg_content_trgm",
+            ),
+        ),
+    ]
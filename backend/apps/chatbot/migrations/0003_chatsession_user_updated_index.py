@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-15 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chatbot", "0002_chatmessage_content_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatsession",
+            index=models.Index(
+                fields=["user", "-updated_at"], name="chatbot_session_user_upd_idx"
+            ),
+        ),
+    ]
@@ -1,9 +1,32 @@
 from django.db import models
+from django.db.models.functions import Substr, Upper
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.utils import timezone
 import uuid
 
 
+class ChatSessionQuerySet(models.QuerySet):
+    """QuerySet helpers for chat sessions"""
+    
+    def with_list_stats(self, preview_length: int = 100):
+        """
+        Annotate message count, last message time and the head of the last
+        message, so listing sessions is a single query instead of several per session.
+        """
+        last_message = ChatMessage.objects.filter(session=models.OuterRef('pk')).order_by('-timestamp')
+        return self.annotate(
+            message_total=models.Count('messages'),
+            last_message_at=models.Max('messages__timestamp'),
+            # One character past the preview length so callers can tell it was cut
+            last_message_head=models.Subquery(
+                last_message.annotate(
+                    head=Substr('content', 1, preview_length + 1)
+                ).values('head')[:1]
+            ),
+        )
+
+
 class ChatSession(models.Model):
     """Chat session model to group messages by conversation"""
     session_id = models.CharField(max_length=100, unique=True, db_index=True)
@@ -12,8 +35,14 @@ class ChatSession(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     title = models.CharField(max_length=200, blank=True, null=True)  # Optional session title
     
+    objects = ChatSessionQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            # Serves the session list: WHERE user_id = ? ORDER BY updated_at DESC
+            models.Index(fields=['user', '-updated_at'], name='chatbot_session_user_upd_idx'),
+        ]
     
     def __str__(self):
         return f"Session {self.session_id} - {self.user.username}"
@@ -47,6 +76,12 @@ class ChatMessage(models.Model):
             models.Index(fields=['session', 'timestamp']),
             models.Index(fields=['message_type']),
             models.Index(fields=['timestamp']),
+            # Trigram index on UPPER(content) so the admin's icontains search
+            # (UPPER(content) LIKE UPPER('%q%')) is an index lookup, not a seq scan
+            GinIndex(
+                OpClass(Upper('content'), name='gin_trgm_ops'),
+                name='chatbot_msg_content_trgm',
+            ),
         ]
     
     def __str__(self):
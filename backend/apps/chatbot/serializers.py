@@ -104,22 +104,32 @@ class SessionListSerializer(serializers.ModelSerializer):
             'last_message_preview'
         ]
     
+    # The list view annotates these via ChatSession.objects.with_list_stats();
+    # the per-session queries are only a fallback for unannotated instances
+    
     def get_message_count(self, obj) -> int:
         """Get the number of messages in this session"""
+        if hasattr(obj, 'message_total'):
+            return obj.message_total
         return obj.messages.count()
     
     def get_last_message_timestamp(self, obj) -> str:
         """Get timestamp of the last message"""
-        last_message = obj.messages.last()
-        return last_message.timestamp.isoformat() if last_message else None
+        if hasattr(obj, 'last_message_at'):
+            timestamp = obj.last_message_at
+        else:
+            timestamp = obj.messages.order_by('timestamp').values_list('timestamp', flat=True).last()
+        return timestamp.isoformat() if timestamp else None
     
     def get_last_message_preview(self, obj) -> str:
         """Get a preview of the last message"""
-        last_message = obj.messages.last()
-        if last_message:
-            content = last_message.content
-            return content[:100] + "..." if len(content) > 100 else content
-        return None
+        if hasattr(obj, 'last_message_head'):
+            content = obj.last_message_head
+        else:
+            content = obj.messages.order_by('timestamp').values_list('content', flat=True).last()
+        if content is None:
+            return None
+        return content[:100] + "..." if len(content) > 100 else content
 
 
 class ErrorResponseSerializer(serializers.Serializer):
@@ -0,0 +1,100 @@
+import logging
+from celery import shared_task
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ChatSession, ChatMessage
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_BULK_BATCH_SIZE = 50
+
+SESSION_MESSAGES_KEY_PREFIX = "chat_session_messages"
+SESSION_MESSAGES_TTL_SECONDS = 10 * 60
+
+
+def session_messages_generation(session_pk: int) -> int:
+    """Current cache generation of a session's history; bumped on every persisted turn."""
+    try:
+        return cache.get_or_set(
+            f"{SESSION_MESSAGES_KEY_PREFIX}:gen:{session_pk}", 0, timeout=None
+        )
+    except Exception:
+        return 0
+
+
+def get_cached_session_messages(session_pk: int, generation: int):
+    """Formatted message list of a session; None on a miss or cache error."""
+    try:
+        return cache.get(f"{SESSION_MESSAGES_KEY_PREFIX}:{session_pk}:{generation}")
+    except Exception:
+        return None
+
+
+def cache_session_messages(session_pk: int, generation: int, messages: list) -> None:
+    """
+    Store a session's full formatted message list under the generation it was read at.
+
+    A turn committed after that generation was read bumps it, so a stale
+    list cached here is never served.
+    """
+    try:
+        cache.set(
+            f"{SESSION_MESSAGES_KEY_PREFIX}:{session_pk}:{generation}",
+            messages,
+            timeout=SESSION_MESSAGES_TTL_SECONDS,
+        )
+    except Exception:
+        pass  # Caching is best-effort; the next read goes to the DB
+
+
+def forget_session_messages(session_pk: int) -> None:
+    """Invalidate a session's cached messages after a write."""
+    key = f"{SESSION_MESSAGES_KEY_PREFIX}:gen:{session_pk}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+    except Exception:
+        pass  # Stale lists expire with SESSION_MESSAGES_TTL_SECONDS
+
+
+def bulk_save_messages(session_pk: int, rows: list) -> list:
+    """
+    Persist a turn's messages in one INSERT and touch the session once.
+
+    Args:
+        session_pk (int): Primary key of the ChatSession the messages belong to.
+        rows (list): ChatMessage field dicts, in conversation order.
+
+    Returns:
+        list: The created ChatMessage instances, in the same order as rows.
+    """
+    messages = [ChatMessage(session_id=session_pk, **row) for row in rows]
+    with transaction.atomic():
+        ChatMessage.objects.bulk_create(messages, batch_size=MESSAGE_BULK_BATCH_SIZE)
+        ChatSession.objects.filter(pk=session_pk).update(updated_at=timezone.now())
+        transaction.on_commit(lambda: forget_session_messages(session_pk))
+    return messages
+
+
+@shared_task(name="persist_chat_turn")
+def persist_chat_turn(session_pk: int, rows: list) -> int:
+    """
+    Write a chat turn's messages off the request thread.
+
+    Args:
+        session_pk (int): Primary key of the ChatSession.
+        rows (list): JSON-encoded ChatMessage field dicts; "timestamp" is an
+            ISO 8601 string and "id" the UUID assigned by the view.
+
+    Returns:
+        int: Number of messages written.
+    """
+    for row in rows:
+        row["timestamp"] = parse_datetime(row["timestamp"])
+    bulk_save_messages(session_pk, rows)
+    logger.info(f"Persisted {len(rows)} messages for session {session_pk}")
+    return len(rows)
@@ -5,13 +5,15 @@ API views for the chatbot application.
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import transaction
-from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 from rest_framework import status
+from rest_framework.fields import DateTimeField
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -20,11 +22,17 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.openapi import OpenApiTypes
 
 from .models import ChatSession, ChatMessage
+from .tasks import (
+    bulk_save_messages,
+    cache_session_messages,
+    get_cached_session_messages,
+    persist_chat_turn,
+    session_messages_generation,
+)
 from .serializers import (
     ChatSessionSerializer, 
     SendMessageSerializer, 
     SendMessageResponseSerializer,
-    SessionListSerializer,
     ChatMessageSerializer,
     ErrorResponseSerializer,
     DeleteSessionResponseSerializer,
@@ -33,11 +41,130 @@ from .serializers import (
     RenameSessionSerializer,
     RenameSessionResponseSerializer
 )
-from ..agents.chatbot.chatbot import Chatbot, ChatRequest
+from ..agents.chatbot.chatbot import ChatRequest, get_chatbot, new_session_id
 # from ..agents.kg_constructor.neo4j_client import Neo4jClient
 
 logger = logging.getLogger(__name__)
 
+MESSAGES_CHUNK_SIZE = 100
+MAX_MESSAGES_LIMIT = 1000
+
+SESSION_PREVIEW_LENGTH = 100
+
+SESSION_OWNER_KEY_PREFIX = "chat_session_owner"
+SESSION_OWNER_TTL_SECONDS = 60 * 60
+
+
+def _cache_session_owner(session_id: str, owner_id: int, session_pk: int) -> None:
+    """Remember which user owns a session; best-effort."""
+    try:
+        cache.set(
+            f"{SESSION_OWNER_KEY_PREFIX}:{session_id}",
+            (owner_id, session_pk),
+            timeout=SESSION_OWNER_TTL_SECONDS,
+        )
+    except Exception:
+        pass  # Falls back to the DB lookup on the next turn
+
+
+def _forget_session_owner(session_id: str) -> None:
+    """Drop a session's cached owner once the session is deleted."""
+    try:
+        cache.delete(f"{SESSION_OWNER_KEY_PREFIX}:{session_id}")
+    except Exception:
+        pass
+
+
+def get_session_pk_for_user(session_id: str, user_id: int) -> Optional[int]:
+    """
+    Resolve a session id to its pk if the user owns it.
+    
+    Checks the Redis owner cache first, so an ongoing conversation doesn't hit
+    Postgres for ownership on every turn; a miss reads the DB and backfills.
+    
+    Args:
+        session_id: Client-facing session id
+        user_id: Id of the requesting user
+        
+    Returns:
+        The ChatSession pk, or None if it doesn't exist or belongs to another user
+    """
+    try:
+        cached = cache.get(f"{SESSION_OWNER_KEY_PREFIX}:{session_id}")
+    except Exception:
+        cached = None
+    
+    if cached is None:
+        cached = ChatSession.objects.filter(
+            session_id=session_id
+        ).values_list('user_id', 'pk').first()
+        if cached is None:
+            return None
+        _cache_session_owner(session_id, *cached)
+    
+    owner_id, session_pk = cached
+    return session_pk if owner_id == user_id else None
+
+
+def _preview(content: Optional[str]) -> Optional[str]:
+    """Truncate a message to SESSION_PREVIEW_LENGTH characters for session lists."""
+    if content is None:
+        return None
+    if len(content) > SESSION_PREVIEW_LENGTH:
+        return content[:SESSION_PREVIEW_LENGTH] + "..."
+    return content
+
+
+def _ai_message_row(chat_response) -> dict:
+    """
+    ChatMessage fields for the chatbot's reply.
+    
+    Fields with model defaults (metadata, tool flags) are only set when the
+    response carries data, instead of passing placeholder {}/False values.
+    """
+    row = {
+        'message_type': 'ai',
+        'content': chat_response.message,
+        'confidence': chat_response.confidence,
+        'task_type': chat_response.task,
+    }
+    if chat_response.data:
+        row['metadata'] = chat_response.data
+        if chat_response.success:
+            row['used_rag_tool'] = chat_response.data.get('used_rag_tool', False)
+            row['tool_calls_made'] = chat_response.data.get('tool_calls_made', False)
+    return row
+
+
+def persist_turn(session_pk: int, rows: list) -> list:
+    """
+    Hand a turn's messages to the Celery worker so the response doesn't wait on the INSERT.
+    
+    Ids and timestamps are assigned here so the response can return them
+    before the rows exist. If the broker is unreachable the rows are written inline.
+    
+    Args:
+        session_pk: Primary key of the session the messages belong to
+        rows: ChatMessage field dicts, in conversation order
+        
+    Returns:
+        The message ids, in the same order as rows
+    """
+    for row in rows:
+        row.setdefault('id', uuid.uuid4())
+        row.setdefault('timestamp', timezone.now())
+    
+    try:
+        persist_chat_turn.delay(session_pk, [
+            {**row, 'id': str(row['id']), 'timestamp': row['timestamp'].isoformat()}
+            for row in rows
+        ])
+    except Exception as e:
+        logger.warning(f"Could not enqueue persist_chat_turn, saving inline: {e}")
+        bulk_save_messages(session_pk, rows)
+    
+    return [row['id'] for row in rows]
+
 
 @extend_schema(
     tags=['Chatbot'],
@@ -83,32 +210,26 @@ def send_message(request):
         
         # Create or get session
         if session_id:
-            try:
-                chat_session = ChatSession.objects.get(
-                    session_id=session_id, 
-                    user=request.user
-                )
-            except ChatSession.DoesNotExist:
+            # Only the pk is needed to attach messages to it
+            session_pk = get_session_pk_for_user(session_id, request.user.id)
+            if session_pk is None:
                 return Response(
                     {'error': f'Session {session_id} not found for this user'},
                     status=status.HTTP_404_NOT_FOUND
                 )
         else:
             # Create new session
-            session_id = f"session_{request.user.id}_{uuid.uuid4().hex[:8]}"
-            chat_session = ChatSession.objects.create(
+            session_id = new_session_id(request.user.id)
+            session_pk = ChatSession.objects.create(
                 session_id=session_id,
                 user=request.user,
                 title=user_message[:50] + "..." if len(user_message) > 50 else user_message
-            )
+            ).pk
+            _cache_session_owner(session_id, request.user.id, session_pk)
         
-        # Initialize chatbot
+        # Get the shared chatbot (built once per process)
         try:
-            # neo4j_client = Neo4jClient()
-            chatbot = Chatbot(
-                # neo4j_client=neo4j_client,
-                user=request.user
-            )
+            chatbot = get_chatbot()
         except Exception as e:
             logger.error(f"Failed to initialize chatbot: {e}")
             return Response(
@@ -123,56 +244,41 @@ def send_message(request):
             session_id=session_id
         )
         
-        # Process message with chatbot
-        with transaction.atomic():
-            # Save user message
-            user_msg = ChatMessage.objects.create(
-                session=chat_session,
-                message_type='human',
-                content=user_message,
-                metadata={'source': 'api'}
-            )
-            
-            # Get chatbot response
-            chat_response = chatbot.process_message(chat_request)
-            
-            if not chat_response.success:
-                # Save error message
-                ai_msg = ChatMessage.objects.create(
-                    session=chat_session,
-                    message_type='ai',
-                    content=chat_response.message,
-                    confidence=chat_response.confidence,
-                    task_type=chat_response.task,
-                    metadata=chat_response.data or {}
-                )
-                
-                return Response(
-                    {
-                        'success': False,
-                        'message': chat_response.message,
-                        'session_id': session_id,
-                        'user_message_id': user_msg.id,
-                        'ai_message_id': ai_msg.id,
-                        'timestamp': chat_response.timestamp
-                    },
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+        # Buffer the user turn; it is written together with the AI reply below
+        user_row = {
+            'message_type': 'human',
+            'content': user_message,
+            'timestamp': timezone.now(),  # Keep it ordered before the reply
+            'metadata': {'source': 'api'}
+        }
+        
+        # Get chatbot response (no DB transaction is held open during the LLM call)
+        chat_response = chatbot.process_message(chat_request)
+        
+        if not chat_response.success:
+            # Persist user message and error message in the background
+            user_msg_id, ai_msg_id = persist_turn(session_pk, [
+                user_row,
+                _ai_message_row(chat_response)
+            ])
             
-            # Save successful AI response
-            ai_msg = ChatMessage.objects.create(
-                session=chat_session,
-                message_type='ai',
-                content=chat_response.message,
-                used_rag_tool=chat_response.data.get('used_rag_tool', False) if chat_response.data else False,
-                tool_calls_made=chat_response.data.get('tool_calls_made', False) if chat_response.data else False,
-                confidence=chat_response.confidence,
-                task_type=chat_response.task,
-                metadata=chat_response.data or {}
+            return Response(
+                {
+                    'success': False,
+                    'message': chat_response.message,
+                    'session_id': session_id,
+                    'user_message_id': user_msg_id,
+                    'ai_message_id': ai_msg_id,
+                    'timestamp': chat_response.timestamp
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-            
-            # Update session timestamp
-            chat_session.save()
+        
+        # Persist user message and AI response in the background
+        user_msg_id, ai_msg_id = persist_turn(session_pk, [
+            user_row,
+            _ai_message_row(chat_response)
+        ])
         
         # Prepare response
         response_data = {
@@ -183,8 +289,8 @@ def send_message(request):
             'task': chat_response.task,
             'confidence': chat_response.confidence,
             'timestamp': chat_response.timestamp,
-            'user_message_id': user_msg.id,
-            'ai_message_id': ai_msg.id
+            'user_message_id': user_msg_id,
+            'ai_message_id': ai_msg_id
         }
         
         logger.info(f"Successfully processed message for user {request.user.id} in session {session_id}")
@@ -204,9 +310,12 @@ def send_message(request):
     description='''
     Retrieve all messages from a specific chat session for UI display.
     Returns messages in chronological order with metadata.
+    Turns are saved asynchronously after send-message responds, so a fetch
+    made right after a send may not include that turn yet.
     ''',
     responses={
         200: GetSessionMessagesResponseSerializer,
+        400: ErrorResponseSerializer,
         401: ErrorResponseSerializer,
         404: ErrorResponseSerializer
     },
@@ -216,6 +325,12 @@ def send_message(request):
             type=OpenApiTypes.STR,
             location=OpenApiParameter.PATH,
             description='The session ID to retrieve messages from'
+        ),
+        OpenApiParameter(
+            name='limit',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description=f'Only return the most recent N messages (max {MAX_MESSAGES_LIMIT})'
         )
     ]
 )
@@ -224,28 +339,65 @@ def send_message(request):
 def get_session_messages(request, session_id):
     """
     Get all messages from a specific chat session.
+    
+    Eventually consistent with send_message: the latest turn appears once
+    the persist_chat_turn task has written it.
     """
     try:
-        # Get session
-        chat_session = get_object_or_404(
-            ChatSession,
-            session_id=session_id,
-            user=request.user
-        )
+        limit = request.query_params.get('limit')
+        if limit is not None:
+            try:
+                limit = min(int(limit), MAX_MESSAGES_LIMIT)
+                if limit < 1:
+                    raise ValueError
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid input', 'details': {'limit': 'Must be a positive integer'}},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
-        # Get all messages for this session
-        messages = ChatMessage.objects.filter(
-            session=chat_session
-        ).order_by('timestamp')
+        # Ownership check, served from the session owner cache on hot sessions
+        session_pk = get_session_pk_for_user(session_id, request.user.id)
+        if session_pk is None:
+            return Response(
+                {'error': 'Session not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
-        # Serialize messages
-        serializer = ChatMessageSerializer(messages, many=True)
+        # Full history is cached until the next turn is persisted; a limit slices it
+        # Read the generation before the DB so a turn committed in between
+        # invalidates what we cache below
+        generation = session_messages_generation(session_pk)
+        messages = get_cached_session_messages(session_pk, generation)
+        if messages is not None:
+            if limit is not None:
+                messages = messages[-limit:]
+        else:
+            # Single query on (session, timestamp); .values() skips model instantiation
+            rows = ChatMessage.objects.filter(
+                session_id=session_pk
+            ).values(*ChatMessageSerializer.Meta.fields)
+            
+            # Stream rows instead of filling the queryset result cache
+            timestamp_field = DateTimeField()
+            if limit is None:
+                rows = rows.order_by('timestamp').iterator(chunk_size=MESSAGES_CHUNK_SIZE)
+            else:
+                # The most recent `limit` messages, sliced in SQL, returned oldest first
+                rows = reversed(list(rows.order_by('-timestamp')[:limit]))
+            messages = [
+                # Same timestamp format ChatMessageSerializer would emit
+                {**row, 'timestamp': timestamp_field.to_representation(row['timestamp'])}
+                for row in rows
+            ]
+            if limit is None:
+                cache_session_messages(session_pk, generation, messages)
         
-        logger.info(f"Retrieved {messages.count()} messages for session {session_id}")
+        logger.info(f"Retrieved {len(messages)} messages for session {session_id}")
         return Response({
             'session_id': session_id,
-            'message_count': messages.count(),
-            'messages': serializer.data
+            'message_count': len(messages),
+            'messages': messages
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -284,19 +436,22 @@ def delete_session(request, session_id):
     Delete a chat session and all its messages.
     """
     try:
-        # Get session
-        chat_session = get_object_or_404(
-            ChatSession,
-            session_id=session_id,
-            user=request.user
-        )
-        
-        # Get message count before deletion
-        message_count = chat_session.messages.count()
-        
-        # Delete session (messages will be deleted via CASCADE)
+        # The filtered delete doubles as the ownership check and reports the
+        # cascaded message count, so no separate lookup or COUNT is needed
         with transaction.atomic():
-            chat_session.delete()
+            _, deleted = ChatSession.objects.filter(
+                session_id=session_id,
+                user=request.user
+            ).delete()
+        
+        if not deleted.get(ChatSession._meta.label):
+            return Response(
+                {'error': 'Session not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        # Cached messages are keyed by pk and unreachable once the owner key is gone
+        _forget_session_owner(session_id)
+        message_count = deleted.get(ChatMessage._meta.label, 0)
         
         logger.info(f"Deleted session {session_id} with {message_count} messages for user {request.user.id}")
         return Response({
@@ -332,18 +487,37 @@ def list_sessions(request):
     Get all chat sessions for the authenticated user.
     """
     try:
-        # Get all sessions for the user
-        sessions = ChatSession.objects.filter(
+        # Get all sessions for the user with message stats in the same query;
+        # .values() rows are formatted directly instead of instantiating models
+        # and running SessionListSerializer's per-field methods
+        rows = ChatSession.objects.filter(
             user=request.user
-        ).prefetch_related('messages')
+        ).with_list_stats(preview_length=SESSION_PREVIEW_LENGTH).values(
+            'session_id', 'created_at', 'updated_at', 'title',
+            'message_total', 'last_message_at', 'last_message_head'
+        )
         
-        # Serialize sessions
-        serializer = SessionListSerializer(sessions, many=True)
+        # Same output as SessionListSerializer
+        datetime_field = DateTimeField()
+        session_data = [
+            {
+                'session_id': row['session_id'],
+                'created_at': datetime_field.to_representation(row['created_at']),
+                'updated_at': datetime_field.to_representation(row['updated_at']),
+                'title': row['title'],
+                'message_count': row['message_total'],
+                'last_message_timestamp': (
+                    row['last_message_at'].isoformat() if row['last_message_at'] else None
+                ),
+                'last_message_preview': _preview(row['last_message_head']),
+            }
+            for row in rows.iterator(chunk_size=MESSAGES_CHUNK_SIZE)
+        ]
         
-        logger.info(f"Retrieved {sessions.count()} sessions for user {request.user.id}")
+        logger.info(f"Retrieved {len(session_data)} sessions for user {request.user.id}")
         return Response({
-            'session_count': sessions.count(),
-            'sessions': serializer.data
+            'session_count': len(session_data),
+            'sessions': session_data
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -391,19 +565,26 @@ def rename_session(request, session_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get session
-        chat_session = get_object_or_404(
-            ChatSession,
+        # Get session (one query doubles as the ownership check); only the
+        # pk and old title are read, no model instance is built
+        session_row = ChatSession.objects.filter(
             session_id=session_id,
             user=request.user
-        )
+        ).values_list('pk', 'title').first()
+        if session_row is None:
+            return Response(
+                {'error': 'Session not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
-        old_title = chat_session.title
+        session_pk, old_title = session_row
         new_title = serializer.validated_data['title']
         
         # Update title
-        chat_session.title = new_title
-        chat_session.save(update_fields=['title', 'updated_at'])
+        ChatSession.objects.filter(pk=session_pk).update(
+            title=new_title,
+            updated_at=timezone.now()
+        )
         
         logger.info(f"Renamed session {session_id} from '{old_title}' to '{new_title}' for user {request.user.id}")
         return Response({
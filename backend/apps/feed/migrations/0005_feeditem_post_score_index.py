@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-15 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feed", "0004_socialpost_embed_quote"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feeditem",
+            index=models.Index(
+                fields=["post", "-ai_score"], name="feed_feeditem_post_score_idx"
+            ),
+        ),
+    ]
@@ -81,3 +81,7 @@ class FeedItem(models.Model):
     class Meta:
         unique_together = ("feed", "post")  # 1 bài chỉ xuất hiện 1 lần trong 1 feed
         ordering = ["-ai_score"]
+        indexes = [
+            # Bản ghi điểm cao nhất của một post (push_to_rag_task)
+            models.Index(fields=["post", "-ai_score"], name="feed_feeditem_post_score_idx"),
+        ]
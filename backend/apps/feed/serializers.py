@@ -55,8 +55,9 @@ class PersonalFeedSerializer(serializers.ModelSerializer):
     Dùng để Tạo mới (Create) và Xem cấu hình (Retrieve) Feed.
     """
 
-    # Tính toán số lượng bài viết hiện có trong feed (Optional but helpful)
-    items_count = serializers.SerializerMethodField()
+    # Số lượng bài viết trong feed, được annotate sẵn trong queryset của ViewSet
+    # (một COUNT trong cùng câu SQL thay vì một query cho mỗi feed)
+    items_count = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
         model = PersonalFeed
@@ -82,10 +83,6 @@ class PersonalFeedSerializer(serializers.ModelSerializer):
             "user",
         ]
 
-    def get_items_count(self, obj):
-        """Trả về số lượng bài viết đã curate trong feed này"""
-        return obj.items.count()
-
     def create(self, validated_data):
         """
         Logic tùy chỉnh khi tạo feed (nếu cần).
@@ -1,3 +1,4 @@
+from django.db.models import Count
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -20,6 +21,10 @@ class BaseFeedViewSet(viewsets.ModelViewSet):
 
     serializer_class = PersonalFeedSerializer
 
+    def get_queryset(self):
+        # items_count được tính bằng một COUNT ... GROUP BY cho cả trang
+        return super().get_queryset().annotate(items_count=Count("items"))
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -46,7 +46,9 @@ class TextProcessingRequestAdmin(admin.ModelAdmin):
     )
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user')
+        # The raw payload (full post text) is only shown on the change form;
+        # keep it out of the changelist rows
+        return super().get_queryset(request).select_related('user').defer('payload')
     
     def colored_status(self, obj):
         colors = {
@@ -82,6 +84,10 @@ class KnowledgeGraphStatisticsAdmin(admin.ModelAdmin):
         'source_nodes', 'entity_nodes', 'statistics_data'
     ]
     
+    def get_queryset(self, request):
+        # statistics_data is only shown on the detail page
+        return super().get_queryset(request).defer('statistics_data')
+    
     def has_add_permission(self, request):
         # Prevent manual addition - these should be created automatically
         return False
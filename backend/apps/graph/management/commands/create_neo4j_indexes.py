@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.agents.kg_constructor.neo4j_client import Neo4jClient
+
+
+class Command(BaseCommand):
+    help = "Create Neo4j constraints and indexes (Entity.name, Post.post_id, full-text entity search)"
+
+    def handle(self, *args, **options):
+        client = Neo4jClient()
+        client.create_indexes()
+        self.stdout.write(
+            self.style.SUCCESS(f"Neo4j constraints and indexes ensured on {client.uri}")
+        )
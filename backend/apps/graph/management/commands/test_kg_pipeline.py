@@ -102,7 +102,7 @@ class Command(BaseCommand):
                     self.stdout.write(f"  Total nodes: {stats.get('total_nodes', 0)}")
                     self.stdout.write(f"  Total relationships: {stats.get('total_relationships', 0)}")
                     self.stdout.write(f"  Users: {stats.get('users', 0)}")
-                    self.stdout.write(f"  Videos: {stats.get('videos', 0)}")
+                    self.stdout.write(f"  Posts: {stats.get('posts', 0)}")
                     self.stdout.write(f"  Topics: {stats.get('topics', 0)}")
                     self.stdout.write(f"  Sources: {stats.get('sources', 0)}")
                     self.stdout.write(f"  Entities: {stats.get('entities', 0)}")
@@ -142,7 +142,7 @@ class Command(BaseCommand):
             self.stdout.write('\n📺 Testing video knowledge graph retrieval...')
             try:
                 video_id = payload['video']['video_id']
-                video_graph = processor.neo4j_client.get_video_knowledge_graph(video_id)
+                video_graph = processor.neo4j_client.get_post_knowledge_graph(video_id)
                 self.stdout.write(f"Video KG for {video_id}:")
                 self.stdout.write(f"  Nodes: {len(video_graph['nodes'])}")
                 self.stdout.write(f"  Relationships: {len(video_graph['relationships'])}")
@@ -1,14 +1,34 @@
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files import File
 import json
 import os
+import shutil
+import tempfile
 from pathlib import Path
+from types import MappingProxyType
 
-from apps.agents.video_pipeline import UnifiedVideoProcessor, EXAMPLE_VIDEO_PAYLOAD
+from apps.agents.tasks import process_video_task
+from apps.agents.video_pipeline import UnifiedPostProcessor, EXAMPLE_VIDEO_PAYLOAD
 from apps.graph.models import KnowledgeGraphStatistics
 from apps.agents.kg_constructor.config import get_openai_llm
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False  # Will fall back to the stdlib json module
+
+# Mock analysis result for testing the KG pipeline in simulation mode
+MOCK_ANALYSIS = MappingProxyType({
+    'transcript': 'This is a mock transcript for testing purposes.',
+    'summary': 'This video discusses machine learning concepts including neural networks, data processing, and model training. It covers fundamental algorithms and their applications in real-world scenarios.',
+    'detected_language': 'en',
+    'analysis_method': 'mock_simulation',
+    'processing_time_seconds': 0.1,
+    'error': None
+})
+
 
 class Command(BaseCommand):
     help = 'Test the unified video processing pipeline (video analysis + knowledge graph construction)'
@@ -44,6 +64,11 @@ class Command(BaseCommand):
             type=str,
             help='Path to JSON file with custom payload (excluding video_file)',
         )
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Run the pipeline on a Celery worker and print the task id instead of waiting',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('🚀 Testing Unified Video Processing Pipeline'))
@@ -54,8 +79,8 @@ class Command(BaseCommand):
             use_gemini = options.get('use_gemini', True)
             use_whisper = options.get('use_whisper', True)
 
-            processor = UnifiedVideoProcessor(
-                use_gemini_for_video=use_gemini,
+            processor = UnifiedPostProcessor(
+                use_gemini_for_post=use_gemini,
                 use_whisper_for_audio=use_whisper,
                 enable_kg_resolution=True,
                 llm=get_openai_llm(model="gpt-4o-mini")
@@ -89,14 +114,17 @@ class Command(BaseCommand):
             # Load payload
             if options['custom_payload']:
                 try:
-                    with open(options['custom_payload'], 'r') as f:
-                        payload = json.load(f)
+                    # orjson decodes the raw bytes directly, skipping the text decoder
+                    with open(options['custom_payload'], 'rb') as f:
+                        raw = f.read()
+                    payload = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
                     self.stdout.write(f"📄 Using custom payload from {options['custom_payload']}")
                 except Exception as e:
                     self.stdout.write(self.style.ERROR(f"❌ Failed to load custom payload: {e}"))
                     return
             else:
-                payload = EXAMPLE_VIDEO_PAYLOAD.copy()
+                # The pipeline fills in payload['video'], so copy that level too
+                payload = {**EXAMPLE_VIDEO_PAYLOAD, 'video': dict(EXAMPLE_VIDEO_PAYLOAD['video'])}
                 self.stdout.write("📄 Using example payload")
 
             # Handle video file
@@ -109,39 +137,28 @@ class Command(BaseCommand):
                     self.stdout.write(self.style.ERROR(f"❌ Video file not found: {video_path}"))
                     return
 
-                with open(video_path, 'rb') as f:
-                    video_content = f.read()
+                if options['enqueue']:
+                    self._enqueue(payload, video_path)
+                    return
 
-                video_file = SimpleUploadedFile(
-                    name=os.path.basename(video_path),
-                    content=video_content,
-                    content_type='video/mp4'
-                )
+                # Hand the pipeline the open file; it is read in chunks via
+                # File.chunks() instead of being loaded into memory
+                video_file = File(open(video_path, 'rb'), name=os.path.basename(video_path))
                 self.stdout.write(f"📹 Using video file: {video_path}")
             else:
                 # Simulate mode without actual video processing
                 self.stdout.write(self.style.WARNING('⚠️  No video file provided - simulation mode'))
                 self.stdout.write('Use --video-path /path/to/video.mp4 to test with actual video')
 
-                # Create mock analysis result for testing KG pipeline
-                mock_analysis = {
-                    'transcript': 'This is a mock transcript for testing purposes.',
-                    'summary': 'This video discusses machine learning concepts including neural networks, data processing, and model training. It covers fundamental algorithms and their applications in real-world scenarios.',
-                    'detected_language': 'en',
-                    'analysis_method': 'mock_simulation',
-                    'processing_time_seconds': 0.1,
-                    'error': None
-                }
-
-                # Create KG payload directly
+                # Create KG payload directly from the mock analysis (only read, never mutated)
                 payload['video']['video_id'] = 'mock_video_123'
-                kg_payload = processor.create_kg_payload_from_analysis(payload, mock_analysis)
+                kg_payload = processor.create_kg_payload_from_analysis(payload, MOCK_ANALYSIS)
 
                 self.stdout.write('\n🔄 Processing mock data through KG pipeline...')
                 result = processor.kg_processor.process_video_summarization(kg_payload)
 
                 # Display KG results
-                self._display_kg_results(result, mock_analysis)
+                self._display_kg_results(result, MOCK_ANALYSIS)
                 return
 
             # Add video file to payload
@@ -159,7 +176,10 @@ class Command(BaseCommand):
 
             # Process through unified pipeline
             self.stdout.write('\n🔄 Processing video through unified pipeline...')
-            result = processor.process_video_to_knowledge_graph(payload)
+            try:
+                result = processor.process_video_to_knowledge_graph(payload)
+            finally:
+                video_file.close()
 
             # Display results
             self._display_unified_results(result)
@@ -168,8 +188,6 @@ class Command(BaseCommand):
             if result['status'] == 'success':
                 self._test_additional_features(processor, result)
 
-            processor.kg_processor.neo4j_client.close()
-
             self.stdout.write('\n' + '=' * 80)
             self.stdout.write(self.style.SUCCESS('✅ Unified pipeline test completed!'))
 
@@ -181,74 +199,113 @@ class Command(BaseCommand):
             import traceback
             self.stdout.write(traceback.format_exc())
 
+    def _enqueue(self, payload, video_path):
+        """Stage the video where workers can read it and hand the pipeline to Celery."""
+        payload = {k: v for k, v in payload.items() if k != 'video_file'}
+
+        # Streamed copy; the task owns (and removes) the staged file
+        with open(video_path, 'rb') as src, tempfile.NamedTemporaryFile(
+            suffix='.mp4', delete=False, dir=settings.WHISPER_SHARED_DIR
+        ) as staged:
+            shutil.copyfileobj(src, staged)
+
+        task = process_video_task.delay(payload, staged.name)
+        self.stdout.write(self.style.SUCCESS(f"✅ Enqueued process_video_task: {task.id}"))
+        self.stdout.write(f"  Staged video: {staged.name}")
+        self.stdout.write('  Check progress with celery -A reelsai result ' + task.id)
+
     def _display_unified_results(self, result):
         """Display unified pipeline results."""
-        self.stdout.write('\n📊 Unified Pipeline Results:')
-        self.stdout.write('=' * 60)
+        # Build the whole report and write it once instead of a flush per line
+        lines = ['\n📊 Unified Pipeline Results:', '=' * 60]
 
         if result['status'] == 'success':
-            self.stdout.write(self.style.SUCCESS(f"✅ Status: {result['status']}"))
-            self.stdout.write(f"🔄 Pipeline Type: {result['pipeline_type']}")
-            self.stdout.write(f"⏱️  Total Processing Time: {result['total_processing_time_seconds']:.2f} secondss")
+            lines += [
+                self.style.SUCCESS(f"✅ Status: {result['status']}"),
+                f"🔄 Pipeline Type: {result['pipeline_type']}",
+                f"⏱️  Total Processing Time: {result['total_processing_time_seconds']:.2f} seconds",
+            ]
 
             # Video analysis results
             if 'video_analysis' in result:
                 va = result['video_analysis']
-                self.stdout.write('\n🎬 Video Analysis Stage:')
-                self.stdout.write(f"  Method: {va.get('analysis_method', 'N/A')}")
-                self.stdout.write(f"  Language: {va.get('detected_language', 'N/A')}")
-                self.stdout.write(f"  Has Transcript: {va.get('has_transcript', False)}")
-                self.stdout.write(f"  Summary Length: {va.get('summary_length', 0)} chars")
-                self.stdout.write(f"  Transcript Length: {va.get('transcript_length', 0)} chars")
-                self.stdout.write(f"  Processing Time: {va.get('processing_time_seconds', 0):.2f} seconds")     
+                lines += [
+                    '\n🎬 Video Analysis Stage:',
+                    f"  Method: {va.get('analysis_method', 'N/A')}",
+                    f"  Language: {va.get('detected_language', 'N/A')}",
+                    f"  Has Transcript: {va.get('has_transcript', False)}",
+                    f"  Summary Length: {va.get('summary_length', 0)} chars",
+                    f"  Transcript Length: {va.get('transcript_length', 0)} chars",
+                    f"  Processing Time: {va.get('processing_time_seconds', 0):.2f} seconds",
+                ]
 
             # Knowledge graph results
             if 'knowledge_graph' in result:
-                self._display_kg_results(result['knowledge_graph'], None, indent='  ')
+                lines += self._kg_result_lines(result['knowledge_graph'], indent='  ')
 
-            self.stdout.write('\n🆔 Final Results:')
-            self.stdout.write(f"  Video ID: {result.get('video_id', 'N/A')}")
-            self.stdout.write(f"  User ID: {result.get('user_id', 'N/A')}")
+            lines += [
+                '\n🆔 Final Results:',
+                f"  Video ID: {result.get('video_id', 'N/A')}",
+                f"  User ID: {result.get('user_id', 'N/A')}",
+            ]
 
         else:
-            self.stdout.write(self.style.ERROR(f"❌ Status: {result['status']}"))
-            self.stdout.write(self.style.ERROR(f"Stage: {result.get('stage', 'Unknown')}"))
-            self.stdout.write(self.style.ERROR(f"Error: {result.get('error_message', 'Unknown error')}"))       
-            self.stdout.write(f"⏱️  Processing Time: {result.get('total_processing_time_seconds', 0):.2f} secondds")
+            lines += [
+                self.style.ERROR(f"❌ Status: {result['status']}"),
+                self.style.ERROR(f"Stage: {result.get('stage', 'Unknown')}"),
+                self.style.ERROR(f"Error: {result.get('error_message', 'Unknown error')}"),
+                f"⏱️  Processing Time: {result.get('total_processing_time_seconds', 0):.2f} seconds",
+            ]
+
+        self.stdout.write('\n'.join(lines))
 
     def _display_kg_results(self, kg_result, analysis_result=None, indent=''):
         """Display knowledge graph results."""
-        self.stdout.write(f'\n{indent}🧠 Knowledge Graph Stage:')
+        self.stdout.write('\n'.join(self._kg_result_lines(kg_result, indent)))
+
+    def _kg_result_lines(self, kg_result, indent=''):
+        """Report lines for knowledge graph results."""
+        lines = [f'\n{indent}🧠 Knowledge Graph Stage:']
 
         if kg_result.get('status') == 'success':
-            self.stdout.write(f"{indent}  Status: ✅ {kg_result['status']}")
-            self.stdout.write(f"{indent}  Processing Type: {kg_result.get('processing_type', 'N/A')}")
-            self.stdout.write(f"{indent}  Processing Time: {kg_result.get('processing_time_seconds', 0):.2f} seconds")
-            self.stdout.write(f"{indent}  Extracted Entities: {kg_result.get('extracted_entities', 0)}")        
-            self.stdout.write(f"{indent}  Extracted Relations: {kg_result.get('extracted_relations', 0)}")      
-            self.stdout.write(f"{indent}  Upserted Entities: {kg_result.get('upserted_entities', 0)}")
-            self.stdout.write(f"{indent}  Resolution Enabled: {kg_result.get('resolution_enabled', False)}")    
+            lines += [
+                f"{indent}  Status: ✅ {kg_result['status']}",
+                f"{indent}  Processing Type: {kg_result.get('processing_type', 'N/A')}",
+                f"{indent}  Processing Time: {kg_result.get('processing_time_seconds', 0):.2f} seconds",
+                f"{indent}  Extracted Entities: {kg_result.get('extracted_entities', 0)}",
+                f"{indent}  Extracted Relations: {kg_result.get('extracted_relations', 0)}",
+                f"{indent}  Upserted Entities: {kg_result.get('upserted_entities', 0)}",
+                f"{indent}  Resolution Enabled: {kg_result.get('resolution_enabled', False)}",
+            ]
 
             # Display node IDs
             if kg_result.get('node_ids'):
-                self.stdout.write(f'\n{indent}🆔 Created/Updated Node IDs:')
-                for node_type, node_id in kg_result['node_ids'].items():
-                    self.stdout.write(f"{indent}  {node_type.capitalize()}: {node_id}")
+                lines.append(f'\n{indent}🆔 Created/Updated Node IDs:')
+                lines += [
+                    f"{indent}  {node_type.capitalize()}: {node_id}"
+                    for node_type, node_id in kg_result['node_ids'].items()
+                ]
 
             # Display graph statistics
             if kg_result.get('graph_statistics'):
                 stats = kg_result['graph_statistics']
-                self.stdout.write(f'\n{indent}📈 Graph Statistics:')
-                self.stdout.write(f"{indent}  Total nodes: {stats.get('total_nodes', 0)}")
-                self.stdout.write(f"{indent}  Total relationships: {stats.get('total_relationships', 0)}")      
-                self.stdout.write(f"{indent}  Users: {stats.get('users', 0)}")
-                self.stdout.write(f"{indent}  Videos: {stats.get('videos', 0)}")
-                self.stdout.write(f"{indent}  Topics: {stats.get('topics', 0)}")
-                self.stdout.write(f"{indent}  Sources: {stats.get('sources', 0)}")
-                self.stdout.write(f"{indent}  Entities: {stats.get('entities', 0)}")
+                lines += [
+                    f'\n{indent}📈 Graph Statistics:',
+                    f"{indent}  Total nodes: {stats.get('total_nodes', 0)}",
+                    f"{indent}  Total relationships: {stats.get('total_relationships', 0)}",
+                    f"{indent}  Users: {stats.get('users', 0)}",
+                    f"{indent}  Posts: {stats.get('posts', 0)}",
+                    f"{indent}  Topics: {stats.get('topics', 0)}",
+                    f"{indent}  Sources: {stats.get('sources', 0)}",
+                    f"{indent}  Entities: {stats.get('entities', 0)}",
+                ]
         else:
-            self.stdout.write(self.style.ERROR(f"{indent}  Status: ❌ {kg_result.get('status', 'error')}"))     
-            self.stdout.write(self.style.ERROR(f"{indent}  Error: {kg_result.get('error_message', 'Unknown error')}"))
+            lines += [
+                self.style.ERROR(f"{indent}  Status: ❌ {kg_result.get('status', 'error')}"),
+                self.style.ERROR(f"{indent}  Error: {kg_result.get('error_message', 'Unknown error')}"),
+            ]
+
+        return lines
 
     def _test_additional_features(self, processor, result):
         """Test additional pipeline features."""
@@ -261,19 +318,21 @@ class Command(BaseCommand):
 
             # Test video knowledge graph retrieval
             if 'video_id' in result:
-                video_graph = processor.kg_processor.neo4j_client.get_video_knowledge_graph(result['video_id']) 
+                video_graph = processor.kg_processor.neo4j_client.get_post_knowledge_graph(result['video_id'])
                 self.stdout.write(f"  📺 Video KG: {len(video_graph['nodes'])} nodes, {len(video_graph['relationships'])} relationships")
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"  ❌ Additional tests failed: {e}"))
 
     def _show_next_steps(self):
         """Show next steps for the user."""
-        self.stdout.write('\n💡 Next Steps:')
-        self.stdout.write('1. Test with your own video files:')
-        self.stdout.write('   python manage.py test_unified_pipeline --video-path /path/to/video.mp4')
-        self.stdout.write('2. Configure analysis methods:')
-        self.stdout.write('   --use-gemini (visual+audio) or --use-whisper (audio only)')
-        self.stdout.write('3. Test the REST API endpoints:')
-        self.stdout.write('   POST /api/video/process-video/')  # This would need to be created
-        self.stdout.write('   GET  /api/graph/search/?q=machine+learning')
-        self.stdout.write('4. Explore the Neo4j browser at http://localhost:7474')
\ No newline at end of file
+        self.stdout.write('\n'.join([
+            '\n💡 Next Steps:',
+            '1. Test with your own video files:',
+            '   python manage.py test_unified_pipeline --video-path /path/to/video.mp4',
+            '2. Configure analysis methods:',
+            '   --use-gemini (visual+audio) or --use-whisper (audio only)',
+            '3. Test the REST API endpoints:',
+            '   POST /api/video/process-video/',  # This would need to be created
+            '   GET  /api/graph/search/?q=machine+learning',
+            '4. Explore the Neo4j browser at http://localhost:7474',
+        ]))
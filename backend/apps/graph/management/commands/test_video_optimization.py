@@ -148,7 +148,7 @@ class Command(BaseCommand):
             self.stdout.write(f"  - Total nodes: {graph_stats['total_nodes']}")
             self.stdout.write(f"  - Total relationships: {graph_stats['total_relationships']}")
             self.stdout.write(f"  - Total entities: {graph_stats.get('entities', 'N/A')}")
-            self.stdout.write(f"  - Total videos: {graph_stats.get('videos', 'N/A')}")
+            self.stdout.write(f"  - Total posts: {graph_stats.get('posts', 'N/A')}")
             self.stdout.write(f"  - Total users: {graph_stats.get('users', 'N/A')}")
             
             # Close connections
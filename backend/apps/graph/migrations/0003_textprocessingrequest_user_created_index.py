@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-15 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("graph", "0002_rename_video_nodes_knowledgegraphstatistics_post_nodes_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="textprocessingrequest",
+            name="graph_textp_user_id_6020b5_idx",
+        ),
+        migrations.AddIndex(
+            model_name="textprocessingrequest",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="graph_textp_user_created_idx",
+            ),
+        ),
+    ]
@@ -39,7 +39,7 @@ class TextProcessingRequest(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['post_id', 'status']),
-            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['user', '-created_at', '-id'], name='graph_textp_user_created_idx'),
             models.Index(fields=['status', 'created_at']),
         ]
     
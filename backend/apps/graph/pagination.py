@@ -0,0 +1,25 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class UserRequestCursorPagination(CursorPagination):
+    """
+    Keyset pagination over a user's requests, newest first.
+
+    id breaks ties between requests created in the same instant. Each page is
+    a bounded range scan on the (user, -created_at, -id) index rather
+    than an OFFSET that grows with the page number, and only page_size rows
+    are ever loaded.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'page_size': self.page_size,
+            'requests': data,
+        })
@@ -0,0 +1,32 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False  # Will fall back to DRF's JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSON parser backed by orjson for large text processing payloads.
+
+    Decodes the raw request bytes in one call instead of wrapping the stream
+    in a text decoder and parsing with the stdlib json module.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not ORJSON_AVAILABLE:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            raw = stream.read() if stream is not None else b''
+            if encoding.lower().replace('-', '') != 'utf8':
+                raw = raw.decode(encoding)
+            return orjson.loads(raw)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,27 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False  # Will fall back to DRF's JSONRenderer
+
+
+def _default(obj):
+    """Serialize Neo4j temporal values and other non-JSON types."""
+    if hasattr(obj, 'iso_format'):
+        return obj.iso_format()
+    return str(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson for large graph payloads.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not ORJSON_AVAILABLE:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_default)
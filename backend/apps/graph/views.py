@@ -1,17 +1,22 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.utils import timezone
 from django.db import transaction
+from django.db.models.fields.json import KeyTransform
 from django.conf import settings
 from drf_spectacular.utils import (
     extend_schema, OpenApiExample, OpenApiParameter, OpenApiResponse
 )
 import logging
 import json
+from langchain_openai import ChatOpenAI
 
 from .models import TextProcessingRequest, KnowledgeGraphStatistics
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+from .pagination import UserRequestCursorPagination
 from ..agents.kg_constructor.text_processor import TextProcessor
 from ..agents.kg_constructor.neo4j_client import Neo4jClient
 
@@ -130,6 +135,7 @@ logger = logging.getLogger(__name__)
     ]
 )
 @api_view(['POST'])
+@parser_classes([ORJSONParser])
 @permission_classes([IsAuthenticated])
 def process_post_text(request):
     """
@@ -216,7 +222,11 @@ def process_post_text(request):
                     text_processing_request.status = 'failed'
                     text_processing_request.error_message = result.get('error_message', 'Unknown error')
                 
-                text_processing_request.save()
+                # Only write the result columns; the original payload JSON is unchanged
+                text_processing_request.save(update_fields=[
+                    'status', 'error_message', 'processing_result',
+                    'processing_completed_at', 'processing_time_seconds', 'updated_at'
+                ])
             
             # Create statistics snapshot if successful
             if result.get('status') == 'success' and result.get('graph_statistics'):
@@ -243,7 +253,9 @@ def process_post_text(request):
                 text_processing_request.status = 'failed'
                 text_processing_request.error_message = str(e)
                 text_processing_request.processing_completed_at = timezone.now()
-                text_processing_request.save()
+                text_processing_request.save(update_fields=[
+                    'status', 'error_message', 'processing_completed_at', 'updated_at'
+                ])
             
             return Response({
                 'request_id': text_processing_request.id,
@@ -360,11 +372,10 @@ def get_processing_status(request, request_id):
             default=20
         ),
         OpenApiParameter(
-            name="page",
-            description="Page number",
+            name="cursor",
+            description="Opaque cursor taken from the previous response's next/previous link",
             required=False,
-            type=int,
-            default=1
+            type=str
         )
     ],
     responses={
@@ -374,8 +385,8 @@ def get_processing_status(request, request_id):
                 OpenApiExample(
                     "User Requests List",
                     value={
-                        "count": 5,
-                        "page": 1,
+                        "next": "http://localhost:8000/api/graph/requests/?cursor=cD0yMDI1LTExLTE3",
+                        "previous": None,
                         "page_size": 20,
                         "requests": [
                             {
@@ -403,7 +414,16 @@ def list_user_requests(request):
     """
     List all post text processing requests for the authenticated user.
     """
-    requests = TextProcessingRequest.objects.filter(user=request.user)
+    # Only load the columns the response needs; the payload and processing_result
+    # JSON can be large, and only two keys of the result are listed, so Postgres
+    # extracts those instead of the whole document being decoded per row
+    requests = TextProcessingRequest.objects.filter(user=request.user).only(
+        'id', 'status', 'post_id', 'topic', 'source', 'created_at',
+        'processing_time_seconds', 'error_message'
+    ).annotate(
+        entities_count=KeyTransform('extracted_entities', 'processing_result'),
+        relations_count=KeyTransform('extracted_relations', 'processing_result'),
+    )
     
     # Apply filters
     status_filter = request.GET.get('status')
@@ -414,34 +434,24 @@ def list_user_requests(request):
     if post_id_filter:
         requests = requests.filter(post_id=post_id_filter)
     
-    # Pagination
-    page_size = min(int(request.GET.get('page_size', 20)), 100)
-    page = int(request.GET.get('page', 1))
-    start = (page - 1) * page_size
-    end = start + page_size
-    
-    total_count = requests.count()
-    requests = requests[start:end]
+    # Keyset pagination on (user, -created_at, -id): only one page of rows is fetched
+    paginator = UserRequestCursorPagination()
+    page = paginator.paginate_queryset(requests, request)
     
-    return Response({
-        'count': total_count,
-        'page': page,
-        'page_size': page_size,
-        'requests': [
-            {
-                'request_id': req.id,
-                'status': req.status,
-                'post_id': req.post_id,
-                'topic': req.topic,
-                'source': req.source,
-                'created_at': req.created_at,
-                'processing_time_seconds': req.processing_time_seconds,
-                'extracted_entities_count': req.extracted_entities_count,
-                'extracted_relations_count': req.extracted_relations_count,
-                'error_message': req.error_message if req.status == 'failed' else None
-            } for req in requests
-        ]
-    }, status=status.HTTP_200_OK)
+    return paginator.get_paginated_response([
+        {
+            'request_id': req.id,
+            'status': req.status,
+            'post_id': req.post_id,
+            'topic': req.topic,
+            'source': req.source,
+            'created_at': req.created_at,
+            'processing_time_seconds': req.processing_time_seconds,
+            'extracted_entities_count': req.entities_count or 0,
+            'extracted_relations_count': req.relations_count or 0,
+            'error_message': req.error_message if req.status == 'failed' else None
+        } for req in page
+    ])
 
 
 @extend_schema(
@@ -648,6 +658,7 @@ def search_entities(request):
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer])
 def get_post_knowledge_graph(request, post_id):
     """
     Get the complete knowledge graph for a specific post.
@@ -1035,7 +1046,6 @@ def toggle_resolution_engine(request):
         
         if enable:
             # Initialize processor with resolution enabled
-            from langchain_openai import ChatOpenAI
             llm = ChatOpenAI(
                 api_key=getattr(settings, 'OPENAI_API_KEY', ''),
                 model="gpt-4o-mini",
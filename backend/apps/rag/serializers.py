@@ -1,20 +1,86 @@
+from django.core.validators import RegexValidator
 from rest_framework import serializers
 
+from apps.agents.rag.utils import EMBEDDING_DIM, SEARCH_EF
+
+# user_id and platform are quoted into the Milvus filter expression, so values
+# that would break out of the quotes are rejected before any embedding work
+filter_safe = RegexValidator(
+    r"^[^'\"\\]*$", "Must not contain quotes or backslashes."
+)
+
 
 class ItemDataSerializer(serializers.Serializer):
     content_id = serializers.CharField(max_length=64)
     content_url = serializers.CharField(max_length=200)
-    user_id = serializers.CharField(max_length=64)
-    platform = serializers.CharField(max_length=20)
+    user_id = serializers.CharField(max_length=64, validators=[filter_safe])
+    platform = serializers.CharField(max_length=20, validators=[filter_safe])
     summary = serializers.CharField()
     timestamp = serializers.IntegerField(
         required=False, allow_null=True
     )  # Optional nếu muốn giữ
+    # Optional precomputed all-MiniLM-L6-v2 vector; the summary is embedded here otherwise
+    embedding = serializers.ListField(
+        child=serializers.FloatField(),
+        min_length=EMBEDDING_DIM,
+        max_length=EMBEDDING_DIM,
+        required=False,
+        allow_null=True,
+    )
+
+
+class BulkItemDataSerializer(serializers.Serializer):
+    items = ItemDataSerializer(many=True, allow_empty=False, max_length=500)
 
 
 class QueryRequestSerializer(serializers.Serializer):
-    user_id = serializers.CharField(max_length=64)
+    user_id = serializers.CharField(max_length=64, validators=[filter_safe])
     query = serializers.CharField()
-    top_k = serializers.IntegerField(default=5, required=False)
+    top_k = serializers.IntegerField(
+        default=5, required=False, min_value=1, max_value=SEARCH_EF
+    )
     from_timestamp = serializers.IntegerField(required=False, allow_null=True)
-    platform = serializers.CharField(max_length=20, required=False, allow_null=True)
+    platform = serializers.CharField(
+        max_length=20, required=False, allow_null=True, validators=[filter_safe]
+    )
+
+
+class AddItemResponseSerializer(serializers.Serializer):
+    """Response serializer for adding a single item"""
+
+    status = serializers.CharField(default="success")
+    content_id = serializers.CharField()
+
+
+class BulkAddItemsResponseSerializer(serializers.Serializer):
+    """Response serializer for adding items in bulk"""
+
+    status = serializers.CharField(default="success")
+    count = serializers.IntegerField()
+    content_ids = serializers.ListField(child=serializers.CharField())
+
+
+class QueryResultSerializer(serializers.Serializer):
+    """A single semantic search hit"""
+
+    content_id = serializers.CharField()
+    content_url = serializers.CharField()
+    summary = serializers.CharField()
+    platform = serializers.CharField()
+    timestamp = serializers.IntegerField(allow_null=True)
+    score = serializers.FloatField()
+
+
+class QueryResponseSerializer(serializers.Serializer):
+    """Response serializer for semantic search queries"""
+
+    query = serializers.CharField()
+    filter = serializers.CharField()
+    results = QueryResultSerializer(many=True)
+
+
+class ErrorResponseSerializer(serializers.Serializer):
+    """Serializer for error responses"""
+
+    error = serializers.CharField()
+    details = serializers.DictField(required=False)
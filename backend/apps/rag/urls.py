@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import add_item_view, query_items_view
+from .views import add_item_view, bulk_add_items_view, query_items_view
 
 urlpatterns = [
     path("add-item", add_item_view, name="rag_add_item"),
+    path("add-items", bulk_add_items_view, name="rag_bulk_add_items"),
     path("query-items", query_items_view, name="rag_query_items"),
 ]
\ No newline at end of file
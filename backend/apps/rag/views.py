@@ -1,14 +1,58 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
 from rest_framework.decorators import api_view, permission_classes
 
 # from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
-from .serializers import ItemDataSerializer, QueryRequestSerializer
+from .serializers import (
+    AddItemResponseSerializer,
+    BulkAddItemsResponseSerializer,
+    BulkItemDataSerializer,
+    ErrorResponseSerializer,
+    ItemDataSerializer,
+    QueryRequestSerializer,
+    QueryResponseSerializer,
+)
 from apps.agents.rag import utils
 
-from drf_spectacular.utils import extend_schema, OpenApiExample
-from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse
+
+QUERY_CACHE_KEY_PREFIX = "rag_query"
+QUERY_CACHE_TTL_SECONDS = 60
+
+
+def _query_generation(user_id: str) -> int:
+    """Current cache generation of a user's RAG index; bumped on every insert."""
+    try:
+        return cache.get_or_set(f"{QUERY_CACHE_KEY_PREFIX}:gen:{user_id}", 0, timeout=None)
+    except Exception:
+        return 0
+
+
+def _bump_query_generation(user_id: str) -> None:
+    """Invalidate all cached queries of a user without scanning for their keys."""
+    key = f"{QUERY_CACHE_KEY_PREFIX}:gen:{user_id}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+    except Exception:
+        pass  # Stale results expire with QUERY_CACHE_TTL_SECONDS
+
+
+def _query_cache_key(params: dict) -> str:
+    """Cache key for a validated query, scoped to the user's index generation."""
+    digest = hashlib.blake2b(
+        json.dumps(params, sort_keys=True, default=str).encode(), digest_size=16
+    ).hexdigest()
+    return f"{QUERY_CACHE_KEY_PREFIX}:{_query_generation(params['user_id'])}:{digest}"
+
 
 # Example payloads (optional, shown in UI)
 ADD_ITEM_EXAMPLE = OpenApiExample(
@@ -40,24 +84,9 @@ QUERY_ITEMS_EXAMPLE = OpenApiExample(
 @extend_schema(
     request=ItemDataSerializer,
     responses={
-        200: {
-            "type": "object",
-            "properties": {
-                "status": {"type": "string", "example": "success"},
-                "content_id": {"type": "string", "example": "6952571625178975493"},
-            },
-        },
-        400: {
-            "type": "object",
-            "properties": {
-                "error": {"type": "string"},
-                "details": {"type": "object"},
-            },
-        },
-        500: {
-            "type": "object",
-            "properties": {"error": {"type": "string"}},
-        },
+        200: AddItemResponseSerializer,
+        400: ErrorResponseSerializer,
+        500: ErrorResponseSerializer,
     },
     examples=[ADD_ITEM_EXAMPLE],
     description="Add an item to RAG system. Timestamp is optional - if not provided, current timestamp will be used.",
@@ -69,7 +98,7 @@ def add_item_view(request):
     Add a single item to the RAG system.
 
     The summary will be embedded using all-MiniLM-L6-v2 and stored in Milvus.
-    Timestamp is optional - defaults to None if not provided.
+    Timestamp is optional - defaults to the current time if missing or null.
     """
     s = ItemDataSerializer(data=request.data)
     if not s.is_valid():
@@ -80,54 +109,73 @@ def add_item_view(request):
     try:
         # insert_item will handle optional timestamp
         res = utils.insert_item(**s.validated_data)
+        _bump_query_generation(s.validated_data["user_id"])
+        return Response(res, status=status.HTTP_200_OK)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@extend_schema(
+    request=BulkItemDataSerializer,
+    responses={
+        200: BulkAddItemsResponseSerializer,
+        400: ErrorResponseSerializer,
+        500: ErrorResponseSerializer,
+    },
+    description="Add up to 500 items to the RAG system in one request, embedded in a single batch.",
+)
+@api_view(["PUT"])
+# @permission_classes([IsAuthenticated])
+def bulk_add_items_view(request):
+    """
+    Add several items to the RAG system at once.
+
+    Summaries are embedded in one batched forward pass and written with a
+    single Milvus insert, instead of one request per item via add-item.
+    """
+    s = BulkItemDataSerializer(data=request.data)
+    if not s.is_valid():
+        return Response(
+            {"error": "Invalid data", "details": s.errors},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    items = s.validated_data["items"]
+    try:
+        res = utils.insert_items(items)
+        for user_id in {item["user_id"] for item in items}:
+            _bump_query_generation(user_id)
         return Response(res, status=status.HTTP_200_OK)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 @extend_schema(
+    methods=["GET"],
+    parameters=[QueryRequestSerializer],
+    responses={
+        200: QueryResponseSerializer,
+        304: OpenApiResponse(description="Results unchanged since the ETag in If-None-Match"),
+        400: ErrorResponseSerializer,
+        500: ErrorResponseSerializer,
+    },
+    description="Query items using semantic search, with the filters as query parameters. Supports conditional requests via ETag/If-None-Match.",
+)
+@extend_schema(
+    methods=["POST"],
     request=QueryRequestSerializer,
     responses={
-        200: {
-            "type": "object",
-            "properties": {
-                "query": {"type": "string", "example": "mental healthcare"},
-                "filter": {
-                    "type": "string",
-                    "example": "user_id == 'strongtherapy' && timestamp >= 1600000000 && platform == 'tiktok'",
-                },
-                "results": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "content_id": {"type": "string"},
-                            "content_url": {"type": "string"},
-                            "summary": {"type": "string"},
-                            "platform": {"type": "string"},
-                            "timestamp": {"type": "integer", "nullable": True},
-                            "score": {"type": "number", "format": "float"},
-                        },
-                    },
-                },
-            },
-        },
-        400: {
-            "type": "object",
-            "properties": {
-                "error": {"type": "string"},
-                "details": {"type": "object"},
-            },
-        },
-        500: {
-            "type": "object",
-            "properties": {"error": {"type": "string"}},
-        },
+        200: QueryResponseSerializer,
+        400: ErrorResponseSerializer,
+        500: ErrorResponseSerializer,
     },
     examples=[QUERY_ITEMS_EXAMPLE],
     description="Query items using semantic search with optional filters (timestamp, platform).",
 )
-@api_view(["POST"])
+@api_view(["GET", "POST"])
 # @permission_classes([IsAuthenticated])
 def query_items_view(request):
     """
@@ -140,16 +188,47 @@ def query_items_view(request):
     - from_timestamp (optional): Filter results after this timestamp
     - platform (optional): Filter by platform
 
-    Note: timestamp field in results may be None if not set when item was added.
+    Note: items added without a timestamp carry the time they were added.
+
+    GET takes the same fields as query parameters. GET responses carry an
+    ETag; resending it in If-None-Match returns 304 while the user's index
+    is unchanged, for at most the cache TTL. 304 is only defined for
+    GET/HEAD, so POST responses are never conditional.
     """
-    s = QueryRequestSerializer(data=request.data)
+    conditional = request.method == "GET"
+    s = QueryRequestSerializer(data=request.query_params if conditional else request.data)
     if not s.is_valid():
         return Response(
             {"error": "Invalid data", "details": s.errors},
             status=status.HTTP_400_BAD_REQUEST,
         )
     try:
-        res = utils.query_items(**s.validated_data)
-        return Response(res, status=status.HTTP_200_OK)
+        # Repeated queries skip the embedding and the Milvus search for a short while
+        key = _query_cache_key(s.validated_data)
+
+        # The key names the query and the index generation. Searches use bounded
+        # consistency, so a fresh insert may be missing from results computed
+        # under the new generation; the time bucket makes the validator expire
+        # with the cached entry instead of pinning those results until the
+        # user's next insert
+        headers = {}
+        if conditional:
+            bucket = int(time.time() // QUERY_CACHE_TTL_SECONDS)
+            etag = quote_etag(f"{key.split(':', 1)[1]}:{bucket}")
+            headers = {"ETag": etag, "Cache-Control": f"private, max-age={QUERY_CACHE_TTL_SECONDS}"}
+            if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        try:
+            res = cache.get(key)
+        except Exception:
+            res = None
+        if res is None:
+            res = utils.query_items(**s.validated_data)
+            try:
+                cache.set(key, res, timeout=QUERY_CACHE_TTL_SECONDS)
+            except Exception:
+                pass  # Caching is best-effort
+        return Response(res, status=status.HTTP_200_OK, headers=headers)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
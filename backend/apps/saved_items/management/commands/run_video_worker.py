@@ -6,13 +6,51 @@ This command starts a RabbitMQ consumer that processes video content jobs.
 import signal
 import sys
 import json
+import logging
+import logging.handlers
+import queue
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import pika
 import requests
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from supabase import create_client
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False  # Will fall back to the stdlib json module
+
+from apps.agents.rag.utils import get_model
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_SETTINGS = ('SUPABASE_URL', 'SUPABASE_KEY')
+REQUIRED_SERVICE_URLS = ('RAG_API_URL',)
+
+# Retry waits are drawn uniformly from [0, min(cap, 2 ** (attempt + 1))]
+RETRY_MAX_WAIT = 30
+# Consecutive summarizer failures that open the circuit, and how long it stays open
+BREAKER_FAIL_MAX = 10
+BREAKER_RESET_TIMEOUT = 60
+# Pause before requeueing a job while the circuit is open, to slow redelivery
+BREAKER_REQUEUE_DELAY = 1.0
+
+
+def _json_bytes(payload) -> bytes:
+    """Serialize a request payload to JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+
+class SummarizerUnavailable(Exception):
+    """The summarizer circuit is open; the job should be requeued for later"""
+
 
 class Command(BaseCommand):
     """Management command to run the video processing worker"""
@@ -24,6 +62,13 @@ class Command(BaseCommand):
         self.connection = None
         self.channel = None
         self.should_stop = False
+        self.executor = None
+        self._local = threading.local()
+        self._breaker_lock = threading.Lock()
+        self._breaker_failures = 0
+        self._breaker_open_until = 0.0
+        self.embedder = None
+        self._log_listener = None
     
     def add_arguments(self, parser):
         parser.add_argument(
@@ -53,8 +98,21 @@ class Command(BaseCommand):
         parser.add_argument(
             '--prefetch-count',
             type=int,
-            default=1,
-            help='Number of messages to prefetch (default: 1)'
+            default=50,
+            help='Number of messages to prefetch (default: 50)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Number of jobs processed concurrently (default: 8)'
+        )
+        parser.add_argument(
+            '--log-level',
+            type=str,
+            default='INFO',
+            choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+            help='Job log level; DEBUG adds per-step progress lines (default: INFO)'
         )
         parser.add_argument(
             '--max-retries',
@@ -75,7 +133,9 @@ class Command(BaseCommand):
         self.rabbitmq_port = settings.RABBITMQ_PORT or options['rabbitmq_port']
         self.heartbeat = options['heartbeat']
         self.prefetch_count = options['prefetch_count']
+        self.workers = max(1, options['workers'])
         self.max_retries = options['max_retries']
+        self._setup_logging(options['log_level'])
         
         # Validate required settings
         if not self._validate_settings():
@@ -87,21 +147,45 @@ class Command(BaseCommand):
             settings.SUPABASE_KEY
         )
         
+        # Embed summaries here so the RAG endpoint only does the Milvus insert;
+        # without the model the RAG service embeds them as before
+        self.embedder = get_model()
+        if self.embedder is None:
+            self.stdout.write(
+                self.style.WARNING("⚠️  Embedding model unavailable, RAG will embed summaries")
+            )
+        
+        # Jobs are network-bound (Supabase, summarizer, RAG), so threads overlap them
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="video-job"
+        )
+        
         # Start the worker
         self._start_worker()
     
+    def _setup_logging(self, level: str):
+        """
+        Route job logs through a queue drained by a background thread.
+        
+        Pool threads only enqueue records, so a slow or blocking stdout
+        never stalls job processing.
+        """
+        log_queue = queue.Queue(-1)
+        handler = logging.StreamHandler(self.stdout)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        self._log_listener = logging.handlers.QueueListener(log_queue, handler)
+        self._log_listener.start()
+        
+        logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+        logger.setLevel(level)
+        logger.propagate = False
+    
     def _validate_settings(self):
         """Validate required Django settings"""
-        required_settings = [
-            'SUPABASE_URL',
-            'SUPABASE_KEY',
+        missing_settings = [
+            name for name in REQUIRED_SETTINGS if not getattr(settings, name, None)
         ]
         
-        missing_settings = []
-        for setting in required_settings:
-            if not hasattr(settings, setting) or not getattr(settings, setting):
-                missing_settings.append(setting)
-        
         if missing_settings:
             self.stdout.write(
                 self.style.ERROR(
@@ -111,19 +195,14 @@ class Command(BaseCommand):
             return False
         
         # Check SERVICE_URLS
-        if not hasattr(settings, 'SERVICE_URLS') or not settings.SERVICE_URLS:
+        service_urls = getattr(settings, 'SERVICE_URLS', None)
+        if not service_urls:
             self.stdout.write(
                 self.style.ERROR("❌ Missing SERVICE_URLS setting")
             )
             return False
         
-        service_urls = settings.SERVICE_URLS
-        required_urls = ['RAG_API_URL']
-        missing_urls = []
-        
-        for url_key in required_urls:
-            if url_key not in service_urls or not service_urls[url_key]:
-                missing_urls.append(url_key)
+        missing_urls = [key for key in REQUIRED_SERVICE_URLS if not service_urls.get(key)]
         
         if missing_urls:
             self.stdout.write(
@@ -162,8 +241,11 @@ class Command(BaseCommand):
             # Declare queue (ensure it exists)
             self.channel.queue_declare(queue=self.queue_name, durable=True)
             
-            # Set QoS
-            self.channel.basic_qos(prefetch_count=self.prefetch_count)
+            # Set QoS per consumer
+            self.channel.basic_qos(
+                prefetch_count=self.prefetch_count,
+                global_qos=False
+            )
             
             # Set up message callback
             self.channel.basic_consume(
@@ -177,6 +259,7 @@ class Command(BaseCommand):
                     f"📋 Queue: {self.queue_name}\n"
                     f"🔌 Host: {self.rabbitmq_host}:{self.rabbitmq_port}\n"
                     f"⚡ Prefetch: {self.prefetch_count}\n"
+                    f"🧵 Workers: {self.workers}\n"
                     f"🔄 Max retries: {self.max_retries}\n"
                     f"👀 Waiting for video processing jobs... (Press Ctrl+C to stop)"
                 )
@@ -199,101 +282,142 @@ class Command(BaseCommand):
             self._cleanup()
     
     def _process_message(self, ch, method, properties, body):
-        """Process a single message from the queue"""
+        """Validate a message and hand the job to the thread pool"""
         try:
             # Parse job data
-            job = json.loads(body.decode())
+            # Both parsers take the raw bytes; orjson skips the text decode
+            job = orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
             user_id = job.get('user_id')
             content_id = job.get('content_id')
             
             if not user_id or not content_id:
-                self.stdout.write(
-                    self.style.ERROR(f"❌ Invalid job data: {job}")
-                )
+                logger.error(f"❌ Invalid job data: {job}")
                 ch.basic_nack(method.delivery_tag, requeue=False)
                 return
-            
-            self.stdout.write(
-                f"🚀 Processing content {content_id} for user {user_id}"
-            )
-            
-            # Process the job
-            success = self._process_video_job(user_id, content_id)
-            
-            if success:
-                # Acknowledge message
-                ch.basic_ack(method.delivery_tag)
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"✅ Successfully processed content {content_id}"
-                    )
-                )
-            else:
-                # Reject message (don't requeue to avoid infinite loops)
-                ch.basic_nack(method.delivery_tag, requeue=False)
-                self.stdout.write(
-                    self.style.ERROR(
-                        f"❌ Failed to process content {content_id}"
-                    )
-                )
                 
         except json.JSONDecodeError as e:
-            self.stdout.write(
-                self.style.ERROR(f"❌ Invalid JSON in message: {e}")
-            )
+            logger.error(f"❌ Invalid JSON in message: {e}")
             ch.basic_nack(method.delivery_tag, requeue=False)
+            return
         except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f"❌ Error processing message: {e}")
-            )
+            logger.error(f"❌ Error processing message: {e}")
             ch.basic_nack(method.delivery_tag, requeue=False)
+            return
+        
+        logger.debug(f"🚀 Processing content {content_id} for user {user_id}")
+        future = self.executor.submit(self._run_job, user_id, content_id)
+        future.add_done_callback(
+            lambda f, tag=method.delivery_tag: self._on_job_done(tag, f)
+        )
+    
+    def _run_job(self, user_id, content_id):
+        """Process one job on a pool thread and report its outcome"""
+        success = self._process_video_job(user_id, content_id)
+        if success is None:
+            return None
+        if success:
+            logger.info(f"✅ Successfully processed content {content_id}")
+        else:
+            logger.error(f"❌ Failed to process content {content_id}")
+        return success
     
-    def _process_video_job(self, user_id: int, content_id: int) -> bool:
-        """Process video: fetch URL → summarize → send to RAG"""
+    def _on_job_done(self, delivery_tag, future):
+        """Schedule settling a finished job on the connection's thread"""
+        success = not future.cancelled() and future.exception() is None and future.result()
+        # pika is not thread-safe: acks must run on the connection's thread
+        try:
+            self.connection.add_callback_threadsafe(
+                lambda: self._settle_job(delivery_tag, success)
+            )
+        except Exception:
+            pass  # Connection closed; the unacked job is redelivered
+    
+    def _settle_job(self, delivery_tag, success):
+        """
+        Ack or nack one processed job as soon as it finishes.
+        
+        Each job is acked on its own, so a redelivery after a crash only
+        repeats jobs that had not finished. Failures are rejected without
+        requeue, to avoid infinite loops; jobs turned away by the open
+        circuit breaker (outcome None) are requeued so the broker redelivers
+        them later.
+        """
+        if success:
+            self.channel.basic_ack(delivery_tag)
+        elif success is None:
+            self.channel.basic_nack(delivery_tag, requeue=True)
+        else:
+            self.channel.basic_nack(delivery_tag, requeue=False)
+    
+    def _session(self) -> requests.Session:
+        """Per-thread HTTP session so each pool thread reuses its keep-alive connections"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+    
+    def _process_video_job(self, user_id: int, content_id: int):
+        """
+        Process video: fetch URL → summarize → send to RAG
+        
+        Returns True on success, False on failure and None when the job
+        should be requeued because the summarizer is unavailable.
+        """
         try:
             # Step 1: Fetch media URL from Supabase
-            self.stdout.write(f"📹 Fetching media URL for content {content_id}")
+            logger.debug(f"📹 Fetching media URL for content {content_id}")
             resp = (
                 self.supabase.table("content_crawling")
                 .select("mediaUrls")
                 .eq("id", content_id)
+                .maybe_single()
                 .execute()
             )
             
-            if not resp.data:
-                self.stdout.write("❌ No media URL found in Supabase")
+            # maybe_single() returns no response at all when the row is missing
+            if resp is None or not resp.data:
+                logger.warning("❌ No media URL found in Supabase")
                 return False
             
-            media_url = resp.data[0]["mediaUrls"]
-            self.stdout.write(f"📹 Media URL retrieved: {media_url[:60]}...")
+            media_url = resp.data["mediaUrls"]
+            logger.debug(f"📹 Media URL retrieved: {media_url[:60]}...")
             
             # Step 2: Call video summarizer with retry logic
             summary = self._get_video_summary(media_url)
             if not summary:
                 return False
             
-            self.stdout.write(f"📝 Summary generated: {summary[:100]}...")
+            logger.debug(f"📝 Summary generated: {summary[:100]}...")
             
             # Step 3: Send to RAG system
-            return self._send_to_rag(user_id, content_id, summary)
+            return self._send_to_rag(user_id, content_id, media_url, summary)
             
+        except SummarizerUnavailable:
+            logger.warning(f"⏸️  Summarizer circuit open, requeueing content {content_id}")
+            time.sleep(BREAKER_REQUEUE_DELAY)
+            return None
         except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f"❌ Unexpected error in _process_video_job: {e}")
-            )
+            logger.error(f"❌ Unexpected error in _process_video_job: {e}")
             return False
     
     def _get_video_summary(self, media_url: str) -> str:
-        """Get video summary with retry logic"""
+        """Get video summary with jittered retries behind a circuit breaker"""
+        if not self._breaker_allows():
+            raise SummarizerUnavailable()
+        
+        summary = self._call_video_summarizer(media_url)
+        self._record_summarizer_result(bool(summary))
+        return summary
+    
+    def _call_video_summarizer(self, media_url: str) -> str:
+        """Call the video summarizer, retrying 503s and request errors"""
         video_url = settings.SERVICE_URLS["VIDEO_UNDERSTANDING_API_URL"]
         
         for attempt in range(self.max_retries):
             try:
-                self.stdout.write(
-                    f"🔍 Calling video summarizer (attempt {attempt + 1}/{self.max_retries})"
-                )
+                logger.debug(f"🔍 Calling video summarizer (attempt {attempt + 1}/{self.max_retries})")
                 
-                response = requests.post(
+                response = self._session().post(
                     video_url,
                     json={"video_url": media_url},
                     timeout=120
@@ -302,16 +426,12 @@ class Command(BaseCommand):
                 if response.status_code == 503:
                     # API overloaded
                     if attempt < self.max_retries - 1:
-                        wait_time = 2 ** (attempt + 1)
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"⚠️  API overloaded, retrying in {wait_time}s..."
-                            )
-                        )
+                        wait_time = self._retry_wait(attempt)
+                        logger.warning(f"⚠️  API overloaded, retrying in {wait_time:.1f}s...")
                         time.sleep(wait_time)
                         continue
                     else:
-                        self.stdout.write("❌ API still overloaded after retries")
+                        logger.warning("❌ API still overloaded after retries")
                         return ""
                 
                 response.raise_for_status()
@@ -322,21 +442,51 @@ class Command(BaseCommand):
                     return summary
                     
             except requests.exceptions.RequestException as e:
-                self.stdout.write(f"❌ Request error: {e}")
+                logger.warning(f"❌ Request error: {e}")
                 if attempt < self.max_retries - 1:
-                    wait_time = 2 ** (attempt + 1)
-                    self.stdout.write(f"🔄 Retrying in {wait_time}s...")
+                    wait_time = self._retry_wait(attempt)
+                    logger.info(f"🔄 Retrying in {wait_time:.1f}s...")
                     time.sleep(wait_time)
                     continue
                 return ""
         
         return ""
     
+    @staticmethod
+    def _retry_wait(attempt: int) -> float:
+        """Full-jitter exponential backoff, so workers don't retry in lockstep"""
+        return random.uniform(0, min(RETRY_MAX_WAIT, 2 ** (attempt + 1)))
+    
+    def _breaker_allows(self) -> bool:
+        """
+        Whether a summarizer call may be attempted.
+        
+        After BREAKER_FAIL_MAX consecutive failures the circuit opens for
+        BREAKER_RESET_TIMEOUT seconds; once that passes, calls are let
+        through again and the next failure reopens it straight away.
+        """
+        with self._breaker_lock:
+            return time.monotonic() >= self._breaker_open_until
+    
+    def _record_summarizer_result(self, ok: bool):
+        """Update the circuit breaker with the outcome of a summarizer call"""
+        with self._breaker_lock:
+            if ok:
+                self._breaker_failures = 0
+                return
+            self._breaker_failures += 1
+            if self._breaker_failures >= BREAKER_FAIL_MAX:
+                self._breaker_open_until = time.monotonic() + BREAKER_RESET_TIMEOUT
+                logger.warning(
+                    f"🔌 Summarizer failed {self._breaker_failures} times in a row, "
+                    f"pausing calls for {BREAKER_RESET_TIMEOUT}s"
+                )
+    
     def _send_to_rag(self, user_id: int, content_id: int, content_url: str, summary: str) -> bool:
         """Send processed content to RAG system"""
         try:
             rag_url = settings.SERVICE_URLS["RAG_API_URL"]
-            self.stdout.write(f"🔍 Sending to RAG system: {rag_url}")
+            logger.debug(f"🔍 Sending to RAG system: {rag_url}")
             
             payload = {
                 "content_id": str(content_id),
@@ -346,37 +496,37 @@ class Command(BaseCommand):
                 "platform": "tiktok",
                 "timestamp": int(time.time()),
             }
+            if self.embedder is not None:
+                embedding = self.embedder.encode(summary, normalize_embeddings=True)
+                payload["embedding"] = embedding.astype("float32").tolist()
             
-            response = requests.put(
+            response = self._session().put(
                 rag_url,
-                json=payload,
+                data=_json_bytes(payload),
+                headers={"Content-Type": "application/json"},
                 timeout=30,
             )
             
             if response.status_code >= 400:
-                self.stdout.write(
-                    self.style.ERROR(
-                        f"❌ RAG API error {response.status_code}: {response.text}"
-                    )
-                )
+                logger.error(f"❌ RAG API error {response.status_code}: {response.text}")
                 return False
             
-            self.stdout.write("✅ Successfully sent to RAG system")
+            logger.debug("✅ Successfully sent to RAG system")
             return True
             
         except requests.exceptions.RequestException as e:
-            self.stdout.write(
-                self.style.ERROR(f"❌ Error calling RAG API: {e}")
-            )
+            logger.error(f"❌ Error calling RAG API: {e}")
             return False
         except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f"❌ Unexpected error in _send_to_rag: {e}")
-            )
+            logger.error(f"❌ Unexpected error in _send_to_rag: {e}")
             return False
     
     def _cleanup(self):
         """Clean up connections"""
+        if self.executor:
+            # Jobs that are not yet acked are redelivered once the channel closes
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        
         if self.channel:
             try:
                 if not self.channel.is_closed:
@@ -391,4 +541,8 @@ class Command(BaseCommand):
             except:
                 pass
         
-        self.stdout.write("👋 Video processing worker stopped")
\ No newline at end of file
+        self.stdout.write("👋 Video processing worker stopped")
+        
+        if self._log_listener:
+            # Flushes any records still queued
+            self._log_listener.stop()
\ No newline at end of file
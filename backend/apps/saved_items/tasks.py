@@ -1,8 +1,17 @@
+import json
 import requests
 import logging
+import threading
 import time
 from celery import shared_task
 from django.conf import settings
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False  # Will fall back to the stdlib json module
+
 from .models import UserSavedItem
 
 # Import model FeedItem để lấy dữ liệu AI Summary
@@ -10,6 +19,24 @@ from apps.feed.models import FeedItem
 
 logger = logging.getLogger(__name__)
 
+_local = threading.local()
+
+AT_URI_PREFIX = "at://"
+BSKY_PROFILE_URL = "https://bsky.app/profile/"
+
+
+def _http_session() -> requests.Session:
+    """
+    Return this thread's requests session.
+
+    Reusing it across tasks keeps the connection to the RAG API alive
+    instead of paying a TCP/TLS handshake per task.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
 
 def convert_at_uri_to_url(at_uri: str) -> str:
     """
@@ -17,27 +44,18 @@ def convert_at_uri_to_url(at_uri: str) -> str:
     Example: at://did:plc:vcpqgt4bfahgxralkpjzpwqx/app.bsky.feed.post/3m6glpnf2y22m
     -> https://bsky.app/profile/did:plc:vcpqgt4bfahgxralkpjzpwqx/post/3m6glpnf2y22m
     """
-    if not at_uri or not at_uri.startswith("at://"):
-        return at_uri
-    
-    try:
-        # Remove 'at://' prefix
-        path = at_uri[5:]
-        
-        # Split by '/'
-        parts = path.split('/')
-        
-        if len(parts) >= 3:
-            did = parts[0]  # did:plc:xxx
-            rkey = parts[2]  # post id
-            
-            return f"https://bsky.app/profile/{did}/post/{rkey}"
-        
-        return at_uri
-    except Exception as e:
-        logger.warning(f"Failed to convert AT URI to URL: {at_uri} - {e}")
+    if not at_uri or not at_uri.startswith(AT_URI_PREFIX):
         return at_uri
 
+    # at://<did>/<collection>/<rkey>; partition never raises on malformed input
+    did, _, tail = at_uri[len(AT_URI_PREFIX):].partition("/")
+    _, _, tail = tail.partition("/")
+    rkey = tail.partition("/")[0]
+
+    if did and rkey:
+        return f"{BSKY_PROFILE_URL}{did}/post/{rkey}"
+    return at_uri
+
 
 @shared_task(name="push_to_rag_task")
 def push_to_rag_task(saved_item_id):
@@ -47,24 +65,43 @@ def push_to_rag_task(saved_item_id):
     """
     try:
         # 1. Lấy thông tin UserSavedItem và SocialPost liên quan
-        saved_item = UserSavedItem.objects.select_related("post").get(id=saved_item_id)
+        # Một query JOIN, chỉ lấy các cột cần cho payload
+        saved_item = (
+            UserSavedItem.objects.select_related("post")
+            .only(
+                "id",
+                "user_id",
+                "tags",
+                "post__id",
+                "post__platform",
+                "post__platform_id",
+                "post__media_url",
+                "post__content",
+            )
+            .get(id=saved_item_id)
+        )
         post = saved_item.post
-        user = saved_item.user
 
         logger.info(
-            f"🚀 Processing RAG for Saved Item {saved_item.id} (User {user.id})"
+            f"🚀 Processing RAG for Saved Item {saved_item.id} (User {saved_item.user_id})"
         )
 
         # 2. Tìm dữ liệu AI Analysis (FeedItem)
         # Một bài post có thể nằm trong nhiều feed, ta lấy bản ghi có điểm cao nhất (chất lượng nhất)
-        feed_item = FeedItem.objects.filter(post=post).order_by("-ai_score").first()
+        # Chỉ đọc cột ai_summary, dùng index (post, -ai_score)
+        ai_summary = (
+            FeedItem.objects.filter(post_id=saved_item.post_id)
+            .order_by("-ai_score")
+            .values_list("ai_summary", flat=True)
+            .first()
+        )
 
         summary_text = ""
 
         # --- LOGIC HỢP NHẤT (UNIFIED LOGIC) ---
-        if feed_item and feed_item.ai_summary:
+        if ai_summary:
             # Trường hợp lý tưởng: Cả Video và Post đều đã có AI tóm tắt
-            summary_text = feed_item.ai_summary
+            summary_text = ai_summary
             logger.info(f"✅ Using AI Summary (Source: {post.platform})")
         elif post.content:
             # Fallback: Nếu AI bị lỗi hoặc chưa chạy kịp, dùng nội dung gốc (Caption/Text)
@@ -81,13 +118,13 @@ def push_to_rag_task(saved_item_id):
         # 3. Chuẩn bị Payload gửi sang RAG Service
         # Convert AT Protocol URI to public URL for Bluesky posts
         content_url = str(post.platform_id)
-        if post.platform == "bluesky" and content_url.startswith("at://"):
+        if post.platform == "bluesky" and content_url.startswith(AT_URI_PREFIX):
             content_url = convert_at_uri_to_url(content_url)
         
         rag_payload = {
             "content_id": str(post.id),  # VARCHAR(64) - Dùng ID gốc (URL/URI)
             "content_url": content_url,  # VARCHAR(256) - Public URL
-            "user_id": str(user.id),  # VARCHAR(64)
+            "user_id": str(saved_item.user_id),  # VARCHAR(64)
             "platform": post.platform,  # VARCHAR(20) ('tiktok'/'bluesky')
             "summary": summary_text,  # VARCHAR(4000) - Nội dung text để embedding
             "timestamp": int(time.time()),  # INT64 - Unix Timestamp
@@ -104,12 +141,18 @@ def push_to_rag_task(saved_item_id):
 
         logger.info(f"📤 Sending to RAG: {rag_api_url}")
 
-        response = requests.put(rag_api_url, json=rag_payload, timeout=30)
+        body = orjson.dumps(rag_payload) if ORJSON_AVAILABLE else json.dumps(rag_payload).encode()
+        response = _http_session().put(
+            rag_api_url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            timeout=30,
+        )
 
         # 5. Xử lý kết quả
         if response.status_code < 400:
-            saved_item.is_rag_indexed = True
-            saved_item.save()
+            # UPDATE một cột, không qua save() và signal pre_save/post_save
+            UserSavedItem.objects.filter(pk=saved_item.pk).update(is_rag_indexed=True)
             logger.info(f"✅ Successfully indexed to RAG. ID: {post.id}")
         else:
             logger.error(f"❌ RAG API Failed: {response.status_code} - {response.text}")
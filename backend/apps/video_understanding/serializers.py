@@ -1,5 +1,11 @@
 from rest_framework import serializers
 
+from .storage import UPLOAD_KEY_PREFIX
+
+MAX_VIDEO_SIZE_BYTES = 20 * 1024 * 1024
+# summarize_video sends the file as video/mp4, so only ISO-BMFF containers
+ALLOWED_VIDEO_CONTENT_TYPES = {"video/mp4", "video/quicktime"}
+
 
 class VideoSummarizeRequestSerializer(serializers.Serializer):
     """Request serializer for video summarization"""
@@ -10,16 +16,53 @@ class VideoSummarizeRequestSerializer(serializers.Serializer):
     video_file = serializers.FileField(
         required=False, allow_null=True, help_text="Upload video file directly"
     )
+    storage_key = serializers.CharField(
+        required=False,
+        allow_null=True,
+        help_text="Key of a video uploaded to storage via the presign endpoint",
+    )
+
+    def validate_video_file(self, video_file):
+        """Reject oversized or non-MP4 uploads before anything is written to disk"""
+        if video_file is None:
+            return video_file
+        if video_file.size > MAX_VIDEO_SIZE_BYTES:
+            raise serializers.ValidationError("Video file must be less than 20MB")
+        if video_file.content_type not in ALLOWED_VIDEO_CONTENT_TYPES:
+            raise serializers.ValidationError(
+                f"Unsupported video type '{video_file.content_type}'. Upload an MP4 file."
+            )
+
+        # Sniff the container header so a spoofed content type is not trusted
+        video_file.seek(0)
+        header = video_file.read(12)
+        video_file.seek(0)
+        if header[4:8] != b"ftyp":
+            raise serializers.ValidationError("Uploaded file is not a valid MP4 video")
+        return video_file
+
+    def validate_storage_key(self, storage_key):
+        """Only accept keys issued by the presign endpoint"""
+        if storage_key and (
+            not storage_key.startswith(UPLOAD_KEY_PREFIX) or ".." in storage_key
+        ):
+            raise serializers.ValidationError("Invalid storage key.")
+        return storage_key
 
     def validate(self, attrs):
-        """Ensure at least one of video_url or video_file is provided"""
-        if not attrs.get("video_url") and not attrs.get("video_file"):
+        """Ensure exactly one of video_url, video_file or storage_key is provided"""
+        provided = [
+            field
+            for field in ("video_url", "video_file", "storage_key")
+            if attrs.get(field)
+        ]
+        if not provided:
             raise serializers.ValidationError(
-                "Either 'video_url' or 'video_file' must be provided."
+                "One of 'video_url', 'video_file' or 'storage_key' must be provided."
             )
-        if attrs.get("video_url") and attrs.get("video_file"):
+        if len(provided) > 1:
             raise serializers.ValidationError(
-                "Provide either 'video_url' or 'video_file', not both."
+                "Provide only one of 'video_url', 'video_file' or 'storage_key'."
             )
         return attrs
 
@@ -27,6 +70,16 @@ class VideoSummarizeRequestSerializer(serializers.Serializer):
 class VideoSummarizeResponseSerializer(serializers.Serializer):
     """Response serializer for video summarization"""
 
-    summary = serializers.CharField()
+    summary = serializers.CharField(allow_null=True)
     status = serializers.CharField(default="success")
+    task_id = serializers.CharField(required=False)
+    status_url = serializers.URLField(required=False)
     error = serializers.CharField(required=False, allow_null=True)
+
+
+class VideoUploadUrlResponseSerializer(serializers.Serializer):
+    """Response serializer for direct-to-storage upload URLs"""
+
+    storage_key = serializers.CharField()
+    signed_url = serializers.URLField()
+    token = serializers.CharField()
@@ -0,0 +1,114 @@
+import os
+import uuid
+import logging
+import requests
+import tempfile
+import threading
+from django.conf import settings
+from supabase import create_client
+
+logger = logging.getLogger(__name__)
+
+# Clients upload here directly; keys outside this prefix are rejected
+UPLOAD_KEY_PREFIX = "video-uploads/"
+
+DOWNLOAD_URL_TTL_SECONDS = 60
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_bucket():
+    """
+    Return the Supabase Storage bucket used for direct video uploads.
+
+    Returns:
+        The storage bucket proxy for settings.VIDEO_UPLOAD_BUCKET.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    return _client.storage.from_(settings.VIDEO_UPLOAD_BUCKET)
+
+
+def create_upload_url() -> dict:
+    """
+    Create a one-off signed upload URL so the client can send the video
+    straight to storage instead of through Django.
+
+    Returns:
+        dict: {"storage_key", "signed_url", "token"}
+    """
+    storage_key = f"{UPLOAD_KEY_PREFIX}{uuid.uuid4().hex}.mp4"
+    signed = _get_bucket().create_signed_upload_url(storage_key)
+    return {
+        "storage_key": storage_key,
+        "signed_url": signed["signed_url"],
+        "token": signed["token"],
+    }
+
+
+def upload_video(local_path: str) -> str:
+    """
+    Upload a video staged on this host so a worker on any host can fetch it.
+
+    Args:
+        local_path (str): Path to the local video file.
+
+    Returns:
+        str: Storage key to pass to summarize_stored_video_task.
+    """
+    storage_key = f"{UPLOAD_KEY_PREFIX}{uuid.uuid4().hex}.mp4"
+    _get_bucket().upload(storage_key, local_path, {"content-type": "video/mp4"})
+    return storage_key
+
+
+def download_to_tempfile(storage_key: str, max_bytes: int) -> str:
+    """
+    Stream an uploaded video into a local temp file for Gemini.
+
+    The signed upload URL does not limit the object size, so the size is
+    checked here: from Content-Length up front, and again while streaming.
+
+    Args:
+        storage_key (str): Key returned by create_upload_url.
+        max_bytes (int): Largest accepted video size.
+
+    Returns:
+        str: Path to the temp file; the caller is responsible for removing it.
+
+    Raises:
+        ValueError: If the object is larger than max_bytes.
+    """
+    signed = _get_bucket().create_signed_url(storage_key, DOWNLOAD_URL_TTL_SECONDS)
+    url = signed.get("signedURL") or signed.get("signedUrl")
+
+    with requests.get(url, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        if int(response.headers.get("content-length", 0)) > max_bytes:
+            raise ValueError(f"Uploaded video exceeds {max_bytes} bytes")
+
+        received = 0
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp:
+            try:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    received += len(chunk)
+                    if received > max_bytes:
+                        raise ValueError(f"Uploaded video exceeds {max_bytes} bytes")
+                    tmp.write(chunk)
+            except Exception:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+            return tmp.name
+
+
+def delete_upload(storage_key: str) -> None:
+    """Remove an uploaded video once it has been summarized."""
+    try:
+        _get_bucket().remove([storage_key])
+    except Exception as e:
+        logger.warning(f"Failed to delete uploaded video {storage_key}: {e}")
@@ -0,0 +1,93 @@
+import os
+import logging
+from celery import shared_task
+
+from .video_understanding import summarize_video
+from .serializers import MAX_VIDEO_SIZE_BYTES
+from .storage import delete_upload, download_to_tempfile
+
+logger = logging.getLogger(__name__)
+
+VIDEO_ANALYSIS_QUEUE = "video_analysis"
+
+
+@shared_task(name="summarize_video_task")
+def summarize_video_task(video_path: str, max_retries: int = 3) -> dict:
+    """
+    Summarize a staged video file off the request thread.
+
+    The temp file is owned by the task once enqueued and is removed when the
+    task finishes, whatever the outcome.
+
+    Args:
+        video_path (str): Path to the staged video file (must be < 20MB),
+            readable from the worker's host. Callers on another host should
+            upload to storage and use summarize_stored_video_task.
+        max_retries (int): Maximum number of Gemini retry attempts (default: 3)
+
+    Returns:
+        dict: {"status", "summary", "error"} plus "overloaded" when the
+        failure was a transient Gemini overload.
+    """
+    try:
+        summary_result = summarize_video(video_path, max_retries=max_retries)
+
+        if summary_result.startswith("Error") or summary_result.startswith(
+            "No valid response"
+        ):
+            logger.warning(f"Video summarization failed: {summary_result}")
+            return {
+                "status": "error",
+                "summary": None,
+                "error": summary_result,
+                "overloaded": "overloaded" in summary_result.lower()
+                or "503" in summary_result,
+            }
+
+        return {"status": "success", "summary": summary_result, "error": None}
+
+    except Exception as e:
+        logger.exception(f"Unexpected error in summarize_video_task: {e}")
+        return {
+            "status": "error",
+            "summary": None,
+            "error": f"Unexpected error: {str(e)}",
+            "overloaded": False,
+        }
+
+    finally:
+        if video_path and os.path.exists(video_path):
+            try:
+                os.unlink(video_path)
+            except Exception:
+                pass
+
+
+@shared_task(name="summarize_stored_video_task")
+def summarize_stored_video_task(storage_key: str, max_retries: int = 3) -> dict:
+    """
+    Summarize a video the client uploaded directly to storage.
+
+    Args:
+        storage_key (str): Storage key returned by the presign endpoint.
+        max_retries (int): Maximum number of Gemini retry attempts (default: 3)
+
+    Returns:
+        dict: Same shape as summarize_video_task.
+    """
+    try:
+        video_path = download_to_tempfile(storage_key, max_bytes=MAX_VIDEO_SIZE_BYTES)
+    except Exception as e:
+        logger.warning(f"Failed to download uploaded video {storage_key}: {e}")
+        return {
+            "status": "error",
+            "summary": None,
+            "error": f"Failed to download video: {str(e)}",
+            "overloaded": False,
+        }
+
+    try:
+        # Runs inline in this worker; the temp file is removed by the task body
+        return summarize_video_task(video_path, max_retries=max_retries)
+    finally:
+        delete_upload(storage_key)
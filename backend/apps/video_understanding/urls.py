@@ -1,6 +1,20 @@
 from django.urls import path
-from .views import summarize_video_view
+from .views import (
+    create_video_upload_url_view,
+    summarize_video_view,
+    video_summary_status_view,
+)
 
 urlpatterns = [
     path("summarize", summarize_video_view, name="video_summarize"),
+    path(
+        "summarize/presign",
+        create_video_upload_url_view,
+        name="video_summarize_presign",
+    ),
+    path(
+        "summarize/<str:task_id>",
+        video_summary_status_view,
+        name="video_summarize_status",
+    ),
 ]
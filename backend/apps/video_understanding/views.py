@@ -1,17 +1,58 @@
 import os
 import tempfile
 import requests
-from rest_framework.decorators import api_view, parser_classes
+from celery.result import AsyncResult
+from django.core.cache import cache
+from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiExample
 
 from .serializers import (
+    MAX_VIDEO_SIZE_BYTES,
     VideoSummarizeRequestSerializer,
     VideoSummarizeResponseSerializer,
+    VideoUploadUrlResponseSerializer,
 )
-from .video_understanding import summarize_video
+from .storage import create_upload_url, delete_upload, upload_video
+from .tasks import summarize_stored_video_task
+
+
+TASK_OWNER_KEY_PREFIX = "video_summary_owner"
+# Matches Celery's default result expiry; the result is gone after that anyway
+TASK_OWNER_TTL_SECONDS = 24 * 60 * 60
+
+
+def _remember_task_owner(task_id: str, user_id: int) -> None:
+    """Record who enqueued a summary task so only they can poll it."""
+    cache.set(f"{TASK_OWNER_KEY_PREFIX}:{task_id}", user_id, timeout=TASK_OWNER_TTL_SECONDS)
+
+
+def _task_owner(task_id: str):
+    """User id that enqueued a summary task; None for unknown or foreign task ids."""
+    try:
+        return cache.get(f"{TASK_OWNER_KEY_PREFIX}:{task_id}")
+    except Exception:
+        return None
+
+
+def _pending_response(request, task):
+    """Build the 202 response pointing at the status endpoint for task."""
+    _remember_task_owner(task.id, request.user.id)
+    return Response(
+        {
+            "status": "pending",
+            "task_id": task.id,
+            "status_url": request.build_absolute_uri(
+                f"{request.path.rstrip('/')}/{task.id}"
+            ),
+            "summary": None,
+            "error": None,
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
 
 
 SUMMARIZE_REQUEST_EXAMPLE = OpenApiExample(
@@ -26,25 +67,29 @@ SUMMARIZE_REQUEST_EXAMPLE = OpenApiExample(
 @extend_schema(
     request=VideoSummarizeRequestSerializer,
     responses={
-        200: VideoSummarizeResponseSerializer,
+        202: VideoSummarizeResponseSerializer,
         400: VideoSummarizeResponseSerializer,
-        503: VideoSummarizeResponseSerializer,
         500: VideoSummarizeResponseSerializer,
     },
     examples=[SUMMARIZE_REQUEST_EXAMPLE],
-    description="Summarize video content using Gemini AI. Provide either a video URL or upload a video file (max 20MB).",
+    description="Queue a Gemini AI video summary. Provide a video URL, upload a video file (max 20MB), or pass the storage_key of a video uploaded via the presign endpoint. Poll the returned status_url for the result.",
 )
 @api_view(["POST"])
+@permission_classes([IsAuthenticated])
 @parser_classes([MultiPartParser, FormParser, JSONParser])
 def summarize_video_view(request):
     """
     API endpoint to summarize video content.
 
-    Accepts either:
+    Accepts one of:
     - video_url: URL to download the video from
     - video_file: Direct file upload (multipart/form-data)
+    - storage_key: Video already uploaded to storage via summarize/presign
 
-    Returns a Vietnamese summary of the video content.
+    The Gemini call runs in a Celery task on the video_analysis queue;
+    responds 202 with a task_id to poll via video_summarize_status.
+    Uploaded and downloaded videos are handed to the worker through the
+    storage bucket, since it may run on a different host.
     """
     serializer = VideoSummarizeRequestSerializer(data=request.data)
 
@@ -58,22 +103,18 @@ def summarize_video_view(request):
     temp_video_path = None
 
     try:
+        # Video already in storage: no bytes pass through this request
+        if validated_data.get("storage_key"):
+            task = summarize_stored_video_task.delay(
+                validated_data["storage_key"], max_retries=3
+            )
+            return _pending_response(request, task)
+
         # Handle video_file upload
         if validated_data.get("video_file"):
             video_file = validated_data["video_file"]
 
-            # Check file size (20MB limit)
-            if video_file.size > 20 * 1024 * 1024:
-                return Response(
-                    {
-                        "status": "error",
-                        "error": "Video file must be less than 20MB",
-                        "summary": None,
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            # Save to temp file
+            # Size and type were checked by the serializer; save to temp file
             with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp:
                 for chunk in video_file.chunks():
                     tmp.write(chunk)
@@ -89,7 +130,7 @@ def summarize_video_view(request):
 
                 # Check content length
                 content_length = int(response.headers.get("content-length", 0))
-                if content_length > 20 * 1024 * 1024:
+                if content_length > MAX_VIDEO_SIZE_BYTES:
                     return Response(
                         {
                             "status": "error",
@@ -115,28 +156,15 @@ def summarize_video_view(request):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        # Call summarization function with retry logic (3 attempts by default)
-        summary_result = summarize_video(temp_video_path, max_retries=3)
+        # The worker downloads the video from storage and deletes it when done
+        storage_key = upload_video(temp_video_path)
+        try:
+            task = summarize_stored_video_task.delay(storage_key, max_retries=3)
+        except Exception:
+            delete_upload(storage_key)
+            raise
 
-        # Check if result is an error message
-        if summary_result.startswith("Error") or summary_result.startswith(
-            "No valid response"
-        ):
-            # Check if it's an overload error - return 503 instead of 500
-            if "overloaded" in summary_result.lower() or "503" in summary_result:
-                return Response(
-                    {"status": "error", "error": summary_result, "summary": None},
-                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
-                )
-            return Response(
-                {"status": "error", "error": summary_result, "summary": None},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
-        return Response(
-            {"status": "success", "summary": summary_result, "error": None},
-            status=status.HTTP_200_OK,
-        )
+        return _pending_response(request, task)
 
     except Exception as e:
         return Response(
@@ -149,9 +177,114 @@ def summarize_video_view(request):
         )
 
     finally:
-        # Clean up temp file
+        # The local copy is only needed until it is uploaded
         if temp_video_path and os.path.exists(temp_video_path):
             try:
                 os.unlink(temp_video_path)
             except Exception:
                 pass
+
+
+@extend_schema(
+    request=None,
+    responses={
+        201: VideoUploadUrlResponseSerializer,
+        500: VideoSummarizeResponseSerializer,
+    },
+    description="Get a signed URL to upload a video (max 20MB) straight to storage, then POST its storage_key to summarize.",
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def create_video_upload_url_view(request):
+    """
+    API endpoint to issue a direct-to-storage upload URL.
+
+    The client PUTs the video to signed_url and then calls summarize with
+    storage_key, so the upload never goes through a Django worker. The
+    20MB limit is enforced when the worker downloads the object.
+    """
+    try:
+        return Response(create_upload_url(), status=status.HTTP_201_CREATED)
+    except Exception as e:
+        return Response(
+            {
+                "status": "error",
+                "error": f"Failed to create upload URL: {str(e)}",
+                "summary": None,
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@extend_schema(
+    responses={
+        200: VideoSummarizeResponseSerializer,
+        202: VideoSummarizeResponseSerializer,
+        404: VideoSummarizeResponseSerializer,
+        503: VideoSummarizeResponseSerializer,
+        500: VideoSummarizeResponseSerializer,
+    },
+    description="Poll the result of a queued video summary by task_id.",
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def video_summary_status_view(request, task_id):
+    """
+    API endpoint to poll a queued video summary.
+
+    Returns 202 while the task is pending or running, otherwise the
+    summary (200) or the error (503 when Gemini was overloaded, else 500).
+    Only the user who queued the summary can poll it; any other task id,
+    including other Celery tasks, is a 404.
+    """
+    if _task_owner(task_id) != request.user.id:
+        return Response(
+            {"status": "error", "task_id": task_id, "error": "Task not found", "summary": None},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    result = AsyncResult(task_id)
+
+    if not result.ready():
+        return Response(
+            {"status": "pending", "task_id": task_id, "summary": None, "error": None},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    if result.failed():
+        return Response(
+            {
+                "status": "error",
+                "task_id": task_id,
+                "error": f"Unexpected error: {str(result.result)}",
+                "summary": None,
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    payload = result.result if isinstance(result.result, dict) else {}
+    if payload.get("status") != "success":
+        response_status = (
+            status.HTTP_503_SERVICE_UNAVAILABLE
+            if payload.get("overloaded")
+            else status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+        return Response(
+            {
+                "status": "error",
+                "task_id": task_id,
+                "error": payload.get("error", "Unexpected task result"),
+                "summary": None,
+            },
+            status=response_status,
+        )
+
+    return Response(
+        {
+            "status": "success",
+            "task_id": task_id,
+            "summary": payload.get("summary"),
+            "error": None,
+        },
+        status=status.HTTP_200_OK,
+    )
@@ -238,6 +238,8 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 # NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 # NEO4J_USERNAME = os.getenv("NEO4J_USERNAME", "neo4j")
 # NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+NEO4J_POOL_SIZE = int(os.getenv("NEO4J_POOL_SIZE", "50"))
+NEO4J_ACQ_TIMEOUT = float(os.getenv("NEO4J_ACQ_TIMEOUT", "60"))
 
 # Milvus Configuration
 ZILLIZ_URI = os.getenv("ZILLIZ_URI")
@@ -247,6 +249,8 @@ COLLECTION_NAME = os.getenv("COLLECTION_NAME", "user_saved_items_embeddings")
 # Supabase configuration
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
+# Bucket that clients upload videos to directly for summarization
+VIDEO_UPLOAD_BUCKET = os.environ.get("VIDEO_UPLOAD_BUCKET", "video-uploads")
 
 BSKY_USERNAME = os.environ.get("BSKY_USERNAME")
 BSKY_PASSWORD = os.environ.get("BSKY_PASSWORD")
@@ -259,6 +263,14 @@ RABBITMQ_PORT = int(os.getenv("RABBITMQ_PORT", "5672"))
 # Use Redis as broker and result backend (preferred for Render)
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
+# Shared cache (Gemini video summaries, chat session owners and history)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+}
+
 # Parse Redis URL for Celery
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
@@ -270,6 +282,28 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 CELERY_WORKER_MAX_TASKS_PER_CHILD = 50  # Prevent memory leaks
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+# Long Gemini video jobs get their own queue; prefetch 1 avoids head-of-line blocking
+# Run a worker with: celery -A reelsai worker -Q video_analysis
+CELERY_IMPORTS = ("apps.video_understanding.tasks",)
+# Tasks that take a file path (summarize_video_task, transcribe_video_task,
+# process_video_task) need it on a filesystem the worker shares with the
+# sender; API requests hand videos over through storage instead
+CELERY_TASK_ROUTES = {
+    "summarize_video_task": {"queue": "video_analysis"},
+    "summarize_stored_video_task": {"queue": "video_analysis"},
+    # GPU worker: celery -A reelsai worker -Q transcribe --concurrency 1
+    "transcribe_video_task": {"queue": "transcribe"},
+    "process_video_task": {"queue": "video_analysis"},
+}
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Whisper transcription (faster-whisper on the transcribe worker)
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "large-v3")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cuda")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "float16")
+WHISPER_TASK_TIMEOUT = int(os.getenv("WHISPER_TASK_TIMEOUT", "600"))
+# Directory shared with the transcribe worker for staged videos (None = system temp)
+WHISPER_SHARED_DIR = os.getenv("WHISPER_SHARED_DIR")
 
 # Service API URLs
 SERVICE_URLS = {
@@ -0,0 +1,14 @@
+"""
+Django settings for running the test suite.
+
+Usage: python manage.py test --settings=reelsai.test_settings
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# Test runs get a fresh test DB each time; keep pk/session-keyed cache
+# entries from a previous run (or another environment) out of them
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# Run tasks inline so tests see rows written by workers (e.g. chat turns)
+CELERY_TASK_ALWAYS_EAGER = True
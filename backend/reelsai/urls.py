@@ -17,6 +17,7 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import include, path
+from django.views.decorators.cache import cache_page
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from apps.hashtag_crawling.urls import urlpatterns as hashtag_urls
 from apps.video_tiktok.urls import urlpatterns as video_tiktok_urls
@@ -26,7 +27,8 @@ urlpatterns = [
     path("api/auth/", include("apps.users.urls")),
     path("api/", include("apps.hashtag_crawling.urls")),
     path("api/", include("apps.video_tiktok.urls")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    # The schema only changes on deploy; regenerating it walks every view
+    path("api/schema/", cache_page(60 * 60)(SpectacularAPIView.as_view()), name="schema"),
     path(
         "api/docs/",
         SpectacularSwaggerView.as_view(url_name="schema"),